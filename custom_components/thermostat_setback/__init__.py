@@ -5,20 +5,99 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+
+from .commands import SetTemperatureDispatcher
+from .const import (
+    CONF_COMMAND_BATCH_WINDOW,
+    CONF_MAX_CONCURRENT_RECOVERIES,
+    CONF_METRICS_ENDPOINT,
+    CONF_RECOVERY_POWER_BUDGET,
+    CONF_SCHEDULES,
+    DATA_RECOVERY_SCHEDULER,
+    DATA_SCHEDULE_ENGINE,
+    DATA_COMMAND_DISPATCHER,
+    DEFAULT_COMMAND_BATCH_WINDOW,
+    DOMAIN,
+    STORAGE_VERSION,
+)
 from .coordinator import ClimateSetbackCoordinator
+from .prometheus import SetbackMetricsView
+from .recovery_scheduler import RecoveryScheduler
+from .router import async_get_router
+from .schedule import TEMPLATE_SCHEMA, CompiledSchedule, ScheduleEngine
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH, Platform.NUMBER]
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(
+                    CONF_COMMAND_BATCH_WINDOW, default=DEFAULT_COMMAND_BATCH_WINDOW
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Optional(CONF_METRICS_ENDPOINT, default=False): cv.boolean,
+                vol.Optional(CONF_SCHEDULES, default=dict): {
+                    cv.slug: TEMPLATE_SCHEMA
+                },
+                vol.Optional(CONF_MAX_CONCURRENT_RECOVERIES): cv.positive_int,
+                vol.Optional(CONF_RECOVERY_POWER_BUDGET): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Set up the climate setback component."""
+    conf = config.get(DOMAIN) or {}
+
+    # One state change subscription per source entity, shared by all entries
+    async_get_router(hass)
+
+    # Commands from all entries are coalesced into multi-entity calls
+    hass.data[DATA_COMMAND_DISPATCHER] = SetTemperatureDispatcher(
+        hass,
+        conf.get(CONF_COMMAND_BATCH_WINDOW, DEFAULT_COMMAND_BATCH_WINDOW),
+    )
+
+    # Built-in schedule templates, evaluated with one shared timer
+    hass.data[DATA_SCHEDULE_ENGINE] = ScheduleEngine(
+        hass,
+        {
+            name: CompiledSchedule.from_config(template)
+            for name, template in conf.get(CONF_SCHEDULES, {}).items()
+        },
+    )
+
+    # Recoveries after a schedule ends share the site heating budget
+    hass.data[DATA_RECOVERY_SCHEDULER] = RecoveryScheduler(
+        hass,
+        conf.get(CONF_MAX_CONCURRENT_RECOVERIES),
+        conf.get(CONF_RECOVERY_POWER_BUDGET),
+    )
+
+    async_setup_services(hass)
+
+    # Prometheus scrape endpoint for all controllers
+    if conf.get(CONF_METRICS_ENDPOINT):
+        if getattr(hass, "http", None) is None:
+            _LOGGER.warning(
+                "The metrics endpoint needs the http integration, not registering it"
+            )
+        else:
+            hass.http.register_view(SetbackMetricsView())
     return True
 
 
@@ -38,9 +117,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # All entities have restored their state, calculate and send it once
+    coordinator.async_finish_restore()
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reloading only if they cannot be applied in place."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    if not coordinator.async_update_options(entry.options):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -53,3 +144,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted state of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
@@ -0,0 +1,133 @@
+"""Clock abstraction for time-dependent controller decisions."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_CLOCK
+
+
+class Clock(ABC):
+    """Time source for coordinators and the command dispatcher.
+
+    Durations are measured with monotonic() so wall clock steps (DST, NTP)
+    cannot distort them; utcnow() is only used for timestamps.
+    """
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Return seconds from a monotonic clock."""
+
+    @abstractmethod
+    def utcnow(self) -> datetime:
+        """Return the current timezone-aware UTC time."""
+
+    @abstractmethod
+    def call_later(self, delay: float, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call action after delay seconds, return a cancel callback."""
+
+    @abstractmethod
+    def call_at(self, when: datetime, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call action at the UTC time when, return a cancel callback."""
+
+
+class SystemClock(Clock):
+    """Clock backed by the system clocks and the event loop."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the clock."""
+        self.hass = hass
+
+    def monotonic(self) -> float:
+        """Return seconds from the monotonic clock."""
+        return time.monotonic()
+
+    def utcnow(self) -> datetime:
+        """Return the current UTC time."""
+        return dt_util.utcnow()
+
+    def call_later(self, delay: float, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Schedule action on the event loop."""
+        return self.hass.loop.call_later(delay, action).cancel
+
+    def call_at(self, when: datetime, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Schedule action at a wall clock time, following clock changes."""
+
+        @callback
+        def _async_fire(_now: datetime) -> None:
+            action()
+
+        return async_track_point_in_utc_time(self.hass, _async_fire, when)
+
+
+class VirtualClock(Clock):
+    """Manually advanced clock for simulations and benchmarks.
+
+    Timers fire synchronously, in order, while advance() moves time forward,
+    so hours of controller behaviour run without real sleeping.
+    """
+
+    def __init__(self, start: datetime | None = None) -> None:
+        """Initialize the clock at start, or the current UTC time."""
+        self._start = start or dt_util.utcnow()
+        self._elapsed = 0.0
+        self._timers: list[tuple[float, int, list[Callable[[], None] | None]]] = []
+        self._sequence = itertools.count()
+
+    def monotonic(self) -> float:
+        """Return seconds since the clock was created."""
+        return self._elapsed
+
+    def utcnow(self) -> datetime:
+        """Return the virtual UTC time."""
+        return self._start + timedelta(seconds=self._elapsed)
+
+    def call_later(self, delay: float, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Schedule action at virtual time now + delay."""
+        entry: list[Callable[[], None] | None] = [action]
+        heapq.heappush(
+            self._timers, (self._elapsed + max(delay, 0.0), next(self._sequence), entry)
+        )
+
+        def _cancel() -> None:
+            entry[0] = None
+
+        return _cancel
+
+    def call_at(self, when: datetime, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Schedule action at a virtual UTC time."""
+        return self.call_later((when - self.utcnow()).total_seconds(), action)
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward, firing every timer that falls due."""
+        target = self._elapsed + seconds
+        timers = self._timers
+        while timers and timers[0][0] <= target:
+            when, _, entry = heapq.heappop(timers)
+            self._elapsed = max(self._elapsed, when)
+            if (action := entry[0]) is not None:
+                action()
+        self._elapsed = target
+
+    @property
+    def pending_timers(self) -> int:
+        """Return the number of scheduled timers, including cancelled ones."""
+        return len(self._timers)
+
+
+@callback
+def async_get_clock(hass: HomeAssistant) -> Clock:
+    """Return the domain clock, the system clock unless one was injected."""
+    clock = hass.data.get(DATA_CLOCK)
+    if clock is None:
+        clock = hass.data[DATA_CLOCK] = SystemClock(hass)
+    return clock
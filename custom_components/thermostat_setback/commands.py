@@ -0,0 +1,370 @@
+"""Batched climate.set_temperature dispatch for climate setback coordinators."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.components.climate import ATTR_TEMPERATURE
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .clock import Clock, async_get_clock
+from .const import (
+    COMMAND_MAX_ATTEMPTS,
+    COMMAND_RETRY_BACKOFF,
+    COMMAND_RETRY_BACKOFF_MAX,
+    COMMAND_TIMEOUT,
+    DATA_COMMAND_DISPATCHER,
+    DEFAULT_COMMAND_BATCH_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _DeviceQueue:
+    """Command queue state for one climate entity."""
+
+    __slots__ = (
+        "pending",
+        "queued_at",
+        "in_flight",
+        "attempts",
+        "failures",
+        "sent_calls",
+        "failed_calls",
+        "not_before",
+        "last_error",
+        "listeners",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty queue."""
+        # Target waiting to be sent, replaced by newer targets
+        self.pending: float | None = None
+        self.queued_at = 0.0
+        # Target of the call currently in flight
+        self.in_flight: float | None = None
+        # Failed attempts for the pending target
+        self.attempts = 0
+        # Consecutive failures of the device, drives the retry backoff
+        self.failures = 0
+        # Successful calls since startup
+        self.sent_calls = 0
+        # Failed calls since startup
+        self.failed_calls = 0
+        self.not_before = 0.0
+        self.last_error: str | None = None
+        self.listeners: list[Callable[[int, str | None], None]] = []
+
+    @property
+    def depth(self) -> int:
+        """Return the number of queued and in-flight commands."""
+        return (self.pending is not None) + (self.in_flight is not None)
+
+
+class SetTemperatureDispatcher:
+    """Coalesce set_temperature commands from all coordinators.
+
+    Every climate entity has a queue holding at most one pending target and
+    at most one call in flight; a newer target replaces the pending one.
+    Pending targets are collected during a short window, grouped by
+    temperature and sent as one climate.set_temperature call per distinct
+    value with a list of entity IDs. A failed batch is sent again one entity
+    per call, so only the devices that fail or time out are retried with
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window: float = DEFAULT_COMMAND_BATCH_WINDOW,
+        timeout: float = COMMAND_TIMEOUT,
+        clock: Clock | None = None,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self.clock = clock or async_get_clock(hass)
+        self.window = window
+        self.timeout = timeout
+        self._queues: dict[str, _DeviceQueue] = {}
+        # Entities with a pending target
+        self._ready: set[str] = set()
+        self._cancel_flush: CALLBACK_TYPE | None = None
+        self._flush_at = 0.0
+
+        # Metrics
+        self.batches = 0
+        self.commands = 0
+        self.failed_batches = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.dropped = 0
+        self.superseded = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_latency: float | None = None
+        self.max_latency: float | None = None
+        self._latency_total = 0.0
+
+    def _queue(self, entity_id: str) -> _DeviceQueue:
+        """Return the queue of a climate entity."""
+        queue = self._queues.get(entity_id)
+        if queue is None:
+            queue = self._queues[entity_id] = _DeviceQueue()
+        return queue
+
+    @callback
+    def async_add_listener(
+        self, entity_id: str, action: Callable[[int, str | None], None]
+    ) -> CALLBACK_TYPE:
+        """Call action(queue_depth, last_error) when the entity's queue changes."""
+        queue = self._queue(entity_id)
+        queue.listeners.append(action)
+
+        @callback
+        def _async_remove() -> None:
+            """Remove the listener."""
+            queue.listeners.remove(action)
+
+        return _async_remove
+
+    @callback
+    def async_set_temperature(self, entity_id: str, temperature: float) -> None:
+        """Queue a target temperature for a climate entity."""
+        queue = self._queue(entity_id)
+        if queue.pending is None:
+            queue.queued_at = self.clock.monotonic()
+        elif queue.pending != temperature:
+            self.superseded += 1
+        queue.pending = temperature
+        queue.attempts = 0
+        self._ready.add(entity_id)
+        self._async_notify(queue)
+        self._async_schedule_flush(self.window)
+
+    def queue_depth(self, entity_id: str) -> int:
+        """Return the number of queued and in-flight commands for an entity."""
+        queue = self._queues.get(entity_id)
+        return queue.depth if queue else 0
+
+    def last_error(self, entity_id: str) -> str | None:
+        """Return the last command error for an entity."""
+        queue = self._queues.get(entity_id)
+        return queue.last_error if queue else None
+
+    def sent_calls(self, entity_id: str) -> int:
+        """Return the number of successful set_temperature calls for an entity."""
+        queue = self._queues.get(entity_id)
+        return queue.sent_calls if queue else 0
+
+    def failed_calls(self, entity_id: str) -> int:
+        """Return the number of failed set_temperature calls for an entity."""
+        queue = self._queues.get(entity_id)
+        return queue.failed_calls if queue else 0
+
+    @callback
+    def _async_schedule_flush(self, delay: float) -> None:
+        """Flush pending commands after delay unless a flush comes sooner."""
+        when = self.clock.monotonic() + delay
+        if self._cancel_flush is not None:
+            if self._flush_at <= when:
+                return
+            self._cancel_flush()
+        self._flush_at = when
+        self._cancel_flush = self.clock.call_later(delay, self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send pending commands, one call per distinct target."""
+        self._cancel_flush = None
+        now = self.clock.monotonic()
+        groups: dict[float, list[str]] = {}
+        oldest: dict[float, float] = {}
+        next_retry: float | None = None
+
+        for entity_id in tuple(self._ready):
+            queue = self._queues[entity_id]
+            if queue.in_flight is not None:
+                # Sent again when the call in flight completes
+                continue
+            if queue.not_before > now:
+                if next_retry is None or queue.not_before < next_retry:
+                    next_retry = queue.not_before
+                continue
+            self._ready.discard(entity_id)
+            temperature = queue.pending
+            queue.in_flight = temperature
+            queue.pending = None
+            groups.setdefault(temperature, []).append(entity_id)
+            oldest[temperature] = min(
+                oldest.get(temperature, queue.queued_at), queue.queued_at
+            )
+
+        for temperature, entity_ids in groups.items():
+            self.hass.async_create_task(
+                self._async_send(entity_ids, temperature, oldest[temperature]),
+                eager_start=True,
+            )
+
+        if next_retry is not None:
+            self._async_schedule_flush(next_retry - now)
+
+    async def _async_send(
+        self, entity_ids: list[str], temperature: float, queued_at: float
+    ) -> None:
+        """Send one set_temperature call and record batch metrics."""
+        error = await self._async_call(entity_ids, temperature)
+
+        if error is not None and len(entity_ids) > 1:
+            self.failed_batches += 1
+            _LOGGER.debug(
+                "Failed to set temperature %s on %s, retrying one by one: %s",
+                temperature,
+                entity_ids,
+                error,
+            )
+            await asyncio.gather(
+                *(
+                    self._async_send([entity_id], temperature, queued_at)
+                    for entity_id in entity_ids
+                )
+            )
+            return
+
+        if error is None:
+            latency = self.clock.monotonic() - queued_at
+            batch_size = len(entity_ids)
+            self.batches += 1
+            self.commands += batch_size
+            self.last_batch_size = batch_size
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency or 0.0, latency)
+            self._latency_total += latency
+            _LOGGER.debug(
+                "Set temperature %s on %d entities in %.3f s",
+                temperature,
+                batch_size,
+                latency,
+            )
+        else:
+            self.failed_batches += 1
+            _LOGGER.warning(
+                "Failed to set temperature %s on %s: %s",
+                temperature,
+                entity_ids,
+                error,
+            )
+
+        self._async_complete(entity_ids, temperature, error)
+
+    async def _async_call(
+        self, entity_ids: list[str], temperature: float
+    ) -> str | None:
+        """Call climate.set_temperature and return the error, if any."""
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self.hass.services.async_call(
+                    "climate",
+                    "set_temperature",
+                    {
+                        ATTR_ENTITY_ID: entity_ids,
+                        ATTR_TEMPERATURE: temperature,
+                    },
+                    blocking=True,
+                )
+        except TimeoutError:
+            self.timeouts += 1
+            return f"Timed out after {self.timeout} s"
+        except Exception as err:  # pylint: disable=broad-except
+            return str(err) or type(err).__name__
+        return None
+
+    @callback
+    def _async_complete(
+        self, entity_ids: list[str], temperature: float, error: str | None
+    ) -> None:
+        """Update the queues of entities whose call completed."""
+        now = self.clock.monotonic()
+        for entity_id in entity_ids:
+            queue = self._queues[entity_id]
+            queue.in_flight = None
+            if error is None:
+                queue.sent_calls += 1
+                queue.failures = 0
+                queue.not_before = 0.0
+                queue.last_error = None
+            else:
+                queue.failures += 1
+                queue.failed_calls += 1
+                queue.last_error = error
+                queue.not_before = now + min(
+                    COMMAND_RETRY_BACKOFF * 2 ** (queue.failures - 1),
+                    COMMAND_RETRY_BACKOFF_MAX,
+                )
+                # Retry the failed target unless a newer one replaced it
+                if queue.pending is None:
+                    queue.attempts += 1
+                    if queue.attempts < COMMAND_MAX_ATTEMPTS:
+                        self.retries += 1
+                        queue.pending = temperature
+                        queue.queued_at = now
+                        self._ready.add(entity_id)
+                    else:
+                        self.dropped += 1
+                        queue.attempts = 0
+                        _LOGGER.warning(
+                            "Giving up setting temperature %s on %s after %d attempts",
+                            temperature,
+                            entity_id,
+                            COMMAND_MAX_ATTEMPTS,
+                        )
+            self._async_notify(queue)
+
+        if self._ready:
+            self._async_schedule_flush(self.window)
+
+    @callback
+    def _async_notify(self, queue: _DeviceQueue) -> None:
+        """Report queue depth and last error to the entity's listeners."""
+        for action in tuple(queue.listeners):
+            action(queue.depth, queue.last_error)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return batch size, latency and queue metrics."""
+        return {
+            "batches": self.batches,
+            "commands": self.commands,
+            "failed_batches": self.failed_batches,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "superseded": self.superseded,
+            "pending": len(self._ready),
+            "in_flight": sum(
+                queue.in_flight is not None for queue in self._queues.values()
+            ),
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "average_batch_size": (
+                round(self.commands / self.batches, 2) if self.batches else None
+            ),
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "average_latency": (
+                self._latency_total / self.batches if self.batches else None
+            ),
+        }
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> SetTemperatureDispatcher:
+    """Return the domain command dispatcher, creating it on first use."""
+    dispatcher = hass.data.get(DATA_COMMAND_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_COMMAND_DISPATCHER] = SetTemperatureDispatcher(hass)
+    return dispatcher
@@ -6,24 +6,100 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import CONF_NAME
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.config_entries import ConfigFlow, OptionsFlowWithReload, ConfigFlowResult, ConfigEntry
+from homeassistant.config_entries import ConfigFlow, OptionsFlow, ConfigFlowResult, ConfigEntry
 from homeassistant.helpers import selector
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    BINARY_INPUT_RULE_ANY,
+    BINARY_INPUT_RULE_THRESHOLD,
+    BINARY_INPUT_RULES,
     CONF_BINARY_INPUT,
+    CONF_BINARY_INPUT_RULE,
+    CONF_BINARY_INPUT_THRESHOLD,
     CONF_CLIMATE_DEVICE,
+    CONF_HEATING_POWER,
+    CONF_OPTIMAL_START,
+    CONF_OUTDOOR_SENSOR,
     CONF_SCHEDULE_DEVICE,
+    CONF_SCHEDULE_TEMPLATE,
+    CONF_STATE_WRITE_INTERVAL,
+    DEFAULT_STATE_WRITE_INTERVAL,
     DOMAIN,
 )
+from .schedule import async_get_schedule_engine
+from .util import binary_input_entities
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_initial_config_schema() -> vol.Schema:
+def _schedule_fields(templates: list[str]) -> dict[Any, Any]:
+    """Return the schedule device field and, if any are defined, the template field."""
+    fields: dict[Any, Any] = {
+        vol.Optional(CONF_SCHEDULE_DEVICE, description={"suggested_value": "Select a schedule device to monitor"}): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="schedule")
+        ),
+    }
+    if templates:
+        fields[vol.Optional(CONF_SCHEDULE_TEMPLATE)] = selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=templates, mode=selector.SelectSelectorMode.DROPDOWN
+            )
+        )
+    return fields
+
+
+def _validate_schedule(hass: HomeAssistant, user_input: dict[str, Any]) -> str | None:
+    """Return an error if not exactly one valid schedule source is selected."""
+    schedule_entity_id = user_input.get(CONF_SCHEDULE_DEVICE)
+    template = user_input.get(CONF_SCHEDULE_TEMPLATE)
+    if bool(schedule_entity_id) == bool(template):
+        return "schedule_required"
+    if schedule_entity_id and not hass.states.get(schedule_entity_id):
+        return "schedule_device_not_found"
+    if template and template not in async_get_schedule_engine(hass).templates:
+        return "schedule_template_not_found"
+    return None
+
+
+def _binary_input_field() -> dict[Any, Any]:
+    """Return the binary input field, accepting several entities."""
+    return {
+        vol.Optional(CONF_BINARY_INPUT): selector.EntitySelector(
+            selector.EntitySelectorConfig(multiple=True)
+        ),
+    }
+
+
+def _validate_binary_inputs(hass: HomeAssistant, user_input: dict[str, Any]) -> str | None:
+    """Return an error if a selected binary input does not exist.
+
+    Also an error if the threshold rule needs more inputs on than are selected.
+    """
+    entity_ids = binary_input_entities(user_input.get(CONF_BINARY_INPUT))
+    for entity_id in entity_ids:
+        if not hass.states.get(entity_id):
+            return "binary_input_not_found"
+    if (
+        user_input.get(CONF_BINARY_INPUT_RULE) == BINARY_INPUT_RULE_THRESHOLD
+        and int(user_input.get(CONF_BINARY_INPUT_THRESHOLD, 1)) > len(entity_ids)
+    ):
+        return "binary_input_threshold_too_high"
+    return None
+
+
+def _suggested_values(options: dict[str, Any]) -> dict[str, Any]:
+    """Return options as form values, with a single binary input as a list."""
+    return {
+        **options,
+        CONF_BINARY_INPUT: list(binary_input_entities(options.get(CONF_BINARY_INPUT))),
+    }
+
+
+def get_initial_config_schema(templates: list[str]) -> vol.Schema:
     """Return the initial config flow schema with only basic required fields."""
     return vol.Schema(
         {
@@ -31,22 +107,44 @@ def get_initial_config_schema() -> vol.Schema:
             vol.Required(CONF_CLIMATE_DEVICE, description={"suggested_value": "Select a climate device to control"}): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="climate")
             ),
-            vol.Required(CONF_SCHEDULE_DEVICE, description={"suggested_value": "Select a schedule device to monitor"}): selector.EntitySelector(
-                selector.EntitySelectorConfig(domain="schedule")
-            ),
-            vol.Optional(CONF_BINARY_INPUT): cv.string,
+            **_schedule_fields(templates),
+            **_binary_input_field(),
         }
     )
 
 
-def get_options_schema() -> vol.Schema:
+def get_options_schema(templates: list[str]) -> vol.Schema:
     """Return the options flow schema for advanced configuration."""
     return vol.Schema(
         {
-            vol.Required(CONF_SCHEDULE_DEVICE, description={"suggested_value": "Select a schedule device to monitor"}): selector.EntitySelector(
-                selector.EntitySelectorConfig(domain="schedule")
+            **_schedule_fields(templates),
+            **_binary_input_field(),
+            vol.Optional(CONF_BINARY_INPUT_RULE, default=BINARY_INPUT_RULE_ANY): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=list(BINARY_INPUT_RULES),
+                    translation_key=CONF_BINARY_INPUT_RULE,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(CONF_BINARY_INPUT_THRESHOLD, default=1): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1, max=50, step=1, mode=selector.NumberSelectorMode.BOX
+                )
+            ),
+            vol.Optional(CONF_STATE_WRITE_INTERVAL, default=DEFAULT_STATE_WRITE_INTERVAL): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0, max=3600, step=1, unit_of_measurement="s", mode=selector.NumberSelectorMode.BOX
+                )
+            ),
+            vol.Optional(CONF_OPTIMAL_START, default=False): selector.BooleanSelector(),
+            vol.Optional(CONF_OUTDOOR_SENSOR): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor")
+            ),
+            vol.Optional(CONF_HEATING_POWER, default=0): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0, max=100, step=0.1, unit_of_measurement="kW", mode=selector.NumberSelectorMode.BOX
+                )
             ),
-            vol.Optional(CONF_BINARY_INPUT): cv.string,
         }
     )
 
@@ -60,10 +158,11 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        templates = sorted(async_get_schedule_engine(self.hass).templates)
         if user_input is None:
             return self.async_show_form(
                 step_id="user",
-                data_schema=get_initial_config_schema()
+                data_schema=get_initial_config_schema(templates)
             )
 
         # Validate that the climate device exists
@@ -71,28 +170,25 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         if not self.hass.states.get(climate_entity_id):
             return self.async_show_form(
                 step_id="user",
-                data_schema=get_initial_config_schema(),
+                data_schema=get_initial_config_schema(templates),
                 errors={"base": "climate_device_not_found"},
             )
 
-        # Validate that the schedule device exists if provided
-        schedule_entity_id = user_input[CONF_SCHEDULE_DEVICE]
-        if not self.hass.states.get(schedule_entity_id):
+        # Validate that one existing schedule device or template is selected
+        if error := _validate_schedule(self.hass, user_input):
             return self.async_show_form(
                 step_id="user",
-                data_schema=get_initial_config_schema(),
-                errors={"base": "schedule_device_not_found"},
+                data_schema=get_initial_config_schema(templates),
+                errors={"base": error},
             )
 
-        # Validate binary input if provided
-        if CONF_BINARY_INPUT in user_input and user_input[CONF_BINARY_INPUT]:
-            binary_entity_id = user_input[CONF_BINARY_INPUT].strip()
-            if binary_entity_id and not self.hass.states.get(binary_entity_id):
-                return self.async_show_form(
-                    step_id="user",
-                    data_schema=get_initial_config_schema(),
-                    errors={"base": "binary_input_not_found"},
-                )
+        # Validate binary inputs if provided
+        if error := _validate_binary_inputs(self.hass, user_input):
+            return self.async_show_form(
+                step_id="user",
+                data_schema=get_initial_config_schema(templates),
+                errors={"base": error},
+            )
 
         return self.async_create_entry(title=user_input[CONF_NAME], data=user_input, options=user_input)
 
@@ -105,7 +201,7 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         return MyOptionsFlow()
 
 
-class MyOptionsFlow(OptionsFlowWithReload):
+class MyOptionsFlow(OptionsFlow):
     """Handle options flow for climate setback."""
 
     def __init__(self) -> None:
@@ -115,41 +211,42 @@ class MyOptionsFlow(OptionsFlowWithReload):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Manage the options."""
+        templates = sorted(async_get_schedule_engine(self.hass).templates)
         if user_input is not None:
 
-            # Validate that the schedule device exists if provided
-            if CONF_SCHEDULE_DEVICE in user_input and user_input[CONF_SCHEDULE_DEVICE]:
-                schedule_entity_id = user_input[CONF_SCHEDULE_DEVICE]
-                if not self.hass.states.get(schedule_entity_id):
-                    current_data = {**self.config_entry.data,
-                                    **self.config_entry.options}
-                    return self.async_show_form(
-                        step_id="init",
-                        data_schema=self.add_suggested_values_to_schema(
-                            get_options_schema(), self.config_entry.options
-                        ),
-                        errors={"base": "schedule_device_not_found"},
-                    )
-
-            # Validate binary input if provided
-            if CONF_BINARY_INPUT in user_input and user_input[CONF_BINARY_INPUT]:
-                binary_entity_id = user_input[CONF_BINARY_INPUT].strip()
-                if binary_entity_id and not self.hass.states.get(binary_entity_id):
-                    current_data = {**self.config_entry.data,
-                                    **self.config_entry.options}
-                    return self.async_show_form(
-                        step_id="init",
-                        data_schema=self.add_suggested_values_to_schema(
-                            get_options_schema(), self.config_entry.options
-                        ),
-                        errors={"base": "binary_input_not_found"},
-                    )
+            # Validate that one existing schedule device or template is selected
+            if error := _validate_schedule(self.hass, user_input):
+                return self.async_show_form(
+                    step_id="init",
+                    data_schema=self.add_suggested_values_to_schema(
+                        get_options_schema(templates),
+                        _suggested_values(self.config_entry.options),
+                    ),
+                    errors={"base": error},
+                )
+
+            # Validate binary inputs if provided
+            if error := _validate_binary_inputs(self.hass, user_input):
+                return self.async_show_form(
+                    step_id="init",
+                    data_schema=self.add_suggested_values_to_schema(
+                        get_options_schema(templates),
+                        _suggested_values(self.config_entry.options),
+                    ),
+                    errors={"base": error},
+                )
 
             # Replace overlapping data in config_entry.data with user_input
             # user_input values take precedence over existing config_entry.data values
             updated_data = {**self.config_entry.data, **user_input}
-            if CONF_BINARY_INPUT not in user_input:
-                updated_data[CONF_BINARY_INPUT] = None
+            for key in (
+                CONF_SCHEDULE_DEVICE,
+                CONF_SCHEDULE_TEMPLATE,
+                CONF_BINARY_INPUT,
+                CONF_OUTDOOR_SENSOR,
+            ):
+                if key not in user_input:
+                    updated_data[key] = None
 
             # Update the config entry with the updated data
             self.hass.config_entries.async_update_entry(
@@ -165,6 +262,6 @@ class MyOptionsFlow(OptionsFlowWithReload):
         return self.async_show_form(
             step_id="init",
             data_schema=self.add_suggested_values_to_schema(
-                get_options_schema(), current_data
+                get_options_schema(templates), _suggested_values(current_data)
             ),
         )
@@ -8,3 +8,91 @@ DOMAIN = "thermostat_setback"
 CONF_CLIMATE_DEVICE = "climate_device"
 CONF_SCHEDULE_DEVICE = "schedule_device"
 CONF_BINARY_INPUT = "binary_input"
+CONF_BINARY_INPUT_RULE = "binary_input_rule"
+CONF_BINARY_INPUT_THRESHOLD = "binary_input_threshold"
+CONF_SCHEDULE_TEMPLATE = "schedule_template"
+
+# How binary inputs combine: any, all, or at least the threshold number on
+BINARY_INPUT_RULE_ANY = "any"
+BINARY_INPUT_RULE_ALL = "all"
+BINARY_INPUT_RULE_THRESHOLD = "threshold"
+BINARY_INPUT_RULES = (
+    BINARY_INPUT_RULE_ANY,
+    BINARY_INPUT_RULE_ALL,
+    BINARY_INPUT_RULE_THRESHOLD,
+)
+
+# Attribute of schedule entities with the time of the next transition
+ATTR_NEXT_EVENT = "next_event"
+# Schedule helpers return their weekly blocks from this service
+SCHEDULE_DOMAIN = "schedule"
+SERVICE_GET_SCHEDULE = "get_schedule"
+
+# hass.data keys for domain-wide helpers
+DATA_EVENT_ROUTER = f"{DOMAIN}_event_router"
+DATA_COMMAND_DISPATCHER = f"{DOMAIN}_command_dispatcher"
+DATA_CLOCK = f"{DOMAIN}_clock"
+DATA_PROFILER = f"{DOMAIN}_profiler"
+DATA_SCHEDULE_ENGINE = f"{DOMAIN}_schedule_engine"
+DATA_RECOVERY_SCHEDULER = f"{DOMAIN}_recovery_scheduler"
+
+# Domain configuration keys (configuration.yaml)
+CONF_COMMAND_BATCH_WINDOW = "command_batch_window"
+CONF_METRICS_ENDPOINT = "metrics_endpoint"
+CONF_SCHEDULES = "schedules"
+CONF_MAX_CONCURRENT_RECOVERIES = "max_concurrent_recoveries"
+CONF_RECOVERY_POWER_BUDGET = "recovery_power_budget"
+
+# Seconds to collect set_temperature commands before sending them in batches
+DEFAULT_COMMAND_BATCH_WINDOW = 0.05
+
+# Per-device command queue
+COMMAND_TIMEOUT = 10
+COMMAND_MAX_ATTEMPTS = 5
+COMMAND_RETRY_BACKOFF = 2
+COMMAND_RETRY_BACKOFF_MAX = 60
+
+# Persistent controller state
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# Options
+CONF_STATE_WRITE_INTERVAL = "state_write_interval"
+CONF_OPTIMAL_START = "optimal_start"
+CONF_OUTDOOR_SENSOR = "outdoor_sensor"
+CONF_HEATING_POWER = "heating_power"
+
+# Minimum seconds between state writes of the status and recovery sensors
+DEFAULT_STATE_WRITE_INTERVAL = 0
+
+# Recovery history
+RECOVERY_HISTORY_SIZE = 32
+RECOVERY_EWMA_ALPHA = 0.2
+
+# Heating rate model: weight kept by older recoveries per new one, and the
+# recoveries needed before optimal start uses the model
+HEATING_MODEL_DECAY = 0.95
+HEATING_MODEL_MIN_SAMPLES = 3
+
+# Seconds an optimal start estimate may move before its timer is set again
+OPTIMAL_START_TOLERANCE = 60
+
+# Seconds a recovery may hold its slot of the recovery budget
+RECOVERY_SLOT_TIMEOUT = 4 * 3600
+
+# Setback decisions kept per controller
+TRACE_SIZE = 64
+
+# Services
+SERVICE_GET_TRACE = "get_trace"
+SERVICE_PROFILE_START = "profile_start"
+SERVICE_PROFILE_STOP = "profile_stop"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_LIMIT = "limit"
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+
+# Profiling
+DEFAULT_PROFILE_DURATION = 60
+MAX_PROFILE_DURATION = 600
+DEFAULT_PROFILE_TOP = 20
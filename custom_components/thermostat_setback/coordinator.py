@@ -2,76 +2,220 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Callable, Mapping
+from operator import attrgetter
 from typing import Any
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import voluptuous as vol
 from homeassistant.components.climate import ATTR_TEMPERATURE
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, State, callback, split_entity_id
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.const import CONF_NAME
+from homeassistant.util import dt as dt_util
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME
 
 from .const import (
+    BINARY_INPUT_RULE_ALL,
+    BINARY_INPUT_RULE_ANY,
+    BINARY_INPUT_RULE_THRESHOLD,
     CONF_BINARY_INPUT,
+    CONF_BINARY_INPUT_RULE,
+    CONF_BINARY_INPUT_THRESHOLD,
     CONF_CLIMATE_DEVICE,
+    CONF_HEATING_POWER,
+    CONF_OPTIMAL_START,
+    CONF_OUTDOOR_SENSOR,
     CONF_SCHEDULE_DEVICE,
+    CONF_SCHEDULE_TEMPLATE,
+    CONF_STATE_WRITE_INTERVAL,
+    DEFAULT_STATE_WRITE_INTERVAL,
     DOMAIN,
+    OPTIMAL_START_TOLERANCE,
+    SCHEDULE_DOMAIN,
+    SERVICE_GET_SCHEDULE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
 )
+from .clock import Clock, async_get_clock
+from .commands import async_get_dispatcher
+from .metrics import CoordinatorMetrics
+from .recovery import HeatingRateModel, RecoveryHistory
+from .recovery_scheduler import async_get_recovery_scheduler
+from .router import async_get_router, parse_next_event
+from .schedule import (
+    CompiledSchedule,
+    async_get_schedule_engine,
+    compile_schedule_helper,
+)
+from .state import STATE_FIELDS, ControllerState, ControllerStateView
+from .trace import DecisionTrace
+from .util import binary_input_entities
 
 _LOGGER = logging.getLogger(__name__)
 
+# Climate attributes the coordinator reads. State changes that only touch
+# other attributes (humidity, hvac_action, valve position, ...) are ignored.
+CLIMATE_TRACKED_ATTRIBUTES = (
+    "min_temp",
+    "max_temp",
+    "target_temp_step",
+    "unit_of_measurement",
+    "temperature_unit",
+    "current_temperature",
+    ATTR_TEMPERATURE,
+)
+
+
+def _required_inputs(rule: str, threshold: int, inputs: int) -> int:
+    """Return the number of binary inputs that must be on to activate setback."""
+    if rule == BINARY_INPUT_RULE_ALL:
+        return max(inputs, 1)
+    if rule == BINARY_INPUT_RULE_THRESHOLD:
+        return max(int(threshold), 1)
+    return 1
+
+
+def _binary_input_is_on(state: State) -> bool:
+    """Return True if a binary input state is on (on/true/1)."""
+    return state.state in ("on", "true", "1") or state.attributes.get("is_on", False)
+
+
+def _climate_attributes_changed(
+    old_attributes: Mapping[str, Any], new_attributes: Mapping[str, Any]
+) -> bool:
+    """Return True if any climate attribute used by the coordinator changed."""
+    for attribute in CLIMATE_TRACKED_ATTRIBUTES:
+        if old_attributes.get(attribute) != new_attributes.get(attribute):
+            return True
+    return False
+
+
+# Coordinator data saved in the entry's store and restored on startup
+PERSISTED_KEYS = (
+    "is_setback",
+    "forced_setback",
+    "controller_active",
+    "setback_temperature",
+    "normal_temperature",
+    "skip_next_setback",
+    "recovery_start_time",
+    "last_recovery_time",
+    "is_recovering",
+    "recovery_start_temperature",
+    "recovery_count",
+)
+_persisted_snapshot = attrgetter(*PERSISTED_KEYS)
+
+# Triggers of a setback end that waits for a slot of the recovery budget.
+# Manual changes take effect at once.
+STAGGERED_TRIGGERS = frozenset({"schedule", "schedule_boundary", "optimal_start"})
+
 
 class ClimateSetbackCoordinator(DataUpdateCoordinator):
     """Coordinator for climate setback state management."""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        clock: Clock | None = None,
+    ) -> None:
         """Initialize the coordinator."""
         self.config_entry = config_entry
+        # Drives every time-dependent decision, replaceable for simulations
+        self.clock = clock or async_get_clock(hass)
         self._name = config_entry.data[CONF_NAME]
         self._climate_device = config_entry.data[CONF_CLIMATE_DEVICE]
-        self._schedule_device = config_entry.options[CONF_SCHEDULE_DEVICE]
+        # Either a schedule entity or a built-in schedule template
+        self._schedule_device = config_entry.options.get(CONF_SCHEDULE_DEVICE)
+        self._schedule_template = config_entry.options.get(CONF_SCHEDULE_TEMPLATE)
+        # A single entity ID or a list, combined by the binary input rule
         self._binary_input = config_entry.options.get(CONF_BINARY_INPUT, None)
+        self._binary_input_rule = config_entry.options.get(
+            CONF_BINARY_INPUT_RULE, BINARY_INPUT_RULE_ANY
+        )
+        self._binary_input_threshold = config_entry.options.get(
+            CONF_BINARY_INPUT_THRESHOLD, 1
+        )
+        self._state_write_interval = config_entry.options.get(
+            CONF_STATE_WRITE_INTERVAL, DEFAULT_STATE_WRITE_INTERVAL
+        )
+        self._optimal_start = config_entry.options.get(CONF_OPTIMAL_START, False)
+        self._outdoor_sensor = config_entry.options.get(CONF_OUTDOOR_SENSOR)
+        # Heating power in kW counted against the site recovery budget
+        self._heating_power = config_entry.options.get(CONF_HEATING_POWER) or 0.0
 
         # Store unsubscribe callbacks
         self._unsub_climate = None
         self._unsub_schedule = None
-        self._unsub_binary_input = None
+        self._unsub_binary_inputs: list[Callable[[], None]] = []
+        self._unsub_command_status = None
+        self._command_status_handle: asyncio.Handle | None = None
+        self._cancel_optimal_start = None
+        # Weekly blocks of a schedule helper. Its next_event may only be the
+        # boundary between adjacent blocks, the blocks tell where a period ends
+        self._schedule_blocks: CompiledSchedule | None = None
+        self._schedule_blocks_read = False
+        self._reading_schedule_blocks = False
+        # Whether the recovery scheduler holds or queues a slot for this entry
+        self._recovery_slot = False
+
+        # Last target temperature sent to the climate device, and the target
+        # the device reported at that moment. Used to skip redundant commands.
+        self._last_sent_temperature: float | None = None
+        self._reported_at_send: float | None = None
+
+        # Monotonic clock reading when the current recovery started
+        self._recovery_start_monotonic: float | None = None
+
+        # Entities restore their last state until async_finish_restore is
+        # called; no setback calculation or command happens meanwhile
+        self._restoring = True
+
+        # Full controller state, loaded once at setup and saved with a delay
+        self._store: Store[dict[str, Any]] | None = None
+        self._stored_keys: set[str] = set()
+
+        # Recent recoveries and recovery time statistics
+        self.recovery_history = RecoveryHistory()
+        # Learned recovery time per degree of rise, used by optimal start
+        self.heating_model = HeatingRateModel(outdoor=bool(self._outdoor_sensor))
+        self._saved_state: tuple[Any, ...] | None = None
+
+        # Fields changed by the last listener update, the state snapshot they
+        # were compared against and the number of published snapshots
+        self.changed_fields: frozenset[str] = frozenset()
+        self._published: tuple[Any, ...] | None = None
+        self.version = 0
+
+        # Hot-path counters and callback latency, see diagnostics.py
+        self.metrics = CoordinatorMetrics()
+
+        # Recent setback decisions and the (is_setback, target) last traced
+        self.trace = DecisionTrace()
+        self._traced: tuple[bool, float] | None = None
 
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=f"{DOMAIN}_{config_entry.entry_id}",
             update_interval=None,  # We update on state changes, not on schedule
         )
 
-        # Initialize data structure with default values
-        self.data = {
-            "is_setback": False,
-            "schedule_active": False,
-
-            "forced_setback": False,
-            "input_is_active": False,
-            "controller_active": True,  # Controller is active by default
-            "setback_temperature": 20,
-            "normal_temperature": 16,
-            "normal_temperature_min": 5.0,
-            "normal_temperature_max": 35.0,
-            "normal_temperature_step": 0.5,
-            "unit_of_measurement": None,
-
-            # Recovery time tracking
-            "recovery_start_time": None,
-            "last_recovery_time": None,  # Single recovery time in seconds
-            "is_recovering": False,
-
-            # Skip setback feature
-            "skip_next_setback": False,
-        }
-
-    async def _async_update_data(self) -> dict[str, Any]:
+        # Controller state, with a read-only mapping view as coordinator data
+        self.state = ControllerState()
+        self.data = ControllerStateView(self.state)
+        self._set_binary_inputs(binary_input_entities(self._binary_input))
+
+    async def _async_update_data(self) -> ControllerStateView:
         """Update coordinator data."""
         # This method is called by the base coordinator but we handle updates
         # through state change callbacks instead
@@ -79,23 +223,23 @@ class ClimateSetbackCoordinator(DataUpdateCoordinator):
 
     async def async_setup(self) -> None:
         """Set up the coordinator."""
-        # Track climate device state changes
-        self._unsub_climate = async_track_state_change_event(
-            self.hass,
-            [self._climate_device],
-            self._async_climate_changed,
-        )
+        await self._async_load()
+
+        router = async_get_router(self.hass)
+
+        # Track the command queue of the climate device
+        self._unsub_command_status = async_get_dispatcher(
+            self.hass
+        ).async_add_listener(self._climate_device, self._async_command_status)
 
-        # Track schedule device state changes
-        self._unsub_schedule = async_track_state_change_event(
-            self.hass,
-            [self._schedule_device],
-            self._async_schedule_changed,
+        # Track climate device state changes
+        self._unsub_climate = router.async_track(
+            self._climate_device,
+            self._instrument("climate", self._async_climate_changed),
         )
 
-        schedule_state = self.hass.states.get(self._schedule_device)
-        if schedule_state is not None:
-            self.data["schedule_active"] = schedule_state.state == "on"
+        if (schedule_active := self._async_track_schedule()) is not None:
+            self.state.schedule_active = schedule_active
 
         # Initialize unit of measurement from climate device if available
         climate_state = self.hass.states.get(self._climate_device)
@@ -106,30 +250,284 @@ class ClimateSetbackCoordinator(DataUpdateCoordinator):
                 getattr(climate_state, "unit_of_measurement", None)
             )
             if unit:
-                self.data["unit_of_measurement"] = unit
-
-        # Track binary input state changes if configured
-        if self._binary_input:
-            self._unsub_binary_input = async_track_state_change_event(
-                self.hass,
-                [self._binary_input],
-                self._async_binary_input_changed,
+                self.state.unit_of_measurement = unit
+
+        self._async_track_binary_input()
+
+    @callback
+    def _async_track_schedule(self) -> bool | None:
+        """Track the schedule device or template, return whether it is on."""
+        if self._schedule_device:
+            self._schedule_blocks = None
+            self._schedule_blocks_read = False
+            router = async_get_router(self.hass)
+            # Track schedule device state changes
+            self._unsub_schedule = router.async_track(
+                self._schedule_device,
+                self._instrument("schedule", self._async_schedule_changed),
             )
 
+            schedule_state = self.hass.states.get(self._schedule_device)
+            if schedule_state is not None:
+                return schedule_state.state == "on"
+        elif self._schedule_template:
+            engine = async_get_schedule_engine(self.hass)
+            self._unsub_schedule = engine.async_track(
+                self._schedule_template, self._async_schedule_boundary
+            )
+            return engine.is_on(self._schedule_template)
+        return None
+
+    @callback
+    def _async_untrack_schedule(self) -> None:
+        """Stop tracking the schedule."""
+        if self._unsub_schedule:
+            self._unsub_schedule()
+            self._unsub_schedule = None
+
+    def _set_binary_inputs(self, entity_ids: tuple[str, ...]) -> None:
+        """Set the binary inputs, all off, and the number required to be on."""
+        # On state per input and the number on, updated per event so the
+        # rule is evaluated in constant time however many inputs there are
+        self._binary_inputs_on = dict.fromkeys(entity_ids, False)
+        self._binary_inputs_active = 0
+        self._binary_inputs_required = _required_inputs(
+            self._binary_input_rule, self._binary_input_threshold, len(entity_ids)
+        )
+        self.state.input_is_active = False
+
+    def _set_binary_input_on(self, entity_id: str, is_on: bool) -> None:
+        """Update the on state of one binary input and evaluate the rule."""
+        inputs_on = self._binary_inputs_on
+        was_on = inputs_on[entity_id]
+        if is_on != was_on:
+            inputs_on[entity_id] = is_on
+            self._binary_inputs_active += 1 if is_on else -1
+        self.state.input_is_active = (
+            self._binary_inputs_active >= self._binary_inputs_required
+        )
+
+    @callback
+    def _async_track_binary_input(self) -> None:
+        """Track the binary inputs if configured and read their state."""
+        if not self._binary_inputs_on:
+            return
+        router = async_get_router(self.hass)
+        action = self._instrument("binary_input", self._async_binary_input_changed)
+        for entity_id in self._binary_inputs_on:
+            self._unsub_binary_inputs.append(router.async_track(entity_id, action))
+            if (binary_state := self.hass.states.get(entity_id)) is not None:
+                self._set_binary_input_on(entity_id, _binary_input_is_on(binary_state))
+
+    @callback
+    def _async_untrack_binary_input(self) -> None:
+        """Stop tracking the binary inputs."""
+        for unsub in self._unsub_binary_inputs:
+            unsub()
+        self._unsub_binary_inputs.clear()
+
+    @callback
+    def async_update_options(self, options: Mapping[str, Any]) -> bool:
+        """Apply changed options in place, return False if a reload is needed.
+
+        The schedule and binary input subscriptions are swapped and the
+        setback state is evaluated once, without touching the entities.
+        """
+        if (
+            options.get(CONF_OUTDOOR_SENSOR) != self._outdoor_sensor
+            or self.config_entry.data[CONF_CLIMATE_DEVICE] != self._climate_device
+            or self.config_entry.data[CONF_NAME] != self._name
+        ):
+            # The heating model and the device are built around these
+            return False
+
+        schedule = (
+            options.get(CONF_SCHEDULE_DEVICE),
+            options.get(CONF_SCHEDULE_TEMPLATE),
+        )
+        binary_input = options.get(CONF_BINARY_INPUT)
+        binary_input_rule = (
+            options.get(CONF_BINARY_INPUT_RULE, BINARY_INPUT_RULE_ANY),
+            options.get(CONF_BINARY_INPUT_THRESHOLD, 1),
+        )
+        state_write_interval = options.get(
+            CONF_STATE_WRITE_INTERVAL, DEFAULT_STATE_WRITE_INTERVAL
+        )
+        optimal_start = options.get(CONF_OPTIMAL_START, False)
+        heating_power = options.get(CONF_HEATING_POWER) or 0.0
+        if (
+            schedule == (self._schedule_device, self._schedule_template)
+            and binary_input == self._binary_input
+            and binary_input_rule
+            == (self._binary_input_rule, self._binary_input_threshold)
+            and state_write_interval == self._state_write_interval
+            and optimal_start == self._optimal_start
+            and heating_power == self._heating_power
+        ):
+            return True
+
+        if schedule != (self._schedule_device, self._schedule_template):
+            self._async_untrack_schedule()
+            self._schedule_device, self._schedule_template = schedule
+            # Setback ended early for the former schedule's period
+            self.state.preheating = False
+            # A schedule without a state yet is off until it reports one
+            self._update_schedule_active(bool(self._async_track_schedule()))
+        if binary_input != self._binary_input or binary_input_rule != (
+            self._binary_input_rule,
+            self._binary_input_threshold,
+        ):
+            self._async_untrack_binary_input()
+            self._binary_input = binary_input
+            self._binary_input_rule, self._binary_input_threshold = binary_input_rule
+            self._set_binary_inputs(binary_input_entities(binary_input))
+            self._async_track_binary_input()
+        self._state_write_interval = state_write_interval
+        self._optimal_start = optimal_start
+        if not optimal_start:
+            # Setback only stays ended early while optimal start is on
+            self.state.preheating = False
+        self._heating_power = heating_power
+
+        self._calculate_setback_state("options")
+        # Entities cache the configured entity IDs in their attributes,
+        # publish every field so they render again
+        self._published = None
+        self.async_update_listeners()
+        return True
+
+    def _instrument(
+        self, name: str, action: Callable[[Event], None]
+    ) -> Callable[[Event], None]:
+        """Wrap a state change callback to count events and time it."""
+        events = self.metrics.events
+        histogram = self.metrics.histogram(name)
+        perf_counter = time.perf_counter
+
+        @callback
+        def _async_instrumented(event: Event) -> None:
+            """Count the event and record the callback latency."""
+            entity_id = event.data["entity_id"]
+            events[entity_id] = events.get(entity_id, 0) + 1
+            start = perf_counter()
+            try:
+                action(event)
+            finally:
+                histogram.add(perf_counter() - start)
+
+        return _async_instrumented
+
+    async def _async_load(self) -> None:
+        """Load the persisted controller state."""
+        self._store = Store(
+            self.hass, STORAGE_VERSION, f"{DOMAIN}.{self.config_entry.entry_id}"
+        )
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        for key in PERSISTED_KEYS:
+            if key not in stored:
+                continue
+            value = stored[key]
+            if key == "recovery_start_time" and value is not None:
+                value = datetime.fromisoformat(value)
+            setattr(self.state, key, value)
+            self._stored_keys.add(key)
+        if self.state.recovery_start_time is not None:
+            # The monotonic clock does not survive a restart, carry the
+            # elapsed recovery time over using wall clock time once
+            elapsed = (
+                self.clock.utcnow() - self.state.recovery_start_time
+            ).total_seconds()
+            self._recovery_start_monotonic = self.clock.monotonic() - max(elapsed, 0)
+        if history := stored.get("recovery_history"):
+            self.recovery_history = RecoveryHistory.from_dict(history)
+        if (model := stored.get("heating_model")) and (
+            model["features"] == self.heating_model.features
+        ):
+            # A model learned with a different outdoor option is dropped
+            self.heating_model = HeatingRateModel.from_dict(model)
+        self._saved_state = self._persisted_state()
+
+    def _persisted_state(self) -> tuple[Any, ...]:
+        """Return the current values of the persisted keys."""
+        return _persisted_snapshot(self.state)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the controller state to save."""
+        data = dict(zip(PERSISTED_KEYS, self._persisted_state()))
+        if data["recovery_start_time"] is not None:
+            data["recovery_start_time"] = data["recovery_start_time"].isoformat()
+        data["recovery_history"] = self.recovery_history.as_dict()
+        data["heating_model"] = self.heating_model.as_dict()
+        return data
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the controller state after a delay if it changed."""
+        if self._restoring or self._store is None:
+            return
+        state = self._persisted_state()
+        if state == self._saved_state:
+            return
+        self._saved_state = state
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Publish changed state to listeners and persist changed state."""
+        snapshot = self.state.snapshot()
+        published = self._published
+        if snapshot == published:
+            return
+        if published is None:
+            self.changed_fields = frozenset(STATE_FIELDS)
+        else:
+            self.changed_fields = frozenset(
+                field
+                for field, value, old_value in zip(STATE_FIELDS, snapshot, published)
+                if value != old_value
+            )
+        self._published = snapshot
+        self.version += 1
+        self.metrics.fanouts += 1
+
+        self._async_schedule_save()
+        super().async_update_listeners()
+
     def async_cleanup(self) -> None:
         """Clean up the coordinator."""
         if self._unsub_climate:
             self._unsub_climate()
-        if self._unsub_schedule:
-            self._unsub_schedule()
-        if self._unsub_binary_input:
-            self._unsub_binary_input()
+            self._unsub_climate = None
+        self._async_untrack_schedule()
+        self._async_untrack_binary_input()
+        if self._unsub_command_status:
+            self._unsub_command_status()
+            self._unsub_command_status = None
+        if self._command_status_handle:
+            self._command_status_handle.cancel()
+            self._command_status_handle = None
+        if self._cancel_optimal_start:
+            self._cancel_optimal_start()
+            self._cancel_optimal_start = None
+        self._release_recovery_slot()
 
     @callback
     def _async_climate_changed(self, event: Any) -> None:
         """Handle climate device state changes."""
         new_state = event.data.get("new_state")
         if new_state is None:
+            self.metrics.filtered_events += 1
+            return
+
+        old_state = event.data.get("old_state")
+        if old_state is not None and not _climate_attributes_changed(
+            old_state.attributes, new_state.attributes
+        ):
+            self.metrics.filtered_events += 1
             return
 
         # Get min, max and step attributes from the climate device
@@ -137,11 +535,11 @@ class ClimateSetbackCoordinator(DataUpdateCoordinator):
         max_temp = new_state.attributes.get("max_temp")
         step = new_state.attributes.get("target_temp_step")
         if min_temp:
-            self.data["normal_temperature_min"] = min_temp
+            self.state.normal_temperature_min = min_temp
         if max_temp:
-            self.data["normal_temperature_max"] = max_temp
+            self.state.normal_temperature_max = max_temp
         if step:
-            self.data["normal_temperature_step"] = step
+            self.state.normal_temperature_step = step
 
         # Get unit of measurement from the climate device
         # Try multiple sources as different climate integrations may expose it differently
@@ -151,29 +549,47 @@ class ClimateSetbackCoordinator(DataUpdateCoordinator):
             getattr(new_state, "unit_of_measurement", None)
         )
         if unit:
-            self.data["unit_of_measurement"] = unit
+            self.state.unit_of_measurement = unit
 
         # Check if we're recovering and have reached the normal temperature
-        if self.data["is_recovering"] and not self.data["is_setback"]:
+        if self.state.is_recovering and not self.state.is_setback:
             current_temp = new_state.attributes.get("current_temperature")
             target_temp = new_state.attributes.get("temperature")
 
             if current_temp is not None and target_temp is not None:
                 # Consider temperature reached when current temp is equal or greater than target
-                if current_temp >= target_temp:
+                if current_temp >= target_temp and self._recovery_start_monotonic is not None:
                     # Recovery complete
                     recovery_time = (
-                        datetime.now() - self.data["recovery_start_time"]).total_seconds()
+                        self.clock.monotonic() - self._recovery_start_monotonic)
 
                     # Store the single recovery time
-                    self.data["last_recovery_time"] = round(recovery_time, 1)
-
-                    self.data["is_recovering"] = False
-                    self.data["recovery_start_time"] = None
+                    self.state.last_recovery_time = round(recovery_time, 1)
+
+                    # Add the recovery to the history and statistics
+                    self.recovery_history.add(
+                        recovery_time,
+                        self.state.recovery_start_temperature,
+                        target_temp,
+                        self.clock.utcnow().timestamp(),
+                    )
+                    self.state.recovery_count = self.recovery_history.count
+                    if self.state.recovery_start_temperature is not None:
+                        self.heating_model.add(
+                            recovery_time,
+                            target_temp - self.state.recovery_start_temperature,
+                            self._outdoor_difference(target_temp),
+                        )
+
+                    self.state.is_recovering = False
+                    self.state.recovery_start_time = None
+                    self.state.recovery_start_temperature = None
+                    self._recovery_start_monotonic = None
+                    self._release_recovery_slot()
                     _LOGGER.debug(
                         "Recovery completed in %.1f seconds", recovery_time)
 
-        self._calculate_setback_state()
+        self._calculate_setback_state("climate")
         self.async_update_listeners()
 
     @callback
@@ -181,154 +597,489 @@ class ClimateSetbackCoordinator(DataUpdateCoordinator):
         """Handle schedule device state changes."""
         new_state = event.data.get("new_state")
         if new_state is None:
+            self.metrics.filtered_events += 1
             return
 
-        previous_schedule_active = self.data["schedule_active"]
+        if self._optimal_start and self._schedule_blocks_read:
+            # The blocks of a schedule helper may have been edited
+            self._async_read_schedule_blocks()
+
         # Activate setback if schedule is active
-        self.data["schedule_active"] = new_state.state == "on" or new_state.attributes.get(
-            "is_on", False)
+        self._set_schedule_active(
+            new_state.state == "on" or new_state.attributes.get("is_on", False),
+            "schedule",
+        )
+
+    @callback
+    def _async_schedule_boundary(self, is_on: bool) -> None:
+        """Handle a transition of the built-in schedule."""
+        self.metrics.schedule_boundaries += 1
+        self._set_schedule_active(is_on, "schedule_boundary")
+
+    def _set_schedule_active(self, schedule_active: bool, trigger: str) -> None:
+        """Apply the schedule state and recalculate."""
+        self._update_schedule_active(schedule_active)
+        self._calculate_setback_state(trigger)
+        self.async_update_listeners()
+
+    def _update_schedule_active(self, schedule_active: bool) -> None:
+        """Apply the schedule state to the setback flags."""
+        previous_schedule_active = self.state.schedule_active
+        self.state.schedule_active = schedule_active
+        if schedule_active != previous_schedule_active:
+            # An early end of setback only applies to the period it was
+            # planned for
+            self.state.preheating = False
 
         # If schedule is becoming active and skip_next_setback is set, skip the setback
-        if not previous_schedule_active and self.data["schedule_active"] and self.data["skip_next_setback"]:
+        if not previous_schedule_active and self.state.schedule_active and self.state.skip_next_setback:
             _LOGGER.debug("Skipping next setback cycle as requested")
-            self.data["skip_next_setback"] = False
-            # Notify listeners so the switch can update its state
-            self.async_update_listeners()
-
-        self._calculate_setback_state()
-        self.async_update_listeners()
+            self.state.skip_next_setback = False
 
     @callback
     def _async_binary_input_changed(self, event: Any) -> None:
         """Handle binary input state changes."""
         new_state = event.data.get("new_state")
-        if new_state is None:
+        entity_id = event.data["entity_id"]
+        if new_state is None or entity_id not in self._binary_inputs_on:
+            self.metrics.filtered_events += 1
             return
 
-        # Set input is active based on binary input state (on/true/1)
-        self.data["input_is_active"] = new_state.state in [
-            "on", "true", "1"] or new_state.attributes.get("is_on", False)
+        # Count the input as on based on its state (on/true/1)
+        self._set_binary_input_on(entity_id, _binary_input_is_on(new_state))
 
-        self._calculate_setback_state()
+        self._calculate_setback_state("binary_input")
         self.async_update_listeners()
 
-    def _update_climate_temperature(self) -> None:
-        """Set the climate device temperature."""
-        # Only control temperature if controller is active
-        if not self.data["controller_active"]:
+    @callback
+    def _async_command_status(self, queue_depth: int, last_error: str | None) -> None:
+        """Handle command queue changes of the climate device."""
+        if last_error is not None and queue_depth == 0:
+            # The command was given up, let the next recalculation resend it
+            self._last_sent_temperature = None
+
+        if (
+            self.state.command_queue_depth == queue_depth
+            and self.state.command_last_error == last_error
+        ):
             return
+        self.state.command_queue_depth = queue_depth
+        self.state.command_last_error = last_error
+        # Commands are queued while a recalculation runs, publish once it is
+        # done so its update carries the queue change
+        if self._command_status_handle is None:
+            self._command_status_handle = self.hass.loop.call_soon(
+                self._async_publish_command_status
+            )
 
-        if self.data["is_setback"]:
-            target_temperature = self.data["setback_temperature"]
-        else:
-            target_temperature = self.data["normal_temperature"]
+    @callback
+    def _async_publish_command_status(self) -> None:
+        """Publish a command queue change no other update has carried."""
+        self._command_status_handle = None
+        self.async_update_listeners()
+
+    def _target_temperature(self) -> float:
+        """Return the target temperature for the current setback state."""
+        if self.state.is_setback:
+            return self.state.setback_temperature
+        return self.state.normal_temperature
+
+    def _update_climate_temperature(self) -> bool:
+        """Set the climate device temperature, return True if a command was sent."""
+        # Only control temperature if controller is active
+        if not self.state.controller_active:
+            return False
 
+        target_temperature = self._target_temperature()
+
+        climate_state = self.hass.states.get(self._climate_device)
+        reported_temperature = None
+        if climate_state is not None:
+            reported_temperature = climate_state.attributes.get(ATTR_TEMPERATURE)
+
+        if not self._should_send_temperature(target_temperature, reported_temperature):
+            self.metrics.suppressed_commands += 1
+            return False
+
+        self._last_sent_temperature = target_temperature
+        self._reported_at_send = reported_temperature
+        async_get_dispatcher(self.hass).async_set_temperature(
+            self._climate_device, target_temperature
+        )
+        return True
+
+    def _current_temperature(self) -> float | None:
+        """Return the current temperature reported by the climate device."""
+        climate_state = self.hass.states.get(self._climate_device)
+        if climate_state is None:
+            return None
+        return climate_state.attributes.get("current_temperature")
+
+    def _outdoor_difference(self, temperature: float) -> float | None:
+        """Return temperature minus the outdoor temperature, if known."""
+        if not self._outdoor_sensor:
+            return None
+        outdoor_state = self.hass.states.get(self._outdoor_sensor)
+        if outdoor_state is None:
+            return None
+        try:
+            return temperature - float(outdoor_state.state)
+        except ValueError:
+            return None
+
+    def _schedule_end(self) -> datetime | None:
+        """Return when the active schedule period ends, if known."""
+        if self._schedule_template:
+            template = async_get_schedule_engine(self.hass).templates.get(
+                self._schedule_template
+            )
+            if template is None:
+                return None
+            end = template.next_transition(dt_util.as_local(self.clock.utcnow()))
+            return None if end is None else dt_util.as_utc(end)
+
+        schedule_state = self.hass.states.get(self._schedule_device)
+        if schedule_state is None or schedule_state.state != "on":
+            return None
+        if split_entity_id(self._schedule_device)[0] != SCHEDULE_DOMAIN:
+            # Other entities only announce their next change
+            return parse_next_event(schedule_state)
+
+        # The next_event of a schedule helper is also published between
+        # adjacent blocks and at midnight, where the period goes on
+        if not self._schedule_blocks_read:
+            self._async_read_schedule_blocks()
+            return None
+        local = dt_util.as_local(self.clock.utcnow())
+        if self._schedule_blocks is None or not self._schedule_blocks.is_on(local):
+            return None
+        end = self._schedule_blocks.next_transition(local)
+        return None if end is None else dt_util.as_utc(end)
+
+    @callback
+    def _async_read_schedule_blocks(self) -> None:
+        """Read the blocks of the schedule helper in the background."""
+        if (
+            self._reading_schedule_blocks
+            or split_entity_id(self._schedule_device)[0] != SCHEDULE_DOMAIN
+        ):
+            return
+        self._reading_schedule_blocks = True
         self.hass.async_create_task(
-            self.hass.services.async_call(
-                "climate",
-                "set_temperature",
-                {
-                    "entity_id": self._climate_device,
-                    ATTR_TEMPERATURE: target_temperature,
-                },
+            self._async_fetch_schedule_blocks(self._schedule_device)
+        )
+
+    async def _async_fetch_schedule_blocks(self, entity_id: str) -> None:
+        """Fetch the blocks of a schedule helper and plan optimal start again."""
+        try:
+            response = await self.hass.services.async_call(
+                SCHEDULE_DOMAIN,
+                SERVICE_GET_SCHEDULE,
+                {ATTR_ENTITY_ID: entity_id},
+                blocking=True,
+                return_response=True,
+            )
+            blocks = compile_schedule_helper(response[entity_id])
+        except (HomeAssistantError, KeyError, TypeError, vol.Invalid) as err:
+            _LOGGER.warning(
+                "Cannot read the blocks of %s for optimal start: %s", entity_id, err
             )
+            blocks = None
+        finally:
+            self._reading_schedule_blocks = False
+        if entity_id != self._schedule_device:
+            # The schedule was replaced meanwhile
+            return
+        self._schedule_blocks = blocks
+        self._schedule_blocks_read = True
+        self._plan_optimal_start()
+        self.async_update_listeners()
+
+    def _optimal_start_time(self) -> datetime | None:
+        """Return when setback must end to reach normal temperature on time."""
+        if (end := self._schedule_end()) is None:
+            return None
+        if (current := self._current_temperature()) is None:
+            return None
+        rise = self.state.normal_temperature - current
+        if rise <= 0:
+            return None
+        duration = self.heating_model.predict(
+            rise, self._outdoor_difference(self.state.normal_temperature)
+        )
+        if duration is None:
+            return None
+        return end - timedelta(seconds=duration)
+
+    def _plan_optimal_start(self) -> None:
+        """Set or clear the timer that ends a scheduled setback early."""
+        state = self.state
+        start_at = None
+        if (
+            self._optimal_start
+            and state.is_setback
+            and state.schedule_active
+            and not state.preheating
+            and not state.forced_setback
+            and not state.input_is_active
+        ):
+            start_at = self._optimal_start_time()
+
+        if start_at is None:
+            state.optimal_start_time = None
+            if self._cancel_optimal_start:
+                self._cancel_optimal_start()
+                self._cancel_optimal_start = None
+            return
+
+        # Every temperature report moves the estimate a little
+        if (
+            self._cancel_optimal_start is not None
+            and state.optimal_start_time is not None
+            and abs((start_at - state.optimal_start_time).total_seconds())
+            < OPTIMAL_START_TOLERANCE
+        ):
+            return
+        if self._cancel_optimal_start:
+            self._cancel_optimal_start()
+        state.optimal_start_time = start_at
+        self._cancel_optimal_start = self.clock.call_at(
+            start_at, self._async_optimal_start
         )
 
-    def _calculate_setback_state(self) -> None:
-        """Calculate setback state."""
-        previous_setback = self.data["is_setback"]
+    @callback
+    def _async_optimal_start(self) -> None:
+        """End the scheduled setback early to start recovery."""
+        self._cancel_optimal_start = None
+        _LOGGER.debug("Ending setback early to reach normal temperature on time")
+        self.state.preheating = True
+        self._calculate_setback_state("optimal_start")
+        self.async_update_listeners()
+
+    def _should_send_temperature(
+        self, target_temperature: float, reported_temperature: float | None
+    ) -> bool:
+        """Return True if the climate device needs a new target temperature."""
+        # Targets closer than half a step are the same setpoint on the device
+        tolerance = self.state.normal_temperature_step / 2
+
+        # The device already has the target, unless a different command of
+        # ours is still on its way and would overwrite it
+        if (
+            reported_temperature is not None
+            and abs(reported_temperature - target_temperature) < tolerance
+            and (
+                self._last_sent_temperature is None
+                or abs(self._last_sent_temperature - target_temperature) < tolerance
+                or reported_temperature != self._reported_at_send
+            )
+        ):
+            return False
+
+        # Already commanded this target and the device has not reported a new
+        # setpoint since, so the command is still on its way
+        if (
+            self._last_sent_temperature is not None
+            and abs(self._last_sent_temperature - target_temperature) < tolerance
+            and reported_temperature == self._reported_at_send
+        ):
+            return False
+
+        return True
+
+    def _calculate_setback_state(self, trigger: str) -> None:
+        """Calculate setback state after a change reported by trigger."""
+        if self._restoring:
+            return
+
+        self.metrics.recalculations += 1
+        previous_setback = self.state.is_setback
 
         # Calculate if setback should be active
         # Skip next setback overrides schedule and input, but forced_setback can still work
         should_be_setback = False
-        if self.data["controller_active"]:
+        if self.state.controller_active:
             # Forced setback always works (manual override)
-            if self.data["forced_setback"]:
+            if self.state.forced_setback:
                 should_be_setback = True
             # Schedule and input only work if skip_next_setback is not set
-            elif not self.data["skip_next_setback"]:
+            elif not self.state.skip_next_setback:
                 should_be_setback = (
-                    self.data["schedule_active"] or self.data["input_is_active"])
-
-        self.data["is_setback"] = should_be_setback
+                    self.state.schedule_active and not self.state.preheating
+                ) or self.state.input_is_active
+
+        if should_be_setback or not self.state.controller_active:
+            self._release_recovery_slot()
+        elif self.state.skip_next_setback:
+            # Skipping the setback is never delayed, give up a place in the queue
+            if self.state.recovery_queued:
+                self._release_recovery_slot()
+        elif self.state.recovery_queued:
+            # Stay in setback until the recovery scheduler grants a slot
+            should_be_setback = True
+        elif previous_setback and trigger in STAGGERED_TRIGGERS:
+            should_be_setback = not self._request_recovery_slot()
+
+        self.state.is_setback = should_be_setback
 
         # Track when setback ends and recovery begins
-        if previous_setback and not self.data["is_setback"]:
+        if previous_setback and not self.state.is_setback:
             # Setback just ended, start tracking recovery
-            self.data["recovery_start_time"] = datetime.now()
-            self.data["is_recovering"] = True
+            self.state.recovery_start_time = self.clock.utcnow()
+            self._recovery_start_monotonic = self.clock.monotonic()
+            self.state.recovery_start_temperature = self._current_temperature()
+            self.state.is_recovering = True
             _LOGGER.debug("Setback ended, starting recovery time tracking")
 
-        self._update_climate_temperature()
+        command_sent = self._update_climate_temperature()
+        self._trace_decision(trigger, command_sent)
+        self._plan_optimal_start()
+
+    def _request_recovery_slot(self) -> bool:
+        """Request a recovery slot, return True if recovery may start now."""
+        scheduler = async_get_recovery_scheduler(self.hass)
+        if not scheduler.enabled:
+            return True
+        # Rooms without a measured recovery go first and get measured
+        expected_duration = (
+            self.recovery_history.ewma or self.state.last_recovery_time or 0.0
+        )
+        granted = scheduler.async_request(
+            self.config_entry.entry_id,
+            expected_duration,
+            self._heating_power,
+            self._async_recovery_slot_granted,
+        )
+        self._recovery_slot = True
+        self.state.recovery_queued = not granted
+        if not granted:
+            _LOGGER.debug("Recovery waits for a slot of the recovery budget")
+        return granted
+
+    def _release_recovery_slot(self) -> None:
+        """Give up the recovery slot, or the place in the queue for one."""
+        if not self._recovery_slot:
+            return
+        self._recovery_slot = False
+        self.state.recovery_queued = False
+        async_get_recovery_scheduler(self.hass).async_release(
+            self.config_entry.entry_id
+        )
+
+    @callback
+    def _async_recovery_slot_granted(self) -> None:
+        """Start the recovery that waited for a slot."""
+        self.state.recovery_queued = False
+        self._calculate_setback_state("recovery_slot")
+        self.async_update_listeners()
+
+    def _trace_decision(self, trigger: str, command_sent: bool) -> None:
+        """Record the decision if the setback state or target changed."""
+        state = self.state
+        decision = (state.is_setback, self._target_temperature())
+        if decision == self._traced and not command_sent:
+            return
+        self._traced = decision
+        self.trace.record(
+            self.clock.utcnow().timestamp(),
+            trigger,
+            decision[1],
+            state.controller_active,
+            state.forced_setback,
+            state.skip_next_setback,
+            state.schedule_active,
+            state.input_is_active,
+            state.is_setback,
+            command_sent,
+            state.preheating,
+        )
+
+    @callback
+    def async_restore(self, key: str, value: Any) -> None:
+        """Restore a value from an entity's last state during startup."""
+        if not self._restoring or key in self._stored_keys:
+            # The store and, once restore has finished, the coordinator state
+            # take precedence over entity state
+            return
+        setattr(self.state, key, value)
+
+    @callback
+    def async_finish_restore(self) -> None:
+        """End the restore phase and apply the restored state once."""
+        if not self._restoring:
+            return
+        self._restoring = False
+        self._calculate_setback_state("restore")
+        self.async_update_listeners()
 
     def set_forced_setback(self, forced_setback: bool) -> None:
         """Set forced setback."""
-        self.data["forced_setback"] = forced_setback
-        self._calculate_setback_state()
+        self.state.forced_setback = forced_setback
+        self._calculate_setback_state("forced_setback")
         self.async_update_listeners()
 
     def set_controller_active(self, active: bool) -> None:
         """Set controller active state."""
-        self.data["controller_active"] = active
-        self._calculate_setback_state()
+        self.state.controller_active = active
+        self._calculate_setback_state("controller_active")
         self.async_update_listeners()
 
     def set_setback_temperature(self, temperature: float) -> None:
         """Set setback temperature."""
-        self.data["setback_temperature"] = temperature
-        self._calculate_setback_state()
+        self.state.setback_temperature = temperature
+        self._calculate_setback_state("setback_temperature")
         self.async_update_listeners()
 
     def set_normal_temperature(self, temperature: float) -> None:
         """Set normal temperature."""
-        self.data["normal_temperature"] = temperature
-        self._calculate_setback_state()
+        self.state.normal_temperature = temperature
+        self._calculate_setback_state("normal_temperature")
         self.async_update_listeners()
 
     def set_skip_next_setback(self, skip: bool) -> None:
         """Set skip next setback flag."""
-        self.data["skip_next_setback"] = skip
+        self.state.skip_next_setback = skip
 
         # Recalculate state when skip flag changes
         # If turning on skip and currently in setback (from schedule/input),
         # this will immediately override to normal temperature
-        self._calculate_setback_state()
+        self._calculate_setback_state("skip_next_setback")
         self.async_update_listeners()
 
     @property
     def is_setback(self) -> bool:
         """Return if setback is currently active."""
-        return self.data["is_setback"]
+        return self.state.is_setback
 
     @property
     def forced_setback(self) -> bool:
         """Return if setback is forced (manual override)."""
-        return self.data["forced_setback"]
+        return self.state.forced_setback
 
     @property
     def setback_temperature(self) -> float:
         """Return setback temperature."""
-        return self.data["setback_temperature"]
+        return self.state.setback_temperature
 
     @property
     def normal_temperature(self) -> float:
         """Return normal temperature."""
-        return self.data["normal_temperature"]
+        return self.state.normal_temperature
 
     @property
     def normal_temperature_min(self) -> float:
         """Return normal temperature minimum."""
-        return self.data["normal_temperature_min"]
+        return self.state.normal_temperature_min
 
     @property
     def normal_temperature_max(self) -> float:
         """Return normal temperature maximum."""
-        return self.data["normal_temperature_max"]
+        return self.state.normal_temperature_max
 
     @property
     def normal_temperature_step(self) -> float:
         """Return normal temperature step."""
-        return self.data["normal_temperature_step"]
+        return self.state.normal_temperature_step
 
     @property
     def climate_device(self) -> str:
@@ -336,44 +1087,114 @@ class ClimateSetbackCoordinator(DataUpdateCoordinator):
         return self._climate_device
 
     @property
-    def schedule_device(self) -> str:
+    def schedule_device(self) -> str | None:
         """Return schedule device entity ID."""
         return self._schedule_device
 
     @property
-    def binary_input_device(self) -> str | None:
-        """Return binary input device entity ID."""
+    def schedule_template(self) -> str | None:
+        """Return the name of the built-in schedule template."""
+        return self._schedule_template
+
+    @property
+    def binary_input_device(self) -> str | list[str] | None:
+        """Return the binary input entity ID, or IDs if several are configured."""
         return self._binary_input
 
+    @property
+    def binary_input_rule(self) -> str:
+        """Return how the binary inputs combine."""
+        return self._binary_input_rule
+
+    @property
+    def active_binary_inputs(self) -> int:
+        """Return the number of binary inputs that are on."""
+        return self._binary_inputs_active
+
+    @property
+    def state_write_interval(self) -> float:
+        """Return the minimum seconds between status sensor state writes."""
+        return self._state_write_interval
+
     @property
     def controller_active(self) -> bool:
         """Return if controller is active."""
-        return self.data["controller_active"]
+        return self.state.controller_active
 
     @property
     def last_recovery_time(self) -> float | None:
         """Return the last recovery time in seconds."""
-        return self.data["last_recovery_time"]
+        return self.state.last_recovery_time
 
     @property
     def is_recovering(self) -> bool:
         """Return if currently recovering from setback."""
-        return self.data["is_recovering"]
+        return self.state.is_recovering
 
     @property
     def recovery_start_time(self) -> datetime | None:
         """Return when current recovery started."""
-        return self.data["recovery_start_time"]
+        return self.state.recovery_start_time
+
+    @property
+    def recovery_statistics(self) -> dict[str, Any]:
+        """Return recovery time statistics over all recoveries."""
+        return self.recovery_history.statistics()
+
+    @property
+    def heating_rate(self) -> float | None:
+        """Return the learned heating rate in degrees per hour."""
+        return self.heating_model.heating_rate
+
+    @property
+    def optimal_start_time(self) -> datetime | None:
+        """Return when the current setback is planned to end early."""
+        return self.state.optimal_start_time
+
+    @property
+    def preheating(self) -> bool:
+        """Return if setback ended early to reach normal temperature on time."""
+        return self.state.preheating
+
+    @property
+    def recovery_queued(self) -> bool:
+        """Return if setback is held until a recovery slot is granted."""
+        return self.state.recovery_queued
 
     @property
     def skip_next_setback(self) -> bool:
         """Return if next setback should be skipped."""
-        return self.data["skip_next_setback"]
+        return self.state.skip_next_setback
+
+    @property
+    def suppressed_commands(self) -> int:
+        """Return the number of redundant set_temperature calls skipped."""
+        return self.metrics.suppressed_commands
+
+    @property
+    def command_queue_depth(self) -> int:
+        """Return the number of queued and in-flight commands."""
+        return self.state.command_queue_depth
+
+    @property
+    def command_last_error(self) -> str | None:
+        """Return the last error from setting the climate temperature."""
+        return self.state.command_last_error
+
+    @property
+    def service_calls(self) -> int:
+        """Return the number of set_temperature commands sent to the device."""
+        return async_get_dispatcher(self.hass).sent_calls(self._climate_device)
+
+    @property
+    def failed_commands(self) -> int:
+        """Return the number of failed set_temperature calls."""
+        return async_get_dispatcher(self.hass).failed_calls(self._climate_device)
 
     @property
     def unit_of_measurement(self) -> str | None:
         """Return unit of measurement from climate device."""
-        return self.data["unit_of_measurement"]
+        return self.state.unit_of_measurement
 
     @property
     def device_info(self) -> DeviceInfo:
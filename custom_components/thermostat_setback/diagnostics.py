@@ -0,0 +1,57 @@
+"""Diagnostics support for climate setback."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .commands import async_get_dispatcher
+from .const import DOMAIN
+from .recovery_scheduler import async_get_recovery_scheduler
+from .router import async_get_router
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    dispatcher = async_get_dispatcher(hass)
+    scheduler = async_get_recovery_scheduler(hass)
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "state": dict(coordinator.data),
+        "metrics": {
+            **coordinator.metrics.as_dict(),
+            "service_calls": coordinator.service_calls,
+            "failed_commands": coordinator.failed_commands,
+            "published_versions": coordinator.version,
+        },
+        "recovery": {
+            "statistics": coordinator.recovery_statistics,
+            "events": coordinator.recovery_history.events(),
+            "scheduler": {
+                "max_concurrent": scheduler.max_concurrent,
+                "power_budget": scheduler.power_budget,
+                "active": scheduler.active,
+                "waiting": scheduler.waiting,
+                "deferred": scheduler.deferred,
+            },
+        },
+        "binary_inputs": {
+            "entities": coordinator.binary_input_device,
+            "rule": coordinator.binary_input_rule,
+            "active": coordinator.active_binary_inputs,
+        },
+        "trace": coordinator.trace.transitions(),
+        "dispatcher": dispatcher.metrics,
+        "router": {
+            "tracked_entities": async_get_router(hass).tracked_entities,
+        },
+    }
@@ -0,0 +1,92 @@
+"""Base entity for climate setback integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import ClimateSetbackCoordinator
+
+
+class SetbackCoordinatorEntity(CoordinatorEntity[ClimateSetbackCoordinator]):
+    """Coordinator entity that only writes state when its rendering changed."""
+
+    # Configuration entity IDs, repeated on every state but only changed by
+    # the options, which are stored already, and the command queue status,
+    # which changes with every command
+    _unrecorded_attributes = frozenset(
+        {
+            "climate_device",
+            "schedule_device",
+            "schedule_template",
+            "binary_input_device",
+            "command_queue_depth",
+            "command_last_error",
+        }
+    )
+
+    # Coordinator data keys rendered by the entity
+    _coordinator_fields: frozenset[str] = frozenset()
+    # Coordinator data keys shown in the cached state attributes
+    _attribute_fields: frozenset[str] = frozenset()
+    # Whether state writes are limited by the state write interval option
+    _throttle_writes = False
+
+    _cached_attributes: dict[str, Any] | None = None
+    _last_rendered: tuple[Any, ...] | None = None
+    _last_write: float | None = None
+    _unsub_delayed_write: CALLBACK_TYPE | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state if a rendered field changed the state or attributes."""
+        changed_fields = self.coordinator.changed_fields
+        if changed_fields.isdisjoint(self._coordinator_fields):
+            return
+        if not changed_fields.isdisjoint(self._attribute_fields):
+            self._cached_attributes = None
+
+        if self._throttle_writes and self._unsub_delayed_write is not None:
+            # A delayed write is already scheduled and will pick up the change
+            return
+
+        interval = self.coordinator.state_write_interval
+        if self._throttle_writes and interval and self._last_write is not None:
+            clock = self.coordinator.clock
+            remaining = self._last_write + interval - clock.monotonic()
+            if remaining > 0:
+                self._unsub_delayed_write = clock.call_later(
+                    remaining, self._async_delayed_write
+                )
+                return
+
+        self._async_write_if_changed()
+
+    @callback
+    def _async_delayed_write(self) -> None:
+        """Write state held back by the state write interval."""
+        self._unsub_delayed_write = None
+        self._async_write_if_changed()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write state unless the rendered state and attributes are unchanged."""
+        rendered = (
+            self.state,
+            self.capability_attributes,
+            self.extra_state_attributes,
+        )
+        if rendered == self._last_rendered:
+            return
+        self._last_rendered = rendered
+        self._last_write = self.coordinator.clock.monotonic()
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending delayed write."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_delayed_write is not None:
+            self._unsub_delayed_write()
+            self._unsub_delayed_write = None
@@ -0,0 +1,104 @@
+"""Hot-path counters and callback latency histograms for a coordinator."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds in seconds of the callback latency histogram buckets; the
+# last bucket counts everything slower
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.25)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of callback run times."""
+
+    __slots__ = ("counts", "total", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = array("Q", bytes(8 * (len(LATENCY_BUCKETS) + 1)))
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add a callback run time."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    @property
+    def count(self) -> int:
+        """Return the number of run times added."""
+        return sum(self.counts)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram with cumulative bucket counts."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": cumulative,
+            "total": self.total,
+            "max": self.maximum,
+            "buckets": buckets,
+        }
+
+
+class CoordinatorMetrics:
+    """Counters recorded by a coordinator while handling events.
+
+    Every counter is a plain integer increment and every latency sample a
+    bisect into a short tuple, so the metrics are always on.
+    """
+
+    __slots__ = (
+        "events",
+        "filtered_events",
+        "recalculations",
+        "suppressed_commands",
+        "schedule_boundaries",
+        "fanouts",
+        "latency",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        # State change events received per source entity
+        self.events: dict[str, int] = {}
+        # Events ignored because nothing the coordinator uses changed
+        self.filtered_events = 0
+        self.recalculations = 0
+        # set_temperature calls skipped as redundant
+        self.suppressed_commands = 0
+        # Transitions of a built-in schedule applied by its timer
+        self.schedule_boundaries = 0
+        # Listener updates that published a changed state
+        self.fanouts = 0
+        # Callback latency per event source kind
+        self.latency: dict[str, LatencyHistogram] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Return the latency histogram of a callback, creating it on first use."""
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = self.latency[name] = LatencyHistogram()
+        return histogram
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dictionary."""
+        return {
+            "events": dict(self.events),
+            "filtered_events": self.filtered_events,
+            "recalculations": self.recalculations,
+            "suppressed_commands": self.suppressed_commands,
+            "schedule_boundaries": self.schedule_boundaries,
+            "fanouts": self.fanouts,
+            "callback_latency": {
+                name: histogram.as_dict() for name, histogram in self.latency.items()
+            },
+        }
@@ -9,7 +9,6 @@ from homeassistant.components.number import NumberEntity, NumberMode, NumberDevi
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import (
@@ -17,6 +16,7 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import ClimateSetbackCoordinator
+from .entity import SetbackCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,10 +34,21 @@ async def async_setup_entry(
     ])
 
 
-class SetbackTemperatureNumber(NumberEntity, CoordinatorEntity, RestoreEntity):
+class SetbackTemperatureNumber(NumberEntity, SetbackCoordinatorEntity, RestoreEntity):
     """Representation of a setback temperature number entity."""
 
     _attr_should_poll = False
+    _coordinator_fields = frozenset(
+        {
+            "setback_temperature",
+            "normal_temperature_min",
+            "normal_temperature_max",
+            "normal_temperature_step",
+            "unit_of_measurement",
+            "controller_active",
+        }
+    )
+    _attribute_fields = frozenset({"controller_active"})
     _attr_mode = NumberMode.AUTO
     _attr_device_class = NumberDeviceClass.TEMPERATURE
 
@@ -54,7 +65,7 @@ class SetbackTemperatureNumber(NumberEntity, CoordinatorEntity, RestoreEntity):
     @property
     def native_value(self) -> float:
         """Return the current setback temperature."""
-        return self.coordinator.data["setback_temperature"]
+        return self.coordinator.setback_temperature
 
     @property
     def native_min_value(self) -> float:
@@ -79,16 +90,17 @@ class SetbackTemperatureNumber(NumberEntity, CoordinatorEntity, RestoreEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        return {
-            "climate_device": self.coordinator.climate_device,
-            "schedule_device": self.coordinator.schedule_device,
-            "controller_active": self.coordinator.controller_active,
-        }
+        if self._cached_attributes is None:
+            self._cached_attributes = {
+                "climate_device": self.coordinator.climate_device,
+                "schedule_device": self.coordinator.schedule_device,
+                "controller_active": self.coordinator.controller_active,
+            }
+        return self._cached_attributes
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the setback temperature."""
         self.coordinator.set_setback_temperature(value)
-        self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -98,18 +110,27 @@ class SetbackTemperatureNumber(NumberEntity, CoordinatorEntity, RestoreEntity):
         if not state or not state.state:
             return
         try:
-            # Convert state string to float and restore using setter method
+            # Convert state string to float and restore to the coordinator
             temperature = float(state.state)
-            self.coordinator.set_setback_temperature(temperature)
+            self.coordinator.async_restore("setback_temperature", temperature)
         except (ValueError, TypeError):
             # Invalid state value, skip restoration
             return
 
 
-class NormalTemperatureNumber(NumberEntity, CoordinatorEntity, RestoreEntity):
+class NormalTemperatureNumber(NumberEntity, SetbackCoordinatorEntity, RestoreEntity):
     """Representation of a normal temperature number entity."""
 
     _attr_should_poll = False
+    _coordinator_fields = frozenset(
+        {
+            "normal_temperature",
+            "normal_temperature_min",
+            "normal_temperature_max",
+            "normal_temperature_step",
+            "unit_of_measurement",
+        }
+    )
     _attr_mode = NumberMode.SLIDER
     _attr_device_class = NumberDeviceClass.TEMPERATURE
 
@@ -146,12 +167,11 @@ class NormalTemperatureNumber(NumberEntity, CoordinatorEntity, RestoreEntity):
     @property
     def native_value(self) -> float:
         """Return the current normal temperature."""
-        return self.coordinator.data["normal_temperature"]
+        return self.coordinator.normal_temperature
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the normal temperature."""
         self.coordinator.set_normal_temperature(value)
-        self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -161,9 +181,9 @@ class NormalTemperatureNumber(NumberEntity, CoordinatorEntity, RestoreEntity):
         if not state or not state.state:
             return
         try:
-            # Convert state string to float and restore using setter method
+            # Convert state string to float and restore to the coordinator
             temperature = float(state.state)
-            self.coordinator.set_normal_temperature(temperature)
+            self.coordinator.async_restore("normal_temperature", temperature)
         except (ValueError, TypeError):
             # Invalid state value, skip restoration
             return
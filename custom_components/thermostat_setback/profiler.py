@@ -0,0 +1,137 @@
+"""On-demand profiling of the integration."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import pstats
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PROFILER, DEFAULT_PROFILE_TOP, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Functions defined in this package are reported, everything else is noise
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class IntegrationProfiler:
+    """Deterministic profiler for the coordinator callbacks and entities.
+
+    cProfile is only enabled between start and stop, so there is no
+    overhead at all while no profile runs. It is started from the event
+    loop, but on Python 3.12 and later it uses sys.monitoring, which traces
+    every thread of the process: executor jobs, the recorder and other
+    integrations are in the profile too, and all of them slow down while it
+    runs, so the duration is capped. The result is written in the standard
+    pstats format and summarized as the hot functions of this package by
+    cumulative time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self._profile: cProfile.Profile | None = None
+        self._started = 0.0
+        self._top = DEFAULT_PROFILE_TOP
+        self._cancel_stop: CALLBACK_TYPE | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while a profile is running."""
+        return self._profile is not None
+
+    @callback
+    def async_start(self, duration: float, top: int = DEFAULT_PROFILE_TOP) -> None:
+        """Start profiling and stop automatically after duration seconds."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Only one profiler can be active per thread
+            raise HomeAssistantError(
+                "Cannot start profiling, another profiler is active on the event"
+                f" loop: {err}"
+            ) from err
+        self._profile = profile
+        self._top = top
+        self._started = self.hass.loop.time()
+        self._cancel_stop = async_call_later(self.hass, duration, self._async_timeout)
+        _LOGGER.info("Profiling started for %s seconds", duration)
+
+    @callback
+    def _async_timeout(self, _now: Any) -> None:
+        """Stop a profile whose duration has elapsed."""
+        self._cancel_stop = None
+        self.hass.async_create_task(self.async_stop())
+
+    async def async_stop(self, top: int | None = None) -> dict[str, Any]:
+        """Stop profiling, write the profile and return the hot functions."""
+        profile = self._profile
+        if profile is None:
+            return {}
+        profile.disable()
+        self._profile = None
+        if self._cancel_stop is not None:
+            self._cancel_stop()
+            self._cancel_stop = None
+        duration = self.hass.loop.time() - self._started
+
+        path = self.hass.config.path(
+            f"{DOMAIN}_profile_{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}.prof"
+        )
+        functions = await self.hass.async_add_executor_job(
+            _write_profile, profile, path, top or self._top
+        )
+        _LOGGER.info(
+            "Profile of %.1f seconds written to %s, hot functions: %s",
+            duration,
+            path,
+            ", ".join(
+                f"{function['function']} {function['cumulative_time']:.4f} s"
+                for function in functions
+            ),
+        )
+        return {
+            "path": path,
+            "duration": round(duration, 3),
+            "functions": functions,
+        }
+
+
+def _write_profile(
+    profile: cProfile.Profile, path: str, top: int
+) -> list[dict[str, Any]]:
+    """Dump the profile and return the package functions by cumulative time."""
+    profile.dump_stats(path)
+    stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    functions = [
+        (key, value) for key, value in stats.items() if key[0].startswith(PACKAGE_DIR)
+    ]
+    functions.sort(key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": (f"{os.path.relpath(filename, PACKAGE_DIR)}:{line}({name})"),
+            "calls": calls,
+            "total_time": round(total_time, 6),
+            "cumulative_time": round(cumulative_time, 6),
+        }
+        for (filename, line, name), (_, calls, total_time, cumulative_time, _) in (
+            functions[:top]
+        )
+    ]
+
+
+@callback
+def async_get_profiler(hass: HomeAssistant) -> IntegrationProfiler:
+    """Return the domain profiler, creating it on first use."""
+    profiler = hass.data.get(DATA_PROFILER)
+    if profiler is None:
+        profiler = hass.data[DATA_PROFILER] = IntegrationProfiler(hass)
+    return profiler
@@ -0,0 +1,219 @@
+"""Prometheus text format metrics for all climate setback controllers."""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .commands import async_get_dispatcher
+from .const import DOMAIN
+from .metrics import LATENCY_BUCKETS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PREFIX = DOMAIN
+
+# Metric families, in output order: (name, type, help)
+FAMILIES = (
+    ("setback_active", "gauge", "1 if setback is active"),
+    ("controller_active", "gauge", "1 if the controller is active"),
+    ("forced_setback", "gauge", "1 if setback is forced"),
+    ("recovering", "gauge", "1 while recovering from setback"),
+    ("target_temperature", "gauge", "Target temperature for the current state"),
+    ("setback_temperature", "gauge", "Setback temperature"),
+    ("normal_temperature", "gauge", "Normal temperature"),
+    ("last_recovery_seconds", "gauge", "Duration of the last recovery"),
+    ("recovery_seconds", "summary", "Recovery durations"),
+    ("events_total", "counter", "State change events received per source"),
+    ("filtered_events_total", "counter", "Events ignored by the filter"),
+    ("recalculations_total", "counter", "Setback state recalculations"),
+    ("fanouts_total", "counter", "State updates published to entities"),
+    ("service_calls_total", "counter", "set_temperature commands sent"),
+    ("failed_commands_total", "counter", "Failed set_temperature calls"),
+    ("suppressed_commands_total", "counter", "Redundant commands skipped"),
+    ("command_queue_depth", "gauge", "Queued and in-flight commands"),
+    ("callback_latency_seconds", "histogram", "Event callback run time"),
+)
+
+# Dispatcher metrics shared by all controllers: (name, metrics key, type, help)
+DISPATCHER_FAMILIES = (
+    ("command_batches_total", "batches", "counter", "Successful calls"),
+    ("commands_total", "commands", "counter", "Commands in successful calls"),
+    ("command_failed_batches_total", "failed_batches", "counter", "Failed calls"),
+    ("command_timeouts_total", "timeouts", "counter", "Timed out calls"),
+    ("command_retries_total", "retries", "counter", "Retried commands"),
+    ("command_dropped_total", "dropped", "counter", "Commands given up"),
+    ("command_latency_seconds_last", "last_latency", "gauge", "Last latency"),
+    ("command_latency_seconds_max", "max_latency", "gauge", "Maximum latency"),
+    ("command_latency_seconds_average", "average_latency", "gauge", "Mean latency"),
+)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: Any) -> str:
+    """Format a sample value."""
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _render_coordinator(coordinator: Any) -> list[str]:
+    """Return the samples of one controller, one chunk per family."""
+    entry = coordinator.config_entry
+    labels = f'entry="{entry.entry_id}",name="{_escape(entry.title)}"'
+    state = coordinator.state
+    metrics = coordinator.metrics
+    history = coordinator.recovery_history
+
+    def sample(family: str, value: Any, extra: str = "") -> str:
+        return f"{PREFIX}_{family}{{{labels}{extra}}} {_number(value)}\n"
+
+    recovery = "".join(
+        (
+            sample("recovery_seconds", history.p50, ',quantile="0.5"'),
+            sample("recovery_seconds", history.p90, ',quantile="0.9"'),
+            f"{PREFIX}_recovery_seconds_sum{{{labels}}} "
+            f"{_number((history.mean or 0.0) * history.count)}\n",
+            f"{PREFIX}_recovery_seconds_count{{{labels}}} {history.count}\n",
+        )
+    )
+    events = "".join(
+        sample("events_total", count, f',source="{_escape(source)}"')
+        for source, count in metrics.events.items()
+    )
+    latency = []
+    for name, histogram in metrics.latency.items():
+        callback_label = f'callback="{name}"'
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram.counts):
+            cumulative += count
+            latency.append(
+                f"{PREFIX}_callback_latency_seconds_bucket"
+                f'{{{labels},{callback_label},le="{bound}"}} {cumulative}\n'
+            )
+        latency.append(
+            f"{PREFIX}_callback_latency_seconds_sum{{{labels},{callback_label}}} "
+            f"{_number(histogram.total)}\n"
+        )
+        latency.append(
+            f"{PREFIX}_callback_latency_seconds_count{{{labels},{callback_label}}} "
+            f"{cumulative}\n"
+        )
+
+    return [
+        sample("setback_active", state.is_setback),
+        sample("controller_active", state.controller_active),
+        sample("forced_setback", state.forced_setback),
+        sample("recovering", state.is_recovering),
+        sample(
+            "target_temperature",
+            state.setback_temperature if state.is_setback else state.normal_temperature,
+        ),
+        sample("setback_temperature", state.setback_temperature),
+        sample("normal_temperature", state.normal_temperature),
+        sample("last_recovery_seconds", state.last_recovery_time),
+        recovery,
+        events,
+        sample("filtered_events_total", metrics.filtered_events),
+        sample("recalculations_total", metrics.recalculations),
+        sample("fanouts_total", metrics.fanouts),
+        sample("service_calls_total", coordinator.service_calls),
+        sample("failed_commands_total", coordinator.failed_commands),
+        sample("suppressed_commands_total", metrics.suppressed_commands),
+        sample("command_queue_depth", state.command_queue_depth),
+        "".join(latency),
+    ]
+
+
+def _cache_key(coordinator: Any) -> tuple[Any, ...]:
+    """Return the values whose change invalidates a controller's chunks."""
+    state = coordinator.state
+    metrics = coordinator.metrics
+    # Every rendered value that can move without a new published version
+    return (
+        coordinator.version,
+        sum(metrics.events.values()),
+        metrics.filtered_events,
+        metrics.recalculations,
+        metrics.fanouts,
+        coordinator.service_calls,
+        coordinator.failed_commands,
+        metrics.suppressed_commands,
+        state.command_queue_depth,
+        tuple(histogram.count for histogram in metrics.latency.values()),
+    )
+
+
+class MetricsRenderer:
+    """Render metrics from per-controller chunks cached between scrapes.
+
+    A controller's chunks are rendered again only when its published state
+    version or one of its counters moved since the last scrape, so a scrape
+    of an idle fleet is a join of cached strings.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._cache: dict[str, tuple[tuple[Any, ...], list[str]]] = {}
+
+    def render(
+        self, coordinators: list[Any], dispatcher_metrics: dict[str, Any]
+    ) -> str:
+        """Return the metrics page."""
+        cache = self._cache
+        chunks = []
+        entry_ids = set()
+        for coordinator in coordinators:
+            entry_id = coordinator.config_entry.entry_id
+            entry_ids.add(entry_id)
+            key = _cache_key(coordinator)
+            cached = cache.get(entry_id)
+            if cached is None or cached[0] != key:
+                cached = cache[entry_id] = (key, _render_coordinator(coordinator))
+            chunks.append(cached[1])
+        for entry_id in cache.keys() - entry_ids:
+            del cache[entry_id]
+
+        output = []
+        for index, (name, metric_type, description) in enumerate(FAMILIES):
+            output.append(f"# HELP {PREFIX}_{name} {description}\n")
+            output.append(f"# TYPE {PREFIX}_{name} {metric_type}\n")
+            output.extend(chunk[index] for chunk in chunks)
+        for name, key, metric_type, description in DISPATCHER_FAMILIES:
+            output.append(f"# HELP {PREFIX}_{name} {description}\n")
+            output.append(f"# TYPE {PREFIX}_{name} {metric_type}\n")
+            output.append(f"{PREFIX}_{name} {_number(dispatcher_metrics[key])}\n")
+        return "".join(output)
+
+
+class SetbackMetricsView(HomeAssistantView):
+    """Serve controller metrics in the Prometheus text format."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._renderer = MetricsRenderer()
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics page."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        coordinators = [
+            entry_data["coordinator"]
+            for entry_data in hass.data.get(DOMAIN, {}).values()
+        ]
+        body = self._renderer.render(coordinators, async_get_dispatcher(hass).metrics)
+        return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
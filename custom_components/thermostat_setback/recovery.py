@@ -0,0 +1,366 @@
+"""Recovery time history, streaming statistics and heating model."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import insort
+from typing import Any
+
+from .const import (
+    HEATING_MODEL_DECAY,
+    HEATING_MODEL_MIN_SAMPLES,
+    RECOVERY_EWMA_ALPHA,
+    RECOVERY_HISTORY_SIZE,
+)
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P-square algorithm.
+
+    Keeps five markers regardless of the number of samples, so memory and
+    the cost of adding a sample are constant (Jain & Chlamtac, 1985).
+    """
+
+    __slots__ = ("p", "count", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, p: float) -> None:
+        """Initialize the estimator for quantile p (0 < p < 1)."""
+        self.p = p
+        self.count = 0
+        self._heights: list[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            insort(heights, x)
+            return
+
+        positions = self._positions
+        if x < heights[0]:
+            heights[0] = x
+            cell = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            cell = 3
+        else:
+            cell = 0
+            while x >= heights[cell + 1]:
+                cell += 1
+
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        desired = self._desired
+        for i in range(5):
+            desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            delta = desired[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or (
+                delta <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Return the piecewise-parabolic marker height adjustment."""
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        """Return the linear marker height adjustment."""
+        q = self._heights
+        n = self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    @property
+    def value(self) -> float | None:
+        """Return the current quantile estimate."""
+        if not self.count:
+            return None
+        if self.count <= 5:
+            return self._heights[round(self.p * (self.count - 1))]
+        return self._heights[2]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the estimator state for storage."""
+        return {
+            "count": self.count,
+            "heights": list(self._heights),
+            "positions": list(self._positions),
+            "desired": list(self._desired),
+        }
+
+    @classmethod
+    def from_dict(cls, p: float, data: dict[str, Any]) -> P2Quantile:
+        """Restore an estimator from storage."""
+        estimator = cls(p)
+        estimator.count = data["count"]
+        estimator._heights = list(data["heights"])
+        estimator._positions = list(data["positions"])
+        estimator._desired = list(data["desired"])
+        return estimator
+
+
+class RecoveryHistory:
+    """Fixed-size ring buffer of recoveries with streaming statistics.
+
+    Events are kept in preallocated arrays, so memory per controller is
+    bounded by the capacity. Mean, EWMA and P50/P90 cover every recovery
+    ever recorded and are updated in constant time.
+    """
+
+    def __init__(self, capacity: int = RECOVERY_HISTORY_SIZE) -> None:
+        """Initialize an empty history."""
+        self.capacity = capacity
+        self._durations = array("d", bytes(8 * capacity))
+        self._start_temperatures = array("d", bytes(8 * capacity))
+        self._target_temperatures = array("d", bytes(8 * capacity))
+        self._timestamps = array("d", bytes(8 * capacity))
+        # Next slot to write and number of filled slots
+        self._index = 0
+        self._size = 0
+
+        self.count = 0
+        self.mean: float | None = None
+        self.ewma: float | None = None
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self._p50 = P2Quantile(0.5)
+        self._p90 = P2Quantile(0.9)
+
+    def add(
+        self,
+        duration: float,
+        start_temperature: float | None,
+        target_temperature: float | None,
+        timestamp: float,
+    ) -> None:
+        """Record a completed recovery."""
+        index = self._index
+        self._durations[index] = duration
+        # NaN marks an unknown temperature
+        self._start_temperatures[index] = (
+            float("nan") if start_temperature is None else start_temperature
+        )
+        self._target_temperatures[index] = (
+            float("nan") if target_temperature is None else target_temperature
+        )
+        self._timestamps[index] = timestamp
+        self._index = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+        self.count += 1
+        if self.mean is None:
+            self.mean = self.ewma = self.minimum = self.maximum = duration
+        else:
+            self.mean += (duration - self.mean) / self.count
+            self.ewma += RECOVERY_EWMA_ALPHA * (duration - self.ewma)
+            self.minimum = min(self.minimum, duration)
+            self.maximum = max(self.maximum, duration)
+        self._p50.add(duration)
+        self._p90.add(duration)
+
+    @property
+    def p50(self) -> float | None:
+        """Return the estimated median recovery time."""
+        return self._p50.value
+
+    @property
+    def p90(self) -> float | None:
+        """Return the estimated 90th percentile recovery time."""
+        return self._p90.value
+
+    def events(self) -> list[dict[str, Any]]:
+        """Return the buffered recoveries, newest first."""
+        events = []
+        for offset in range(1, self._size + 1):
+            index = (self._index - offset) % self.capacity
+            start = self._start_temperatures[index]
+            target = self._target_temperatures[index]
+            events.append(
+                {
+                    "duration": self._durations[index],
+                    "start_temperature": None if start != start else start,
+                    "target_temperature": None if target != target else target,
+                    "timestamp": self._timestamps[index],
+                }
+            )
+        return events
+
+    def statistics(self) -> dict[str, Any]:
+        """Return rounded statistics for display."""
+        return {
+            "recovery_count": self.count,
+            "mean_recovery_time": _round(self.mean),
+            "ewma_recovery_time": _round(self.ewma),
+            "p50_recovery_time": _round(self.p50),
+            "p90_recovery_time": _round(self.p90),
+            "min_recovery_time": _round(self.minimum),
+            "max_recovery_time": _round(self.maximum),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the history for storage."""
+        return {
+            "events": self.events(),
+            "count": self.count,
+            "mean": self.mean,
+            "ewma": self.ewma,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "p50": self._p50.as_dict(),
+            "p90": self._p90.as_dict(),
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], capacity: int = RECOVERY_HISTORY_SIZE
+    ) -> RecoveryHistory:
+        """Restore a history from storage."""
+        history = cls(capacity)
+        for event in reversed(data["events"][:capacity]):
+            index = history._index
+            history._durations[index] = event["duration"]
+            history._start_temperatures[index] = (
+                float("nan")
+                if event["start_temperature"] is None
+                else event["start_temperature"]
+            )
+            history._target_temperatures[index] = (
+                float("nan")
+                if event["target_temperature"] is None
+                else event["target_temperature"]
+            )
+            history._timestamps[index] = event["timestamp"]
+            history._index = (index + 1) % capacity
+            history._size += 1
+        history.count = data["count"]
+        history.mean = data["mean"]
+        history.ewma = data["ewma"]
+        history.minimum = data["minimum"]
+        history.maximum = data["maximum"]
+        history._p50 = P2Quantile.from_dict(0.5, data["p50"])
+        history._p90 = P2Quantile.from_dict(0.9, data["p90"])
+        return history
+
+
+class HeatingRateModel:
+    """Online least-squares model of the recovery time of a room.
+
+    Predicts duration = b0 + b1 * rise (+ b2 * (target - outdoor)), where
+    rise is the target minus the start temperature. Only exponentially
+    decayed sums of x*x and x*y are kept, so adding a sample and predicting
+    take constant time and storage, and the model follows seasonal change.
+    """
+
+    __slots__ = ("features", "count", "_xx", "_xy")
+
+    def __init__(self, outdoor: bool = False) -> None:
+        """Initialize an empty model, with the outdoor term if outdoor."""
+        self.features = 3 if outdoor else 2
+        self.count = 0
+        self._xx = array("d", bytes(8 * self.features * self.features))
+        self._xy = array("d", bytes(8 * self.features))
+
+    def _vector(
+        self, rise: float, outdoor_difference: float | None
+    ) -> tuple[float, ...] | None:
+        """Return the regressors, None if the outdoor term is missing."""
+        if self.features == 2:
+            return (1.0, rise)
+        if outdoor_difference is None:
+            return None
+        return (1.0, rise, outdoor_difference)
+
+    def add(
+        self, duration: float, rise: float, outdoor_difference: float | None = None
+    ) -> None:
+        """Add a completed recovery."""
+        if (x := self._vector(rise, outdoor_difference)) is None:
+            return
+        k = self.features
+        xx = self._xx
+        xy = self._xy
+        for i in range(k):
+            xy[i] = xy[i] * HEATING_MODEL_DECAY + x[i] * duration
+            for j in range(k):
+                xx[i * k + j] = xx[i * k + j] * HEATING_MODEL_DECAY + x[i] * x[j]
+        self.count += 1
+
+    def coefficients(self) -> list[float] | None:
+        """Return the fitted coefficients, None until enough samples exist."""
+        if self.count < HEATING_MODEL_MIN_SAMPLES:
+            return None
+        k = self.features
+        # Normal equations with a small ridge on the slopes, which keeps them
+        # solvable while all samples share the same rise
+        rows = [
+            [self._xx[i * k + j] + (1e-3 if i == j and i else 0.0) for j in range(k)]
+            + [self._xy[i]]
+            for i in range(k)
+        ]
+        for column in range(k):
+            pivot = max(range(column, k), key=lambda row: abs(rows[row][column]))
+            if abs(rows[pivot][column]) < 1e-12:
+                return None
+            rows[column], rows[pivot] = rows[pivot], rows[column]
+            for row in range(k):
+                if row != column:
+                    factor = rows[row][column] / rows[column][column]
+                    for index in range(column, k + 1):
+                        rows[row][index] -= factor * rows[column][index]
+        return [rows[i][k] / rows[i][i] for i in range(k)]
+
+    def predict(
+        self, rise: float, outdoor_difference: float | None = None
+    ) -> float | None:
+        """Return the predicted recovery time in seconds."""
+        if (x := self._vector(rise, outdoor_difference)) is None:
+            return None
+        if (coefficients := self.coefficients()) is None:
+            return None
+        return max(sum(b * value for b, value in zip(coefficients, x)), 0.0)
+
+    @property
+    def heating_rate(self) -> float | None:
+        """Return the learned heating rate in degrees per hour."""
+        coefficients = self.coefficients()
+        if coefficients is None or coefficients[1] <= 0:
+            return None
+        return 3600 / coefficients[1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the model for storage."""
+        return {
+            "features": self.features,
+            "count": self.count,
+            "xx": list(self._xx),
+            "xy": list(self._xy),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HeatingRateModel:
+        """Restore a model from storage."""
+        model = cls(outdoor=data["features"] == 3)
+        model.count = data["count"]
+        model._xx = array("d", data["xx"])
+        model._xy = array("d", data["xy"])
+        return model
+
+
+def _round(value: float | None) -> float | None:
+    """Round a duration to a tenth of a second."""
+    return None if value is None else round(value, 1)
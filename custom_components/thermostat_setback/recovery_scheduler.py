@@ -0,0 +1,170 @@
+"""Stagger recoveries across controllers under a site-wide heating budget."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import count
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .clock import async_get_clock
+from .const import DATA_RECOVERY_SCHEDULER, RECOVERY_SLOT_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Slot:
+    """A controller recovering, or waiting to recover."""
+
+    expected_duration: float
+    power: float
+    action: Callable[[], None]
+    cancel_timeout: CALLBACK_TYPE | None = None
+
+
+class RecoveryScheduler:
+    """Grant recovery slots under a concurrency and power budget.
+
+    When a shared schedule ends, controllers request a slot instead of
+    returning to normal temperature at once. Waiting controllers are
+    granted shortest expected recovery first, which minimizes the total
+    time to comfort across the site. A slot is held until the recovery
+    completes, setback resumes or RECOVERY_SLOT_TIMEOUT passes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int | None = None,
+        power_budget: float | None = None,
+    ) -> None:
+        """Initialize the scheduler, unlimited if no budget is given."""
+        self.hass = hass
+        self.max_concurrent = max_concurrent
+        self.power_budget = power_budget
+        self._active: dict[str, _Slot] = {}
+        self._active_power = 0.0
+        # Heap of (expected duration, sequence, key), entries of controllers
+        # no longer waiting are skipped when they reach the top
+        self._queue: list[tuple[float, int, str]] = []
+        self._waiting: dict[str, _Slot] = {}
+        self._sequence = count()
+        # Slots granted after waiting
+        self.deferred = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if a budget is configured."""
+        return self.max_concurrent is not None or self.power_budget is not None
+
+    @property
+    def active(self) -> int:
+        """Return the number of controllers holding a slot."""
+        return len(self._active)
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of controllers waiting for a slot."""
+        return len(self._waiting)
+
+    def _fits(self, power: float) -> bool:
+        """Return True if a recovery drawing power fits the budget."""
+        if not self._active:
+            # A room larger than the whole budget still recovers on its own
+            return True
+        if self.max_concurrent is not None and len(self._active) >= self.max_concurrent:
+            return False
+        return (
+            self.power_budget is None or self._active_power + power <= self.power_budget
+        )
+
+    @callback
+    def async_request(
+        self,
+        key: str,
+        expected_duration: float,
+        power: float,
+        action: Callable[[], None],
+    ) -> bool:
+        """Request a slot, return True if granted now.
+
+        Otherwise action is called once the slot is granted.
+        """
+        self.async_release(key)
+        slot = _Slot(expected_duration, power, action)
+        if not self._waiting and self._fits(power):
+            self._activate(key, slot)
+            return True
+        self._waiting[key] = slot
+        heapq.heappush(self._queue, (expected_duration, next(self._sequence), key))
+        return False
+
+    @callback
+    def async_release(self, key: str) -> None:
+        """Give up the slot of a controller, or stop waiting for one."""
+        if self._waiting.pop(key, None) is not None:
+            return
+        slot = self._active.pop(key, None)
+        if slot is None:
+            return
+        if slot.cancel_timeout is not None:
+            slot.cancel_timeout()
+        self._active_power -= slot.power
+        if not self._active:
+            # Clear rounding errors of the running sum
+            self._active_power = 0.0
+        self._async_grant()
+
+    def _activate(self, key: str, slot: _Slot) -> None:
+        """Start a slot and its timeout."""
+        self._active[key] = slot
+        self._active_power += slot.power
+
+        @callback
+        def _async_timeout() -> None:
+            """Release a slot whose recovery did not complete."""
+            slot.cancel_timeout = None
+            _LOGGER.warning(
+                "Recovery of %s did not complete in %s seconds, releasing its slot",
+                key,
+                RECOVERY_SLOT_TIMEOUT,
+            )
+            self.async_release(key)
+
+        slot.cancel_timeout = async_get_clock(self.hass).call_later(
+            RECOVERY_SLOT_TIMEOUT, _async_timeout
+        )
+
+    @callback
+    def _async_grant(self) -> None:
+        """Grant slots to waiting controllers in priority order."""
+        queue = self._queue
+        while queue:
+            _, _, key = queue[0]
+            slot = self._waiting.get(key)
+            if slot is None or slot.expected_duration != queue[0][0]:
+                heapq.heappop(queue)
+                continue
+            if not self._fits(slot.power):
+                return
+            heapq.heappop(queue)
+            del self._waiting[key]
+            self._activate(key, slot)
+            self.deferred += 1
+            try:
+                slot.action()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error starting the recovery of %s", key)
+
+
+@callback
+def async_get_recovery_scheduler(hass: HomeAssistant) -> RecoveryScheduler:
+    """Return the domain recovery scheduler, creating an unlimited one on first use."""
+    scheduler = hass.data.get(DATA_RECOVERY_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_RECOVERY_SCHEDULER] = RecoveryScheduler(hass)
+    return scheduler
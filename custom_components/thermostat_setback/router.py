@@ -0,0 +1,91 @@
+"""Shared state change event router for climate setback coordinators."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import ATTR_NEXT_EVENT, DATA_EVENT_ROUTER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_next_event(state: State) -> datetime | None:
+    """Return the next_event attribute of a state as a datetime."""
+    next_event = state.attributes.get(ATTR_NEXT_EVENT)
+    if isinstance(next_event, str):
+        next_event = dt_util.parse_datetime(next_event)
+    if not isinstance(next_event, datetime):
+        return None
+    return dt_util.as_utc(next_event)
+
+
+class SetbackEventRouter:
+    """Subscribe once per source entity and fan events out to coordinators.
+
+    Several controllers often watch the same schedule or binary input. The
+    router keeps an entity -> listeners index and holds a single state change
+    subscription per unique entity, so adding or removing a controller only
+    updates the index.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the router."""
+        self.hass = hass
+        self._listeners: dict[str, list[Callable[[Event], None]]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_track(
+        self, entity_id: str, action: Callable[[Event], None]
+    ) -> CALLBACK_TYPE:
+        """Route state changes of entity_id to action, return a remove callback."""
+        listeners = self._listeners.get(entity_id)
+        if listeners is None:
+            listeners = self._listeners[entity_id] = []
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self._async_route
+            )
+        listeners.append(action)
+
+        @callback
+        def _async_remove() -> None:
+            """Remove the listener and drop the subscription when unused."""
+            listeners.remove(action)
+            if not listeners and self._listeners.get(entity_id) is listeners:
+                del self._listeners[entity_id]
+                self._unsubs.pop(entity_id)()
+
+        return _async_remove
+
+    @callback
+    def _async_route(self, event: Event) -> None:
+        """Fan a state change event out to every listener of the entity."""
+        entity_id = event.data["entity_id"]
+        listeners = self._listeners.get(entity_id)
+        if not listeners:
+            return
+        for action in tuple(listeners):
+            try:
+                action(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling state change of %s", entity_id)
+
+    @property
+    def tracked_entities(self) -> int:
+        """Return the number of entities with an active subscription."""
+        return len(self._unsubs)
+
+
+@callback
+def async_get_router(hass: HomeAssistant) -> SetbackEventRouter:
+    """Return the domain event router, creating it on first use."""
+    router = hass.data.get(DATA_EVENT_ROUTER)
+    if router is None:
+        router = hass.data[DATA_EVENT_ROUTER] = SetbackEventRouter(hass)
+    return router
@@ -0,0 +1,271 @@
+"""Built-in weekly setback schedules shared by controllers."""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable
+from datetime import datetime, time, timedelta
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .clock import async_get_clock
+from .const import DATA_SCHEDULE_ENGINE
+
+_LOGGER = logging.getLogger(__name__)
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+DAY = 86400
+WEEK = 7 * DAY
+
+
+def _time_of_day(value: Any) -> int:
+    """Validate HH:MM[:SS], up to 24:00, and return seconds since midnight."""
+    try:
+        parts = [int(part) for part in str(value).split(":")]
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid time: {value}") from err
+    if len(parts) not in (2, 3):
+        raise vol.Invalid(f"Invalid time: {value}")
+    hours, minutes, seconds = (*parts, 0) if len(parts) == 2 else parts
+    if not (0 <= minutes < 60 and 0 <= seconds < 60):
+        raise vol.Invalid(f"Invalid time: {value}")
+    total = hours * 3600 + minutes * 60 + seconds
+    if not 0 <= total <= DAY:
+        raise vol.Invalid(f"Invalid time: {value}")
+    return total
+
+
+def _ordered(interval: dict[str, int]) -> dict[str, int]:
+    """Validate an interval ends after it starts."""
+    if interval["to"] <= interval["from"]:
+        raise vol.Invalid("'to' must be after 'from', split intervals at midnight")
+    return interval
+
+
+INTERVAL_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required("from"): _time_of_day,
+            vol.Required("to"): _time_of_day,
+        }
+    ),
+    _ordered,
+)
+
+# Same layout as the schedule helper: setback is active during the intervals
+TEMPLATE_SCHEMA = vol.Schema(
+    {vol.Optional(day, default=list): [INTERVAL_SCHEMA] for day in WEEKDAYS}
+)
+
+
+def _second_of_week(local: datetime) -> float:
+    """Return seconds since Monday 00:00 of a local time."""
+    return (
+        local.weekday() * DAY
+        + local.hour * 3600
+        + local.minute * 60
+        + local.second
+        + local.microsecond / 1e6
+    )
+
+
+class CompiledSchedule:
+    """Weekly schedule compiled to sorted transition times.
+
+    Transitions are seconds since Monday 00:00 local time with the state
+    that starts there, so the state at any time and the next transition
+    are a binary search away.
+    """
+
+    __slots__ = ("_times", "_states", "_always_on")
+
+    def __init__(self, intervals: list[tuple[int, int]]) -> None:
+        """Compile on intervals given as seconds of the week."""
+        merged: list[list[int]] = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        self._always_on = bool(merged) and merged[0] == [0, WEEK]
+        # An interval ending at the end of the week continues into Monday
+        wraps = bool(merged) and merged[0][0] == 0 and merged[-1][1] == WEEK
+        transitions = []
+        for index, (start, end) in enumerate(merged):
+            if not (wraps and index == 0):
+                transitions.append((start, 1))
+            if not (wraps and index == len(merged) - 1):
+                transitions.append((end % WEEK, 0))
+        transitions.sort()
+        self._times = array("l", (time for time, _ in transitions))
+        self._states = bytes(state for _, state in transitions)
+
+    @classmethod
+    def from_config(cls, config: dict[str, list[dict[str, int]]]) -> CompiledSchedule:
+        """Compile a validated TEMPLATE_SCHEMA configuration."""
+        return cls(
+            [
+                (day * DAY + interval["from"], day * DAY + interval["to"])
+                for day, name in enumerate(WEEKDAYS)
+                for interval in config.get(name, ())
+            ]
+        )
+
+    def is_on(self, local: datetime) -> bool:
+        """Return True if the schedule is on at a local time."""
+        if not self._times:
+            return self._always_on
+        # Index -1 is the last transition of the previous week
+        return bool(self._states[bisect_right(self._times, _second_of_week(local)) - 1])
+
+    def next_transition(self, local: datetime) -> datetime | None:
+        """Return the local time of the next transition after local."""
+        times = self._times
+        if not times:
+            return None
+        second = _second_of_week(local)
+        index = bisect_right(times, second)
+        if index < len(times):
+            delta = times[index] - second
+        else:
+            delta = WEEK - second + times[0]
+        # Wall clock arithmetic, so transitions stay at local times over DST
+        return local + timedelta(seconds=delta)
+
+
+def _block_time(value: Any) -> int:
+    """Return seconds since midnight of a schedule helper block time."""
+    if isinstance(value, time):
+        # The helper keeps 24:00 as time.max
+        if value == time.max:
+            return DAY
+        return value.hour * 3600 + value.minute * 60 + value.second
+    return _time_of_day(value)
+
+
+def compile_schedule_helper(blocks: dict[str, Any]) -> CompiledSchedule:
+    """Compile the weekly blocks returned by a schedule helper."""
+    return CompiledSchedule(
+        [
+            (
+                day * DAY + _block_time(block["from"]),
+                day * DAY + _block_time(block["to"]),
+            )
+            for day, name in enumerate(WEEKDAYS)
+            for block in blocks.get(name, ())
+        ]
+    )
+
+
+class ScheduleEngine:
+    """Evaluate the built-in schedules with one timer for all controllers.
+
+    The timer is set to the earliest next transition of every schedule in
+    use. When it fires, the listeners of each schedule whose state changed
+    are called with the new state.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, templates: dict[str, CompiledSchedule]
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self.templates = templates
+        self._listeners: dict[str, list[Callable[[bool], None]]] = {}
+        self._states: dict[str, bool] = {}
+        self._cancel_timer: CALLBACK_TYPE | None = None
+
+    def _local_now(self) -> datetime:
+        """Return the current local time."""
+        return dt_util.as_local(async_get_clock(self.hass).utcnow())
+
+    def is_on(self, name: str) -> bool:
+        """Return True if a schedule is on now."""
+        template = self.templates.get(name)
+        return template is not None and template.is_on(self._local_now())
+
+    @callback
+    def async_track(self, name: str, action: Callable[[bool], None]) -> CALLBACK_TYPE:
+        """Call action(is_on) when a schedule changes state."""
+        if name not in self.templates:
+            _LOGGER.warning("Schedule template %s is not defined", name)
+        listeners = self._listeners.get(name)
+        if listeners is None:
+            listeners = self._listeners[name] = []
+            self._states[name] = self.is_on(name)
+            self._async_schedule_timer()
+        listeners.append(action)
+
+        @callback
+        def _async_remove() -> None:
+            """Remove the listener and stop evaluating unused schedules."""
+            listeners.remove(action)
+            if not listeners and self._listeners.get(name) is listeners:
+                del self._listeners[name]
+                del self._states[name]
+                self._async_schedule_timer()
+
+        return _async_remove
+
+    @callback
+    def _async_schedule_timer(self) -> None:
+        """Set the timer to the earliest transition of the tracked schedules."""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        local = self._local_now()
+        transitions = [
+            transition
+            for name in self._listeners
+            if (template := self.templates.get(name)) is not None
+            and (transition := template.next_transition(local)) is not None
+        ]
+        if not transitions:
+            return
+        # A wall clock timer follows clock changes, a delay would not
+        self._cancel_timer = async_get_clock(self.hass).call_at(
+            dt_util.as_utc(min(transitions)), self._async_fire
+        )
+
+    @callback
+    def _async_fire(self) -> None:
+        """Notify the listeners of schedules that changed state."""
+        self._cancel_timer = None
+        local = self._local_now()
+        for name, listeners in tuple(self._listeners.items()):
+            template = self.templates.get(name)
+            if template is None:
+                continue
+            is_on = template.is_on(local)
+            if is_on == self._states[name]:
+                continue
+            self._states[name] = is_on
+            for action in tuple(listeners):
+                try:
+                    action(is_on)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error handling schedule template %s", name)
+        self._async_schedule_timer()
+
+
+@callback
+def async_get_schedule_engine(hass: HomeAssistant) -> ScheduleEngine:
+    """Return the domain schedule engine, creating an empty one on first use."""
+    engine = hass.data.get(DATA_SCHEDULE_ENGINE)
+    if engine is None:
+        engine = hass.data[DATA_SCHEDULE_ENGINE] = ScheduleEngine(hass, {})
+    return engine
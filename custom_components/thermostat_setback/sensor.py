@@ -10,17 +10,22 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.const import STATE_OFF, STATE_ON
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     CONF_CLIMATE_DEVICE,
     DOMAIN,
 )
 from .coordinator import ClimateSetbackCoordinator
+from .entity import SetbackCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _round(value: float | None) -> float | None:
+    """Round a heating rate to hundredths of a degree per hour."""
+    return None if value is None else round(value, 2)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -34,10 +39,30 @@ async def async_setup_entry(
     ])
 
 
-class ClimateSetbackSensor(SensorEntity, CoordinatorEntity):
+class ClimateSetbackSensor(SensorEntity, SetbackCoordinatorEntity):
     """Representation of a climate setback sensor entity."""
 
     _attr_should_poll = False
+    _coordinator_fields = frozenset(
+        {
+            "is_setback",
+            "command_queue_depth",
+            "command_last_error",
+            "optimal_start_time",
+            "preheating",
+            "recovery_queued",
+        }
+    )
+    _attribute_fields = frozenset(
+        {
+            "command_queue_depth",
+            "command_last_error",
+            "optimal_start_time",
+            "preheating",
+            "recovery_queued",
+        }
+    )
+    _throttle_writes = True
 
     def __init__(self, config_entry: ConfigEntry, coordinator: ClimateSetbackCoordinator) -> None:
         super().__init__(coordinator, context=config_entry.entry_id)
@@ -51,7 +76,7 @@ class ClimateSetbackSensor(SensorEntity, CoordinatorEntity):
     @property
     def native_value(self) -> str:
         """Return the current setback status."""
-        return STATE_ON if self.coordinator.data["is_setback"] else STATE_OFF
+        return STATE_ON if self.coordinator.is_setback else STATE_OFF
 
     @property
     def native_unit_of_measurement(self) -> str | None:
@@ -61,17 +86,34 @@ class ClimateSetbackSensor(SensorEntity, CoordinatorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        return {
-            "climate_device": self.coordinator.climate_device,
-            "schedule_device": self.coordinator.schedule_device,
-            "binary_input_device": self.coordinator.binary_input_device,
-        }
-
-
-class ClimateRecoveryTimeSensor(RestoreSensor, CoordinatorEntity):
+        if self._cached_attributes is None:
+            self._cached_attributes = {
+                "climate_device": self.coordinator.climate_device,
+                "schedule_device": self.coordinator.schedule_device,
+                "schedule_template": self.coordinator.schedule_template,
+                "binary_input_device": self.coordinator.binary_input_device,
+                "command_queue_depth": self.coordinator.command_queue_depth,
+                "command_last_error": self.coordinator.command_last_error,
+                "optimal_start_time": self.coordinator.optimal_start_time,
+                "preheating": self.coordinator.preheating,
+                "recovery_queued": self.coordinator.recovery_queued,
+            }
+        return self._cached_attributes
+
+
+class ClimateRecoveryTimeSensor(RestoreSensor, SetbackCoordinatorEntity):
     """Representation of a climate recovery time sensor entity."""
 
     _attr_should_poll = False
+    _coordinator_fields = frozenset(
+        {
+            "last_recovery_time",
+            "is_recovering",
+            "recovery_count",
+        }
+    )
+    _attribute_fields = frozenset({"is_recovering", "recovery_count"})
+    _throttle_writes = True
     _attr_device_class = SensorDeviceClass.DURATION
 
     def __init__(self, config_entry: ConfigEntry, coordinator: ClimateSetbackCoordinator) -> None:
@@ -96,9 +138,13 @@ class ClimateRecoveryTimeSensor(RestoreSensor, CoordinatorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        return {
-            "is_recovering": self.coordinator.is_recovering,
-        }
+        if self._cached_attributes is None:
+            self._cached_attributes = {
+                "is_recovering": self.coordinator.is_recovering,
+                "heating_rate": _round(self.coordinator.heating_rate),
+                **self.coordinator.recovery_statistics,
+            }
+        return self._cached_attributes
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -110,7 +156,7 @@ class ClimateRecoveryTimeSensor(RestoreSensor, CoordinatorEntity):
             try:
                 # Convert native_value to float and restore to coordinator data
                 recovery_time = float(last_native_value)
-                self.coordinator.data["last_recovery_time"] = recovery_time
+                self.coordinator.async_restore("last_recovery_time", recovery_time)
             except (ValueError, TypeError):
                 # Invalid state value, skip restoration
                 return
@@ -0,0 +1,106 @@
+"""Services for the climate setback integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DURATION,
+    ATTR_LIMIT,
+    ATTR_TOP,
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_PROFILE_TOP,
+    DOMAIN,
+    MAX_PROFILE_DURATION,
+    SERVICE_GET_TRACE,
+    SERVICE_PROFILE_START,
+    SERVICE_PROFILE_STOP,
+    TRACE_SIZE,
+)
+from .profiler import async_get_profiler
+
+TOP_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=1, max=500))
+
+GET_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=TRACE_SIZE)
+        ),
+    }
+)
+
+PROFILE_START_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+        vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): TOP_SCHEMA,
+    }
+)
+
+PROFILE_STOP_SCHEMA = vol.Schema({vol.Optional(ATTR_TOP): TOP_SCHEMA})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_get_trace(call: ServiceCall) -> ServiceResponse:
+        """Return the recent setback decisions of a controller."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+        if entry_data is None:
+            raise ServiceValidationError(
+                f"No loaded thermostat setback controller with entry ID {entry_id}"
+            )
+        trace = entry_data["coordinator"].trace
+        return {
+            "count": trace.count,
+            "transitions": trace.transitions(call.data.get(ATTR_LIMIT)),
+        }
+
+    async def async_profile_start(call: ServiceCall) -> None:
+        """Start profiling the integration."""
+        profiler = async_get_profiler(hass)
+        if profiler.running:
+            raise ServiceValidationError("A profile is already running")
+        profiler.async_start(call.data[ATTR_DURATION], call.data[ATTR_TOP])
+
+    async def async_profile_stop(call: ServiceCall) -> ServiceResponse:
+        """Stop profiling and return the hot functions."""
+        profiler = async_get_profiler(hass)
+        if not profiler.running:
+            raise ServiceValidationError("No profile is running")
+        return await profiler.async_stop(call.data.get(ATTR_TOP))
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRACE,
+        async_get_trace,
+        schema=GET_TRACE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_START,
+        async_profile_start,
+        schema=PROFILE_START_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_STOP,
+        async_profile_stop,
+        schema=PROFILE_STOP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,90 @@
+"""Controller state record for climate setback integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+from operator import attrgetter
+from typing import Any
+
+
+@dataclass(slots=True)
+class ControllerState:
+    """State of one setback controller."""
+
+    is_setback: bool = False
+    schedule_active: bool = False
+
+    forced_setback: bool = False
+    input_is_active: bool = False
+    controller_active: bool = True  # Controller is active by default
+    setback_temperature: float = 20
+    normal_temperature: float = 16
+    normal_temperature_min: float = 5.0
+    normal_temperature_max: float = 35.0
+    normal_temperature_step: float = 0.5
+    unit_of_measurement: str | None = None
+
+    # Recovery time tracking
+    recovery_start_time: datetime | None = None
+    last_recovery_time: float | None = None  # Single recovery time in seconds
+    is_recovering: bool = False
+    recovery_start_temperature: float | None = None
+    recovery_count: int = 0
+
+    # Optimal start: when setback ends early to reach normal temperature as
+    # the schedule ends, and whether it has ended early
+    optimal_start_time: datetime | None = None
+    preheating: bool = False
+
+    # Setback held until the recovery scheduler grants a slot
+    recovery_queued: bool = False
+
+    # Skip setback feature
+    skip_next_setback: bool = False
+
+    # Command queue of the climate device
+    command_queue_depth: int = 0
+    command_last_error: str | None = None
+
+    def snapshot(self) -> tuple[Any, ...]:
+        """Return the values of all fields, in STATE_FIELDS order."""
+        return _snapshot(self)
+
+
+STATE_FIELDS: tuple[str, ...] = tuple(field.name for field in fields(ControllerState))
+_STATE_FIELD_SET = frozenset(STATE_FIELDS)
+_snapshot = attrgetter(*STATE_FIELDS)
+
+
+class ControllerStateView(Mapping[str, Any]):
+    """Read-only mapping view of a controller state.
+
+    Keeps coordinator.data["key"] working for code written against the
+    former data dict.
+    """
+
+    __slots__ = ("_state",)
+
+    def __init__(self, state: ControllerState) -> None:
+        """Initialize the view."""
+        self._state = state
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of a state field."""
+        if key not in _STATE_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self._state, key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the state field names."""
+        return iter(STATE_FIELDS)
+
+    def __len__(self) -> int:
+        """Return the number of state fields."""
+        return len(STATE_FIELDS)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if key is a state field."""
+        return key in _STATE_FIELD_SET
@@ -9,7 +9,6 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import (
@@ -17,6 +16,7 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import ClimateSetbackCoordinator
+from .entity import SetbackCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,10 +35,11 @@ async def async_setup_entry(
     ])
 
 
-class ClimateForceSetbackSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
+class ClimateForceSetbackSwitch(SwitchEntity, SetbackCoordinatorEntity, RestoreEntity):
     """Representation of a climate setback switch entity."""
 
     _attr_should_poll = False
+    _coordinator_fields = frozenset({"forced_setback"})
 
     def __init__(self, config_entry: ConfigEntry, coordinator: ClimateSetbackCoordinator) -> None:
         """Initialize the climate setback switch."""
@@ -57,12 +58,10 @@ class ClimateForceSetbackSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on (enable setback)."""
         self.coordinator.set_forced_setback(True)
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off (disable setback)."""
         self.coordinator.set_forced_setback(False)
-        self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -71,14 +70,15 @@ class ClimateForceSetbackSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
         state = await self.async_get_last_state()
         if not state or not state.state:
             return
-        # Convert state string to boolean and restore using setter method
-        self.coordinator.set_forced_setback(state.state == "on")
+        # Convert state string to boolean and restore to the coordinator
+        self.coordinator.async_restore("forced_setback", state.state == "on")
 
 
-class ControllerSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
+class ControllerSwitch(SwitchEntity, SetbackCoordinatorEntity, RestoreEntity):
     """Representation of a controller active switch entity."""
 
     _attr_should_poll = False
+    _coordinator_fields = frozenset({"controller_active"})
 
     def __init__(self, config_entry: ConfigEntry, coordinator: ClimateSetbackCoordinator) -> None:
         """Initialize the controller switch."""
@@ -97,12 +97,10 @@ class ControllerSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the controller on (enable controller)."""
         self.coordinator.set_controller_active(True)
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the controller off (disable controller)."""
         self.coordinator.set_controller_active(False)
-        self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -111,14 +109,15 @@ class ControllerSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
         state = await self.async_get_last_state()
         if not state or not state.state:
             return
-        # Convert state string to boolean and restore using setter method
-        self.coordinator.set_controller_active(state.state == "on")
+        # Convert state string to boolean and restore to the coordinator
+        self.coordinator.async_restore("controller_active", state.state == "on")
 
 
-class SkipSetbackSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
+class SkipSetbackSwitch(SwitchEntity, SetbackCoordinatorEntity, RestoreEntity):
     """Representation of a skip setback switch entity."""
 
     _attr_should_poll = False
+    _coordinator_fields = frozenset({"skip_next_setback"})
 
     def __init__(self, config_entry: ConfigEntry, coordinator: ClimateSetbackCoordinator) -> None:
         """Initialize the skip setback switch."""
@@ -139,12 +138,10 @@ class SkipSetbackSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
         # If currently in setback, this will immediately override to normal temperature
         # If currently in normal, this will mark the next setback cycle to be skipped
         self.coordinator.set_skip_next_setback(True)
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off (disable skip next setback)."""
         self.coordinator.set_skip_next_setback(False)
-        self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -153,7 +150,4 @@ class SkipSetbackSwitch(SwitchEntity, CoordinatorEntity, RestoreEntity):
         state = await self.async_get_last_state()
         if state:
             # Restore skip state if available
-            if state.state == "on":
-                self.coordinator.set_skip_next_setback(True)
-            else:
-                self.coordinator.set_skip_next_setback(False)
+            self.coordinator.async_restore("skip_next_setback", state.state == "on")
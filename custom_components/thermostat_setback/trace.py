@@ -0,0 +1,115 @@
+"""Bounded trace of setback decisions."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from .const import TRACE_SIZE
+
+# Events that make the coordinator recalculate the setback state
+TRIGGERS = (
+    "restore",
+    "climate",
+    "schedule",
+    "binary_input",
+    "forced_setback",
+    "controller_active",
+    "setback_temperature",
+    "normal_temperature",
+    "skip_next_setback",
+    "schedule_boundary",
+    "optimal_start",
+    "recovery_slot",
+    "options",
+)
+_TRIGGER_INDEX = {trigger: index for index, trigger in enumerate(TRIGGERS)}
+
+# Decision inputs and outcome, stored as bits of one byte per transition
+FLAGS = (
+    "controller_active",
+    "forced_setback",
+    "skip_next_setback",
+    "schedule_active",
+    "input_is_active",
+    "is_setback",
+    "command_sent",
+    "preheating",
+)
+
+
+class DecisionTrace:
+    """Fixed-size ring buffer of setback transitions.
+
+    Each transition is a timestamp, the target temperature, the trigger and
+    the decision inputs packed into preallocated arrays, so recording never
+    allocates and memory stays constant however many events arrive.
+    """
+
+    def __init__(self, capacity: int = TRACE_SIZE) -> None:
+        """Initialize an empty trace."""
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._targets = array("d", bytes(8 * capacity))
+        self._triggers = array("B", bytes(capacity))
+        self._flags = array("B", bytes(capacity))
+        # Next slot to write and number of filled slots
+        self._index = 0
+        self._size = 0
+        # Transitions recorded since startup
+        self.count = 0
+
+    def record(
+        self,
+        timestamp: float,
+        trigger: str,
+        target: float,
+        controller_active: bool,
+        forced_setback: bool,
+        skip_next_setback: bool,
+        schedule_active: bool,
+        input_is_active: bool,
+        is_setback: bool,
+        command_sent: bool,
+        preheating: bool = False,
+    ) -> None:
+        """Record a transition."""
+        index = self._index
+        self._timestamps[index] = timestamp
+        self._targets[index] = target
+        self._triggers[index] = _TRIGGER_INDEX[trigger]
+        self._flags[index] = (
+            controller_active
+            | forced_setback << 1
+            | skip_next_setback << 2
+            | schedule_active << 3
+            | input_is_active << 4
+            | is_setback << 5
+            | command_sent << 6
+            | preheating << 7
+        )
+        self._index = (index + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.count += 1
+
+    def __len__(self) -> int:
+        """Return the number of buffered transitions."""
+        return self._size
+
+    def transitions(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return the buffered transitions, newest first."""
+        size = self._size if limit is None else min(limit, self._size)
+        transitions = []
+        for offset in range(1, size + 1):
+            index = (self._index - offset) % self.capacity
+            flags = self._flags[index]
+            transition: dict[str, Any] = {
+                "timestamp": self._timestamps[index],
+                "trigger": TRIGGERS[self._triggers[index]],
+                "target_temperature": self._targets[index],
+            }
+            for bit, name in enumerate(FLAGS):
+                transition[name] = bool(flags >> bit & 1)
+            transitions.append(transition)
+        return transitions
@@ -0,0 +1,13 @@
+"""Helpers shared by the coordinator and the config flow."""
+
+from __future__ import annotations
+
+
+def binary_input_entities(value: str | list[str] | None) -> tuple[str, ...]:
+    """Return the binary input entity IDs of a single or list option value."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    entity_ids = (entity_id.strip() for entity_id in value)
+    return tuple(dict.fromkeys(entity_id for entity_id in entity_ids if entity_id))
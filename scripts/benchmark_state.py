@@ -0,0 +1,81 @@
+"""Compare the controller state record with the former data dict.
+
+Run from the repository root:
+
+    python scripts/benchmark_state.py [--controllers 1000] [--reads 1000000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.getcwd())
+
+# pylint: disable=wrong-import-position
+from custom_components.thermostat_setback.state import (  # noqa: E402
+    STATE_FIELDS,
+    ControllerState,
+    ControllerStateView,
+)
+
+
+def measure_memory(factory, controllers):
+    """Return the bytes allocated per controller by factory."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(controllers)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / controllers
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--controllers", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    state = ControllerState()
+    data = {field: getattr(state, field) for field in STATE_FIELDS}
+    view = ControllerStateView(state)
+
+    results = {
+        "dict[key]": timeit.timeit(
+            'data["setback_temperature"]', globals={"data": data}, number=args.reads
+        ),
+        "state.attribute": timeit.timeit(
+            "state.setback_temperature", globals={"state": state}, number=args.reads
+        ),
+        "view[key]": timeit.timeit(
+            'view["setback_temperature"]', globals={"view": view}, number=args.reads
+        ),
+        "dict snapshot": timeit.timeit(
+            "dict(data)", globals={"data": data}, number=args.reads // 10
+        )
+        * 10,
+        "state.snapshot()": timeit.timeit(
+            "state.snapshot()", globals={"state": state}, number=args.reads // 10
+        )
+        * 10,
+    }
+
+    print(f"Per access, {args.reads} reads:")
+    for name, seconds in results.items():
+        print(f"  {name:<18} {seconds / args.reads * 1e9:8.1f} ns")
+
+    dict_bytes = measure_memory(
+        lambda: {field: getattr(state, field) for field in STATE_FIELDS},
+        args.controllers,
+    )
+    state_bytes = measure_memory(ControllerState, args.controllers)
+    print(f"Memory per controller, {args.controllers} controllers:")
+    print(f"  {'dict':<18} {dict_bytes:8.0f} bytes")
+    print(f"  {'ControllerState':<18} {state_bytes:8.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Replay recorded state history through the setback coordinator.
+
+Answers "what would this controller have done?" without a running Home
+Assistant. State history of the climate, schedule and binary input entities
+is streamed from recorder exports, merged by time and fed to the real
+ClimateSetbackCoordinator callbacks on a stub hass driven by a virtual clock.
+
+Supported inputs, each ordered by time:
+
+  * JSON lines, one state per line:
+      {"entity_id": "...", "state": "...", "attributes": {...},
+       "last_changed": "2025-01-01T00:00:00+00:00"}
+    A JSON array per line, as returned by the history API, is also accepted.
+  * CSV with entity_id, state and last_changed (or last_updated) columns.
+    An "attributes" column is parsed as JSON, any other column is used as
+    an attribute.
+
+Run from the repository root:
+
+    python scripts/replay.py \\
+        --controller climate.living_room,schedule.weekdays,binary_sensor.away \\
+        --output commands.jsonl history/*.jsonl
+
+Entity IDs after the schedule are binary inputs, combined by
+--binary-input-rule.
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.getcwd())
+
+# pylint: disable=wrong-import-position
+from homeassistant.const import CONF_NAME  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.thermostat_setback.clock import VirtualClock  # noqa: E402
+from custom_components.thermostat_setback.const import (  # noqa: E402
+    BINARY_INPUT_RULE_ANY,
+    BINARY_INPUT_RULES,
+    CONF_BINARY_INPUT,
+    CONF_BINARY_INPUT_RULE,
+    CONF_BINARY_INPUT_THRESHOLD,
+    CONF_CLIMATE_DEVICE,
+    CONF_SCHEDULE_DEVICE,
+    DATA_CLOCK,
+    DATA_COMMAND_DISPATCHER,
+)
+from custom_components.thermostat_setback.coordinator import (  # noqa: E402
+    ClimateSetbackCoordinator,
+)
+
+CSV_BASE_COLUMNS = {"entity_id", "state", "last_changed", "last_updated", "attributes"}
+
+
+class ReplayState:
+    """Minimal stand-in for homeassistant.core.State."""
+
+    __slots__ = ("entity_id", "state", "attributes")
+
+    def __init__(self, entity_id, state, attributes):
+        """Initialize the state."""
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes
+
+
+class ReplayEvent:
+    """Minimal stand-in for a state_changed event."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        """Initialize the event."""
+        self.data = data
+
+
+class RecordingDispatcher:
+    """Command dispatcher that records commands instead of sending them."""
+
+    def __init__(self, clock, output):
+        """Initialize the dispatcher."""
+        self.clock = clock
+        self.output = output
+        self.commands = 0
+
+    def async_set_temperature(self, entity_id, temperature):
+        """Record a set_temperature command."""
+        self.commands += 1
+        if self.output is not None:
+            self.output.write(
+                json.dumps(
+                    {
+                        "time": self.clock.utcnow().isoformat(),
+                        "entity_id": entity_id,
+                        "temperature": temperature,
+                    }
+                )
+                + "\n"
+            )
+
+    def async_add_listener(self, entity_id, action):
+        """Command queues are not simulated."""
+        return lambda: None
+
+
+def _coerce(value):
+    """Convert a CSV attribute value to a number where possible."""
+    if value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _parse_time(value):
+    """Return a POSIX timestamp for an ISO 8601 time."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.UTC)
+    return parsed.timestamp()
+
+
+def read_jsonl(path):
+    """Yield (timestamp, entity_id, state, attributes) from a JSON lines file."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            records = json.loads(line)
+            if isinstance(records, dict):
+                records = (records,)
+            for record in records:
+                yield (
+                    _parse_time(record.get("last_changed") or record["last_updated"]),
+                    record["entity_id"],
+                    record["state"],
+                    record.get("attributes") or {},
+                )
+
+
+def read_csv(path):
+    """Yield (timestamp, entity_id, state, attributes) from a CSV file."""
+    with open(path, encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        extra_columns = [
+            column for column in reader.fieldnames if column not in CSV_BASE_COLUMNS
+        ]
+        for row in reader:
+            attributes = json.loads(row["attributes"]) if row.get("attributes") else {}
+            for column in extra_columns:
+                attributes[column] = _coerce(row[column])
+            yield (
+                _parse_time(row.get("last_changed") or row["last_updated"]),
+                row["entity_id"],
+                row["state"],
+                attributes,
+            )
+
+
+def read_history(paths):
+    """Merge the history files into one time-ordered stream."""
+    streams = [
+        read_csv(path) if path.endswith(".csv") else read_jsonl(path) for path in paths
+    ]
+    return heapq.merge(*streams, key=lambda record: record[0])
+
+
+def create_coordinator(hass, index, climate, schedule, binary_inputs, rule):
+    """Create a coordinator for one controller."""
+    entry = SimpleNamespace(
+        entry_id=f"replay_{index}",
+        data={CONF_NAME: climate, CONF_CLIMATE_DEVICE: climate},
+        options={
+            CONF_SCHEDULE_DEVICE: schedule,
+            CONF_BINARY_INPUT: list(binary_inputs),
+            CONF_BINARY_INPUT_RULE: rule[0],
+            CONF_BINARY_INPUT_THRESHOLD: rule[1],
+        },
+        async_on_unload=lambda func: None,
+    )
+    coordinator = ClimateSetbackCoordinator(hass, entry, clock=hass.data[DATA_CLOCK])
+    coordinator.async_finish_restore()
+    return coordinator
+
+
+def replay(controllers, paths, output, rule=(BINARY_INPUT_RULE_ANY, 1)):
+    """Replay the history files and return the coordinators and statistics."""
+    states = {}
+    clock = None
+    hass = SimpleNamespace(
+        data={},
+        states=SimpleNamespace(get=states.get),
+        config=SimpleNamespace(config_dir=os.getcwd()),
+    )
+
+    coordinators = []
+    routes = {}
+    events = 0
+    start = time.perf_counter()
+    for timestamp, entity_id, state, attributes in read_history(paths):
+        if clock is None:
+            # Create the controllers at the time of the first recorded event
+            clock = VirtualClock(dt_util.utc_from_timestamp(timestamp))
+            origin = timestamp
+            hass.data[DATA_CLOCK] = clock
+            hass.data[DATA_COMMAND_DISPATCHER] = RecordingDispatcher(clock, output)
+            for index, (climate, schedule, binary_inputs) in enumerate(controllers):
+                coordinator = create_coordinator(
+                    hass, index, climate, schedule, binary_inputs, rule
+                )
+                coordinators.append(coordinator)
+                for source, action in (
+                    (climate, coordinator._async_climate_changed),
+                    (schedule, coordinator._async_schedule_changed),
+                    *(
+                        (binary_input, coordinator._async_binary_input_changed)
+                        for binary_input in binary_inputs
+                    ),
+                ):
+                    if source:
+                        routes.setdefault(source, []).append(action)
+
+        actions = routes.get(entity_id)
+        if actions is None:
+            continue
+
+        clock.advance(max(timestamp - origin - clock.monotonic(), 0.0))
+        new_state = ReplayState(entity_id, state, attributes)
+        event = ReplayEvent(
+            {
+                "entity_id": entity_id,
+                "old_state": states.get(entity_id),
+                "new_state": new_state,
+            }
+        )
+        states[entity_id] = new_state
+        for action in actions:
+            action(event)
+        events += 1
+
+    elapsed = time.perf_counter() - start
+    dispatcher = hass.data.get(DATA_COMMAND_DISPATCHER)
+    return coordinators, {
+        "events": events,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(events / elapsed) if elapsed else None,
+        "commands": dispatcher.commands if dispatcher else 0,
+    }
+
+
+def main():
+    """Run the replay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--controller",
+        action="append",
+        required=True,
+        metavar="CLIMATE,SCHEDULE[,BINARY_INPUT...]",
+        help="entity IDs of one controller, repeat for a fleet",
+    )
+    parser.add_argument(
+        "--binary-input-rule",
+        choices=BINARY_INPUT_RULES,
+        default=BINARY_INPUT_RULE_ANY,
+        help="how the binary inputs of a controller combine",
+    )
+    parser.add_argument(
+        "--binary-input-threshold",
+        type=int,
+        default=1,
+        help="binary inputs that must be on with the threshold rule",
+    )
+    parser.add_argument(
+        "--output",
+        help="write the command stream as JSON lines to this file, - for stdout",
+    )
+    parser.add_argument("history", nargs="+", help="CSV or JSON lines exports")
+    args = parser.parse_args()
+
+    controllers = []
+    for value in args.controller:
+        parts = value.split(",")
+        if len(parts) < 2:
+            parser.error(f"Invalid controller: {value}")
+        controllers.append((parts[0], parts[1], tuple(parts[2:])))
+
+    output = None
+    if args.output == "-":
+        output = sys.stdout
+    elif args.output:
+        # pylint: disable=consider-using-with
+        output = open(args.output, "w", encoding="utf-8")
+    try:
+        coordinators, summary = replay(
+            controllers,
+            args.history,
+            output,
+            (args.binary_input_rule, args.binary_input_threshold),
+        )
+    finally:
+        if output not in (None, sys.stdout):
+            output.close()
+
+    summary["controllers"] = [
+        {
+            "climate_device": coordinator.climate_device,
+            "suppressed_commands": coordinator.suppressed_commands,
+            "is_setback": coordinator.is_setback,
+            **coordinator.recovery_statistics,
+        }
+        for coordinator in coordinators
+    ]
+    json.dump(summary, sys.stderr, indent=2)
+    sys.stderr.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Thermal simulation of rooms for load and latency testing.
+
+Each room is a first-order thermal model driven by an on/off heater, exposed
+as a climate entity state with a climate.set_temperature service. Time comes
+from a VirtualClock shared with the integration, so hours of heating run
+without real sleeping.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.climate import ATTR_TEMPERATURE
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_CLIMATE_DEVICE,
+    CONF_SCHEDULE_DEVICE,
+    DATA_CLOCK,
+    DATA_COMMAND_DISPATCHER,
+    DOMAIN,
+)
+
+SCHEDULE_ENTITY = "schedule.simulated"
+
+
+@dataclass
+class SimulatedRoom:
+    """First-order thermal model of a room with an on/off heater."""
+
+    entity_id: str
+    temperature: float = 21.0
+    target: float = 21.0
+    outdoor: float = 0.0
+    # Seconds for the room to close 63% of the gap to equilibrium
+    time_constant: float = 4 * 3600
+    # Equilibrium temperature rise above outdoor with the heater on
+    heating_rise: float = 40.0
+    hysteresis: float = 0.2
+    heating: bool = False
+    # An offline room fails every set_temperature call it is part of
+    online: bool = True
+    # Virtual time the room first reached its target after a target increase
+    reached_target_at: float | None = None
+    commands: list[tuple[float, float]] = field(default_factory=list)
+
+    def step(self, now: float, seconds: float) -> None:
+        """Advance the model by seconds, ending at virtual time now."""
+        half_band = self.hysteresis / 2
+        if self.temperature < self.target - half_band:
+            self.heating = True
+        elif self.temperature > self.target + half_band:
+            self.heating = False
+
+        start = self.temperature
+        equilibrium = self.outdoor + (self.heating_rise if self.heating else 0.0)
+        decay = math.exp(-seconds / self.time_constant)
+        self.temperature = equilibrium + (start - equilibrium) * decay
+
+        if self.reached_target_at is None and start < self.target <= self.temperature:
+            # Exact crossing time of the exponential within the step
+            elapsed = -self.time_constant * math.log(
+                (self.target - equilibrium) / (start - equilibrium)
+            )
+            self.reached_target_at = now - seconds + elapsed
+
+    @property
+    def attributes(self) -> dict:
+        """Return the climate entity attributes."""
+        return {
+            "current_temperature": round(self.temperature, 1),
+            ATTR_TEMPERATURE: self.target,
+            "min_temp": 5.0,
+            "max_temp": 30.0,
+            "target_temp_step": 0.5,
+            "temperature_unit": "°C",
+            "hvac_action": "heating" if self.heating else "idle",
+        }
+
+
+class ThermalSimulation:
+    """Simulated climate platform with N rooms and a shared schedule."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rooms: int,
+        start: datetime | None = None,
+        options: dict[str, Any] | None = None,
+        schedule_blocks: dict[str, list[dict[str, Any]]] | None = None,
+    ) -> None:
+        """Initialize the simulation.
+
+        options are added to every entry. With schedule_blocks, the shared
+        schedule answers schedule.get_schedule like a schedule helper.
+        """
+        self.hass = hass
+        self.clock = VirtualClock(start)
+        self.options = options or {}
+        self.schedule_blocks = schedule_blocks
+        self.rooms = {
+            f"climate.room_{index}": SimulatedRoom(f"climate.room_{index}")
+            for index in range(rooms)
+        }
+        # (virtual time, wall clock time, entity_id, temperature)
+        self.commands: list[tuple[float, float, str, float]] = []
+        self.entries: list[MockConfigEntry] = []
+
+    async def async_setup(self) -> None:
+        """Register the climate states, the service and one entry per room."""
+        # The integration picks up the injected clock from hass.data
+        self.hass.data[DATA_CLOCK] = self.clock
+        self.hass.services.async_register(
+            "climate", "set_temperature", self._async_set_temperature
+        )
+        if self.schedule_blocks is not None:
+            self.hass.services.async_register(
+                "schedule",
+                "get_schedule",
+                self._async_get_schedule,
+                supports_response=SupportsResponse.ONLY,
+            )
+        self.hass.states.async_set(SCHEDULE_ENTITY, "off")
+        for room in self.rooms.values():
+            self._async_write(room)
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title=room.entity_id,
+                data={
+                    "name": room.entity_id,
+                    CONF_CLIMATE_DEVICE: room.entity_id,
+                    CONF_SCHEDULE_DEVICE: SCHEDULE_ENTITY,
+                },
+                options={CONF_SCHEDULE_DEVICE: SCHEDULE_ENTITY, **self.options},
+            )
+            entry.add_to_hass(self.hass)
+            self.entries.append(entry)
+
+    @property
+    def coordinators(self) -> list:
+        """Return the coordinators of all rooms."""
+        return [
+            self.hass.data[DOMAIN][entry.entry_id]["coordinator"]
+            for entry in self.entries
+        ]
+
+    @callback
+    def _async_set_temperature(self, call: ServiceCall) -> None:
+        """Handle climate.set_temperature for simulated rooms."""
+        entity_ids = call.data[ATTR_ENTITY_ID]
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        temperature = call.data[ATTR_TEMPERATURE]
+        for entity_id in entity_ids:
+            if not self.rooms[entity_id].online:
+                raise HomeAssistantError(f"{entity_id} offline")
+        now = self.clock.monotonic()
+        wall = time.perf_counter()
+        for entity_id in entity_ids:
+            room = self.rooms[entity_id]
+            if temperature > room.target:
+                room.reached_target_at = None
+            room.target = temperature
+            room.commands.append((now, temperature))
+            self.commands.append((now, wall, entity_id, temperature))
+            self._async_write(room)
+
+    @callback
+    def _async_get_schedule(self, call: ServiceCall) -> ServiceResponse:
+        """Handle schedule.get_schedule for the shared schedule."""
+        return {SCHEDULE_ENTITY: self.schedule_blocks}
+
+    @callback
+    def _async_write(self, room: SimulatedRoom) -> None:
+        """Write the state of a room."""
+        self.hass.states.async_set(room.entity_id, "heat", room.attributes)
+
+    async def async_set_schedule(self, active: bool) -> None:
+        """Turn the shared schedule on or off."""
+        self.hass.states.async_set(SCHEDULE_ENTITY, "on" if active else "off")
+        await self.hass.async_block_till_done()
+
+    async def async_advance(self, seconds: float) -> None:
+        """Advance virtual time, fire due timers and step every room."""
+        self.clock.advance(seconds)
+        await self.hass.async_block_till_done()
+        now = self.clock.monotonic()
+        for room in self.rooms.values():
+            room.step(now, seconds)
+            self._async_write(room)
+        await self.hass.async_block_till_done()
+
+    async def async_drain(self) -> None:
+        """Advance until no command is pending or in flight."""
+        dispatcher = self.hass.data[DATA_COMMAND_DISPATCHER]
+        while (metrics := dispatcher.metrics)["pending"] or metrics["in_flight"]:
+            await self.async_advance(dispatcher.window)
@@ -0,0 +1,212 @@
+"""Benchmarks for the coordinator hot paths.
+
+The benchmarks are deselected by default, run them with:
+
+    pytest -m slow tests/test_benchmarks.py
+
+Results are written as JSON to the file named by the BENCHMARK_RESULTS
+environment variable, benchmark_results.json by default.
+"""
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED, __version__ as HA_VERSION
+from homeassistant.core import Event, HomeAssistant, State
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.const import (
+    CONF_BINARY_INPUT,
+    DATA_COMMAND_DISPATCHER,
+    DOMAIN,
+)
+
+from .simulation import SCHEDULE_ENTITY, ThermalSimulation
+
+pytestmark = pytest.mark.slow
+
+EVENTS = 20_000
+FANOUT_UPDATES = 5_000
+
+RESULTS: dict[str, dict] = {}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def write_results():
+    """Write the collected results when the module finishes."""
+    yield
+    path = os.environ.get("BENCHMARK_RESULTS", "benchmark_results.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "homeassistant": HA_VERSION,
+                "results": RESULTS,
+            },
+            file,
+            indent=2,
+        )
+
+
+def record(name: str, value: float, unit: str) -> None:
+    """Record a benchmark result."""
+    RESULTS[name] = {"value": round(value, 3), "unit": unit}
+
+
+def state_event(entity_id: str, old_state: State, new_state: State) -> Event:
+    """Return a state_changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+    )
+
+
+async def setup_rooms(hass: HomeAssistant, rooms: int) -> ThermalSimulation:
+    """Set up one controller per simulated room."""
+    simulation = ThermalSimulation(hass, rooms)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    return simulation
+
+
+async def test_callback_throughput(hass: HomeAssistant) -> None:
+    """Measure events per second handled by each coordinator callback."""
+    simulation = await setup_rooms(hass, 1)
+    coordinator = simulation.coordinators[0]
+    climate = coordinator.climate_device
+    attributes = simulation.rooms[climate].attributes
+
+    climate_states = [
+        State(climate, "heat", {**attributes, "current_temperature": 18 + i / 10})
+        for i in range(10)
+    ]
+    climate_events = [
+        state_event(climate, climate_states[i - 1], climate_states[i])
+        for i in range(10)
+    ]
+    schedule_states = [State(SCHEDULE_ENTITY, "off"), State(SCHEDULE_ENTITY, "on")]
+    schedule_events = [
+        state_event(SCHEDULE_ENTITY, schedule_states[1], schedule_states[0]),
+        state_event(SCHEDULE_ENTITY, schedule_states[0], schedule_states[1]),
+    ]
+    # Several inputs, the handler only updates the one that changed
+    inputs = [f"binary_sensor.window_{index}" for index in range(8)]
+    coordinator.async_update_options(
+        {**simulation.entries[0].options, CONF_BINARY_INPUT: inputs}
+    )
+    input_states = [
+        State("binary_sensor.window_0", "off"),
+        State("binary_sensor.window_0", "on"),
+    ]
+    input_events = [
+        state_event("binary_sensor.window_0", input_states[1], input_states[0]),
+        state_event("binary_sensor.window_0", input_states[0], input_states[1]),
+    ]
+
+    for name, handler, events in (
+        ("climate_changed", coordinator._async_climate_changed, climate_events),
+        ("schedule_changed", coordinator._async_schedule_changed, schedule_events),
+        ("binary_input_changed", coordinator._async_binary_input_changed, input_events),
+    ):
+        count = len(events)
+        started = time.perf_counter()
+        for index in range(EVENTS):
+            handler(events[index % count])
+        elapsed = time.perf_counter() - started
+        record(f"{name}_throughput", EVENTS / elapsed, "events/s")
+        await hass.async_block_till_done()
+
+    # Attribute churn the coordinator does not use is filtered out
+    churn = [
+        State(climate, "heat", {**attributes, "current_humidity": 40 + i})
+        for i in range(2)
+    ]
+    churn_events = [
+        state_event(climate, churn[1], churn[0]),
+        state_event(climate, churn[0], churn[1]),
+    ]
+    started = time.perf_counter()
+    for index in range(EVENTS):
+        coordinator._async_climate_changed(churn_events[index % 2])
+    record(
+        "climate_filtered_throughput",
+        EVENTS / (time.perf_counter() - started),
+        "events/s",
+    )
+
+
+async def test_service_calls_per_event(hass: HomeAssistant) -> None:
+    """Measure service calls issued per climate and schedule event."""
+    simulation = await setup_rooms(hass, 10)
+    simulation.commands.clear()
+
+    # Temperature drift
+    steps = 200
+    for _ in range(steps):
+        await simulation.async_advance(60)
+    record(
+        "service_calls_per_climate_event",
+        len(simulation.commands) / (steps * len(simulation.rooms)),
+        "calls/event",
+    )
+
+    # Schedule flips, one event shared by all rooms
+    simulation.commands.clear()
+    flips = 20
+    for index in range(flips):
+        await simulation.async_set_schedule(index % 2 == 0)
+        await simulation.async_advance(1)
+    record(
+        "commands_per_schedule_event",
+        len(simulation.commands) / flips,
+        "commands/event",
+    )
+    dispatcher_metrics = hass.data[DATA_COMMAND_DISPATCHER].metrics
+    record(
+        "average_batch_size",
+        dispatcher_metrics["average_batch_size"],
+        "entities/call",
+    )
+
+
+async def test_listener_fanout(hass: HomeAssistant) -> None:
+    """Measure the cost of publishing a change to the seven entities."""
+    simulation = await setup_rooms(hass, 1)
+    coordinator = simulation.coordinators[0]
+
+    started = time.perf_counter()
+    for index in range(FANOUT_UPDATES):
+        coordinator.state.normal_temperature = 20 + index % 2
+        coordinator.async_update_listeners()
+    elapsed = time.perf_counter() - started
+    record("listener_fanout", elapsed / FANOUT_UPDATES * 1e6, "us/update")
+
+    started = time.perf_counter()
+    for _ in range(FANOUT_UPDATES):
+        coordinator.async_update_listeners()
+    elapsed = time.perf_counter() - started
+    record("listener_fanout_unchanged", elapsed / FANOUT_UPDATES * 1e6, "us/update")
+
+
+@pytest.mark.parametrize("entries", [1, 100, 1000])
+async def test_setup_entries(hass: HomeAssistant, entries: int) -> None:
+    """Measure setup time and memory for many config entries."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    simulation = await setup_rooms(hass, entries)
+    elapsed = time.perf_counter() - started
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    assert len(simulation.coordinators) == entries
+    record(f"setup_{entries}_entries", elapsed, "s")
+    record(f"setup_{entries}_entries_per_entry", elapsed / entries * 1000, "ms/entry")
+    record(
+        f"memory_{entries}_entries_per_entry", allocated / entries / 1024, "KiB/entry"
+    )
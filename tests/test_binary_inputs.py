@@ -0,0 +1,120 @@
+"""Test setback driven by several binary inputs."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_BINARY_INPUT,
+    CONF_BINARY_INPUT_RULE,
+    CONF_BINARY_INPUT_THRESHOLD,
+    CONF_CLIMATE_DEVICE,
+    CONF_SCHEDULE_DEVICE,
+    DATA_CLOCK,
+    DOMAIN,
+)
+from custom_components.thermostat_setback.util import binary_input_entities
+
+WINDOWS = ["binary_sensor.window_1", "binary_sensor.window_2", "binary_sensor.window_3"]
+
+
+def test_binary_input_entities():
+    """Test single and list option values."""
+    assert binary_input_entities(None) == ()
+    assert binary_input_entities(" binary_sensor.away ") == ("binary_sensor.away",)
+    assert binary_input_entities([*WINDOWS, WINDOWS[0], ""]) == tuple(WINDOWS)
+
+
+async def test_binary_input_rules(hass: HomeAssistant) -> None:
+    """Test the threshold rule, then the any and all rules in place."""
+    hass.data[DATA_CLOCK] = VirtualClock()
+    hass.states.async_set("climate.room", "heat", {"temperature": 21})
+    hass.states.async_set("schedule.day", "off")
+    for window in WINDOWS:
+        hass.states.async_set(window, "off")
+    options = {
+        CONF_SCHEDULE_DEVICE: "schedule.day",
+        CONF_BINARY_INPUT: WINDOWS,
+        CONF_BINARY_INPUT_RULE: "threshold",
+        CONF_BINARY_INPUT_THRESHOLD: 2,
+    }
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: "climate.room"},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    hass.states.async_set(WINDOWS[0], "on")
+    await hass.async_block_till_done()
+    assert not coordinator.is_setback
+    hass.states.async_set(WINDOWS[2], "on")
+    await hass.async_block_till_done()
+    assert coordinator.is_setback
+    assert coordinator.active_binary_inputs == 2
+    # Attribute updates of an input that stays on change nothing
+    hass.states.async_set(WINDOWS[2], "on", {"friendly_name": "Window"})
+    await hass.async_block_till_done()
+    assert coordinator.active_binary_inputs == 2
+
+    hass.config_entries.async_update_entry(
+        entry, options={**options, CONF_BINARY_INPUT_RULE: "all"}
+    )
+    await hass.async_block_till_done()
+    assert not coordinator.is_setback
+    hass.states.async_set(WINDOWS[1], "on")
+    await hass.async_block_till_done()
+    assert coordinator.is_setback
+
+    hass.config_entries.async_update_entry(
+        entry, options={**options, CONF_BINARY_INPUT_RULE: "any"}
+    )
+    for window in WINDOWS[1:]:
+        hass.states.async_set(window, "off")
+    await hass.async_block_till_done()
+    assert coordinator.is_setback
+    hass.states.async_set(WINDOWS[0], "off")
+    await hass.async_block_till_done()
+    assert not coordinator.is_setback
+
+
+async def test_threshold_above_inputs(hass: HomeAssistant) -> None:
+    """Test the options flow rejects a threshold above the selected inputs."""
+    hass.data[DATA_CLOCK] = VirtualClock()
+    hass.states.async_set("climate.room", "heat", {"temperature": 21})
+    hass.states.async_set("schedule.day", "off")
+    for window in WINDOWS:
+        hass.states.async_set(window, "off")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: "climate.room"},
+        options={CONF_SCHEDULE_DEVICE: "schedule.day"},
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    user_input = {
+        CONF_SCHEDULE_DEVICE: "schedule.day",
+        CONF_BINARY_INPUT: WINDOWS[:2],
+        CONF_BINARY_INPUT_RULE: "threshold",
+        CONF_BINARY_INPUT_THRESHOLD: 3,
+    }
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "binary_input_threshold_too_high"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {**user_input, CONF_BINARY_INPUT: WINDOWS}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    assert entry.options[CONF_BINARY_INPUT_THRESHOLD] == 3
@@ -0,0 +1,240 @@
+"""Test the batched set_temperature dispatcher."""
+
+import asyncio
+
+import pytest
+from homeassistant.components.climate import ATTR_TEMPERATURE
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.commands import SetTemperatureDispatcher
+from custom_components.thermostat_setback.const import (
+    COMMAND_MAX_ATTEMPTS,
+    COMMAND_RETRY_BACKOFF,
+    DATA_COMMAND_DISPATCHER,
+    DEFAULT_COMMAND_BATCH_WINDOW,
+    DOMAIN,
+)
+
+from .simulation import ThermalSimulation
+
+NORMAL_TEMPERATURE = 21.0
+SETBACK_TEMPERATURE = 17.0
+WINDOW = DEFAULT_COMMAND_BATCH_WINDOW
+
+
+class _Climate:
+    """climate.set_temperature service that records, fails or hangs."""
+
+    def __init__(self, hass: HomeAssistant, clock: VirtualClock) -> None:
+        """Register the service."""
+        self.clock = clock
+        # (virtual time, entity IDs, temperature)
+        self.calls: list[tuple[float, list[str], float]] = []
+        self.offline: set[str] = set()
+        # Calls wait for this event when it is set
+        self.gate: asyncio.Event | None = None
+        hass.services.async_register("climate", "set_temperature", self._async_call)
+
+    async def _async_call(self, call: ServiceCall) -> None:
+        """Handle a set_temperature call."""
+        entity_ids = call.data[ATTR_ENTITY_ID]
+        self.calls.append(
+            (self.clock.monotonic(), entity_ids, call.data[ATTR_TEMPERATURE])
+        )
+        if self.gate is not None:
+            await self.gate.wait()
+        if offline := self.offline.intersection(entity_ids):
+            raise HomeAssistantError(f"{min(offline)} offline")
+
+
+async def _async_advance(
+    hass: HomeAssistant, clock: VirtualClock, seconds: float
+) -> None:
+    """Advance virtual time a batch window at a time, letting calls complete."""
+    for _ in range(round(seconds / WINDOW)):
+        clock.advance(WINDOW)
+        await hass.async_block_till_done()
+
+
+async def _async_setup(hass: HomeAssistant, rooms: int) -> ThermalSimulation:
+    """Set up one controller per room with the restored targets sent."""
+    simulation = ThermalSimulation(hass, rooms)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    for coordinator in simulation.coordinators:
+        coordinator.set_normal_temperature(NORMAL_TEMPERATURE)
+        coordinator.set_setback_temperature(SETBACK_TEMPERATURE)
+    await simulation.async_drain()
+    simulation.commands.clear()
+    return simulation
+
+
+async def test_batching(hass: HomeAssistant) -> None:
+    """Test targets within a window go out as one call per temperature."""
+    clock = VirtualClock()
+    climate = _Climate(hass, clock)
+    dispatcher = SetTemperatureDispatcher(hass, clock=clock)
+
+    dispatcher.async_set_temperature("climate.a", 17.0)
+    dispatcher.async_set_temperature("climate.b", 17.0)
+    dispatcher.async_set_temperature("climate.c", 21.0)
+    assert dispatcher.queue_depth("climate.a") == 1
+    assert not climate.calls
+
+    await _async_advance(hass, clock, WINDOW)
+    assert sorted(
+        (temperature, sorted(entity_ids))
+        for _, entity_ids, temperature in climate.calls
+    ) == [(17.0, ["climate.a", "climate.b"]), (21.0, ["climate.c"])]
+    metrics = dispatcher.metrics
+    assert metrics["batches"] == 2
+    assert metrics["commands"] == 3
+    assert metrics["max_batch_size"] == 2
+    assert metrics["pending"] == metrics["in_flight"] == 0
+    assert dispatcher.sent_calls("climate.a") == 1
+
+
+async def test_supersede(hass: HomeAssistant) -> None:
+    """Test a newer target replaces the pending one, not the one in flight."""
+    clock = VirtualClock()
+    climate = _Climate(hass, clock)
+    dispatcher = SetTemperatureDispatcher(hass, clock=clock)
+
+    dispatcher.async_set_temperature("climate.a", 17.0)
+    dispatcher.async_set_temperature("climate.a", 18.0)
+    assert dispatcher.queue_depth("climate.a") == 1
+    assert dispatcher.superseded == 1
+
+    # Hold the call in flight while two more targets arrive
+    climate.gate = asyncio.Event()
+    clock.advance(WINDOW)
+    await asyncio.sleep(0)
+    dispatcher.async_set_temperature("climate.a", 19.0)
+    dispatcher.async_set_temperature("climate.a", 20.0)
+    assert dispatcher.queue_depth("climate.a") == 2
+    clock.advance(2 * WINDOW)
+    await asyncio.sleep(0)
+    assert [call[2] for call in climate.calls] == [18.0]
+
+    climate.gate.set()
+    await _async_advance(hass, clock, 2 * WINDOW)
+    assert [call[2] for call in climate.calls] == [18.0, 20.0]
+    assert dispatcher.queue_depth("climate.a") == 0
+    assert dispatcher.superseded == 2
+
+
+async def test_timeout(hass: HomeAssistant) -> None:
+    """Test a call that never returns times out and is retried."""
+    clock = VirtualClock()
+    climate = _Climate(hass, clock)
+    climate.gate = asyncio.Event()
+    dispatcher = SetTemperatureDispatcher(hass, timeout=0.01, clock=clock)
+
+    dispatcher.async_set_temperature("climate.a", 17.0)
+    await _async_advance(hass, clock, WINDOW)
+    assert dispatcher.metrics["timeouts"] == 1
+    assert dispatcher.last_error("climate.a") == "Timed out after 0.01 s"
+    # Queued again for a retry
+    assert dispatcher.queue_depth("climate.a") == 1
+    assert dispatcher.retries == 1
+    climate.gate.set()
+
+
+async def test_backoff_and_drop(hass: HomeAssistant) -> None:
+    """Test retries back off exponentially and stop after the last attempt."""
+    clock = VirtualClock()
+    climate = _Climate(hass, clock)
+    climate.offline.add("climate.a")
+    dispatcher = SetTemperatureDispatcher(hass, clock=clock)
+
+    dispatcher.async_set_temperature("climate.a", 17.0)
+    await _async_advance(hass, clock, 40)
+
+    assert [call[0] for call in climate.calls] == pytest.approx(
+        [
+            WINDOW + COMMAND_RETRY_BACKOFF * (2**attempt - 1)
+            for attempt in range(COMMAND_MAX_ATTEMPTS)
+        ]
+    )
+    assert dispatcher.failed_calls("climate.a") == COMMAND_MAX_ATTEMPTS
+    assert dispatcher.retries == COMMAND_MAX_ATTEMPTS - 1
+    assert dispatcher.dropped == 1
+    assert dispatcher.queue_depth("climate.a") == 0
+    assert dispatcher.last_error("climate.a") == "climate.a offline"
+
+    # The device is back, a new target resets the backoff
+    climate.offline.clear()
+    dispatcher.async_set_temperature("climate.a", 18.0)
+    await _async_advance(hass, clock, COMMAND_RETRY_BACKOFF * 2**COMMAND_MAX_ATTEMPTS)
+    assert climate.calls[-1][2] == 18.0
+    assert dispatcher.last_error("climate.a") is None
+
+
+async def test_failure_isolated_per_entity(hass: HomeAssistant) -> None:
+    """Test one offline device does not fail the rest of its batch."""
+    simulation = await _async_setup(hass, 3)
+    dispatcher = hass.data[DATA_COMMAND_DISPATCHER]
+    simulation.rooms["climate.room_0"].online = False
+
+    await simulation.async_set_schedule(True)
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+
+    assert simulation.rooms["climate.room_0"].target == NORMAL_TEMPERATURE
+    assert dispatcher.queue_depth("climate.room_0") == 1
+    assert dispatcher.last_error("climate.room_0") == "climate.room_0 offline"
+    assert dispatcher.failed_calls("climate.room_0") == 1
+    for entity_id in ("climate.room_1", "climate.room_2"):
+        assert simulation.rooms[entity_id].target == SETBACK_TEMPERATURE
+        assert dispatcher.queue_depth(entity_id) == 0
+        assert dispatcher.last_error(entity_id) is None
+        assert dispatcher.failed_calls(entity_id) == 0
+    assert dispatcher.metrics["retries"] == 1
+
+
+async def test_command_status_publish(hass: HomeAssistant) -> None:
+    """Test queued commands publish with the change that queued them."""
+    simulation = await _async_setup(hass, 1)
+    coordinator = simulation.coordinators[0]
+    fanouts = coordinator.metrics.fanouts
+
+    await simulation.async_set_schedule(True)
+    # The setback and the queued command in one update
+    assert coordinator.metrics.fanouts == fanouts + 1
+    assert {"is_setback", "command_queue_depth"} <= coordinator.changed_fields
+    assert coordinator.command_queue_depth == 1
+
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+    assert coordinator.command_queue_depth == 0
+    state = hass.states.get("sensor.setback_status")
+    assert state.attributes["command_queue_depth"] == 0
+
+    # Queue changes outside a recalculation publish on the next iteration
+    version = coordinator.version
+    coordinator._async_command_status(1, "climate.room_0 offline")
+    coordinator._async_command_status(0, "climate.room_0 offline")
+    assert coordinator.version == version
+    await hass.async_block_till_done()
+    assert coordinator.version == version + 1
+    assert coordinator.changed_fields == {"command_last_error"}
+
+
+async def test_dropped_command_on_sensor(hass: HomeAssistant) -> None:
+    """Test a command given up on an offline device shows on the sensor."""
+    simulation = await _async_setup(hass, 1)
+    dispatcher = hass.data[DATA_COMMAND_DISPATCHER]
+    simulation.rooms["climate.room_0"].online = False
+
+    await simulation.async_set_schedule(True)
+    while not dispatcher.dropped:
+        await simulation.async_advance(1)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.setback_status")
+    assert state.attributes["command_queue_depth"] == 0
+    assert state.attributes["command_last_error"] == "climate.room_0 offline"
+    assert dispatcher.failed_calls("climate.room_0") == COMMAND_MAX_ATTEMPTS
@@ -0,0 +1,70 @@
+"""Test the diagnostics and hot-path metrics."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.const import DOMAIN
+from custom_components.thermostat_setback.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.thermostat_setback.metrics import LatencyHistogram
+
+from .simulation import SCHEDULE_ENTITY, ThermalSimulation
+
+
+def test_latency_histogram():
+    """Test latency samples land in cumulative buckets."""
+    histogram = LatencyHistogram()
+    for seconds in (0.00005, 0.0003, 0.0003, 1.0):
+        histogram.add(seconds)
+
+    result = histogram.as_dict()
+    assert result["count"] == 4
+    assert result["max"] == 1.0
+    assert result["buckets"]["0.0001"] == 1
+    assert result["buckets"]["0.0005"] == 3
+    assert result["buckets"]["0.25"] == 3
+    assert result["buckets"]["+Inf"] == 4
+
+
+async def test_diagnostics(hass: HomeAssistant) -> None:
+    """Test events, filtering and commands are counted per entry."""
+    simulation = ThermalSimulation(hass, 1)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    coordinator = simulation.coordinators[0]
+    climate = coordinator.climate_device
+
+    await simulation.async_set_schedule(True)
+    await simulation.async_advance(1)
+    # Attribute churn the coordinator does not read
+    hass.states.async_set(
+        climate,
+        "heat",
+        {
+            **simulation.rooms[climate].attributes,
+            "current_humidity": 50,
+        },
+    )
+    await hass.async_block_till_done()
+    # A target the device echoes back is suppressed without a new state
+    version = coordinator.version
+    suppressed = coordinator.suppressed_commands
+    simulation.rooms[climate].temperature -= 0.5
+    await simulation.async_advance(1)
+    assert coordinator.suppressed_commands > suppressed
+    assert coordinator.version == version
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, simulation.entries[0])
+    metrics = diagnostics["metrics"]
+    assert metrics["events"][SCHEDULE_ENTITY] == 1
+    assert metrics["events"][climate] >= 2
+    assert metrics["filtered_events"] >= 1
+    assert metrics["recalculations"] >= 2
+    assert metrics["service_calls"] == len(simulation.commands)
+    assert metrics["failed_commands"] == 0
+    assert metrics["suppressed_commands"] == coordinator.suppressed_commands
+    assert metrics["callback_latency"]["schedule"]["count"] == 1
+    assert diagnostics["state"]["is_setback"] is True
+    assert diagnostics["dispatcher"]["commands"] == len(simulation.commands)
@@ -0,0 +1,118 @@
+"""Test entity state writes driven by the coordinator."""
+
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_CLIMATE_DEVICE,
+    CONF_STATE_WRITE_INTERVAL,
+    DATA_CLOCK,
+    DOMAIN,
+)
+
+CLIMATE = "climate.room"
+STATUS = "sensor.setback_status"
+
+
+async def _async_setup(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> tuple[MockConfigEntry, list[str]]:
+    """Set up one controller and record the entity IDs whose state is written."""
+    hass.data[DATA_CLOCK] = VirtualClock()
+    hass.states.async_set(
+        CLIMATE, "heat", {"temperature": 21, "current_temperature": 20.0}
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: CLIMATE},
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    writes: list[str] = []
+
+    @callback
+    def _async_state_changed(event: Event) -> None:
+        if event.data["entity_id"] != CLIMATE:
+            writes.append(event.data["entity_id"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+    return entry, writes
+
+
+async def test_writes_follow_changed_fields(hass: HomeAssistant) -> None:
+    """Test a no-op event publishes nothing and changes write their entities."""
+    entry, writes = await _async_setup(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    version = coordinator.version
+    fanouts = coordinator.metrics.fanouts
+    recalculations = coordinator.metrics.recalculations
+
+    # A tracked attribute changed, the controller state did not
+    hass.states.async_set(
+        CLIMATE, "heat", {"temperature": 21, "current_temperature": 20.5}
+    )
+    await hass.async_block_till_done()
+    assert coordinator.metrics.recalculations == recalculations + 1
+    assert coordinator.version == version
+    assert coordinator.metrics.fanouts == fanouts
+    assert writes == []
+
+    # Only the entity rendering the changed field writes
+    coordinator.set_setback_temperature(16.0)
+    await hass.async_block_till_done()
+    assert coordinator.changed_fields == {"setback_temperature"}
+    assert coordinator.metrics.fanouts == fanouts + 1
+    assert writes == ["number.setback_temperature"]
+
+    writes.clear()
+    coordinator.set_forced_setback(True)
+    await hass.async_block_till_done()
+    assert "is_setback" in coordinator.changed_fields
+    assert sorted(writes) == ["sensor.setback_status", "switch.force_setback"]
+
+
+async def test_state_write_interval(hass: HomeAssistant) -> None:
+    """Test status writes are held back and the last one is written late."""
+    entry, writes = await _async_setup(hass, {CONF_STATE_WRITE_INTERVAL: 60})
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    clock = coordinator.clock
+
+    # The first change after the interval is written at once
+    clock.advance(60)
+    coordinator.set_forced_setback(True)
+    await hass.async_block_till_done()
+    assert hass.states.get(STATUS).state == "on"
+
+    # Changes within the interval are held back and merged
+    clock.advance(10)
+    coordinator.set_forced_setback(False)
+    clock.advance(10)
+    coordinator.set_forced_setback(True)
+    coordinator.set_forced_setback(False)
+    await hass.async_block_till_done()
+    assert hass.states.get(STATUS).state == "on"
+    assert writes.count(STATUS) == 1
+    # Switches are not throttled
+    assert writes.count("switch.force_setback") == 4
+
+    clock.advance(39)
+    await hass.async_block_till_done()
+    assert hass.states.get(STATUS).state == "on"
+    clock.advance(1)
+    await hass.async_block_till_done()
+    assert hass.states.get(STATUS).state == "off"
+    assert writes.count(STATUS) == 2
+
+    clock.advance(60)
+    coordinator.set_forced_setback(True)
+    await hass.async_block_till_done()
+    assert hass.states.get(STATUS).state == "on"
+    assert writes.count(STATUS) == 3
@@ -0,0 +1,130 @@
+"""Test optimal start against a simulated room."""
+
+from datetime import datetime, time, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.thermostat_setback.const import (
+    CONF_BINARY_INPUT,
+    CONF_OPTIMAL_START,
+    DOMAIN,
+    OPTIMAL_START_TOLERANCE,
+)
+from custom_components.thermostat_setback.recovery_scheduler import (
+    async_get_recovery_scheduler,
+)
+
+from .simulation import SCHEDULE_ENTITY, ThermalSimulation
+
+WINDOW = "binary_sensor.window"
+STEP = 30
+
+# Setback from Monday 20:00 to Tuesday 06:00, split at midnight like the
+# schedule helper stores it
+BLOCKS = {
+    "monday": [{"from": time(20, 0), "to": time.max}],
+    "tuesday": [{"from": time(0, 0), "to": time(6, 0)}],
+}
+
+
+async def test_optimal_start(hass: HomeAssistant) -> None:
+    """Test the timer, preheating and what blocks optimal start."""
+    start = datetime(2025, 1, 6, 20, 0, tzinfo=dt_util.get_default_time_zone())
+    midnight = dt_util.as_utc(start + timedelta(hours=4))
+    end = dt_util.as_utc(start + timedelta(hours=10))
+    simulation = ThermalSimulation(
+        hass,
+        1,
+        start=dt_util.as_utc(start),
+        options={CONF_OPTIMAL_START: True, CONF_BINARY_INPUT: WINDOW},
+        schedule_blocks=BLOCKS,
+    )
+    hass.states.async_set(WINDOW, "off")
+    await simulation.async_setup()
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"max_concurrent_recoveries": 1}}
+    )
+    await hass.async_block_till_done()
+    scheduler = async_get_recovery_scheduler(hass)
+    coordinator = simulation.coordinators[0]
+    coordinator.set_normal_temperature(21.0)
+    coordinator.set_setback_temperature(17.0)
+    # Recovery takes 7000 s plus 100 s per degree of rise
+    for rise in (2.0, 3.0, 4.0):
+        coordinator.heating_model.add(7000 + 100 * rise, rise)
+
+    # The schedule helper announces midnight, where the next block goes on
+    hass.states.async_set(SCHEDULE_ENTITY, "on", {"next_event": midnight})
+    # Let the room cool below normal temperature
+    for _ in range(20):
+        await simulation.async_advance(STEP)
+    assert coordinator.is_setback
+    planned = coordinator.optimal_start_time
+    assert planned is not None
+    assert midnight < planned < end
+    armed = coordinator._cancel_optimal_start
+    assert armed is not None
+
+    # Small moves of the estimate keep the timer
+    await simulation.async_advance(STEP)
+    assert coordinator._cancel_optimal_start is armed
+    assert coordinator.optimal_start_time == planned
+    # One more degree to rise moves it by 100 s
+    coordinator.set_normal_temperature(22.0)
+    assert coordinator._cancel_optimal_start is not armed
+    assert (
+        planned - coordinator.optimal_start_time
+    ).total_seconds() > OPTIMAL_START_TOLERANCE
+
+    # Forced setback and the binary input are never ended early
+    coordinator.set_forced_setback(True)
+    assert coordinator._cancel_optimal_start is None
+    assert coordinator.optimal_start_time is None
+    coordinator.set_forced_setback(False)
+    assert coordinator._cancel_optimal_start is not None
+    hass.states.async_set(WINDOW, "on")
+    await hass.async_block_till_done()
+    assert coordinator._cancel_optimal_start is None
+    hass.states.async_set(WINDOW, "off")
+    await hass.async_block_till_done()
+    assert coordinator._cancel_optimal_start is not None
+
+    # Step through the night, the schedule rolls over at midnight and
+    # another room takes the only recovery slot at 02:00
+    room = simulation.rooms[coordinator.climate_device]
+    rolled_over = False
+    while not coordinator.preheating and simulation.clock.utcnow() < end:
+        await simulation.async_advance(STEP)
+        if not rolled_over and simulation.clock.utcnow() >= midnight:
+            rolled_over = True
+            hass.states.async_set(SCHEDULE_ENTITY, "on", {"next_event": end})
+            await hass.async_block_till_done()
+        if not scheduler.active and simulation.clock.utcnow() >= midnight + timedelta(
+            hours=2
+        ):
+            assert scheduler.async_request("other", 0, 0, lambda: None)
+
+    assert coordinator.preheating
+    assert midnight < simulation.clock.utcnow() < end
+    # Optimal start waits for a slot of the recovery budget
+    assert coordinator.is_setback
+    assert coordinator.recovery_queued
+    scheduler.async_release("other")
+    await simulation.async_advance(STEP)
+    assert not coordinator.is_setback
+    assert coordinator.is_recovering
+    assert room.target == 22.0
+
+    # Preheating lasts until the schedule changes
+    while simulation.clock.utcnow() < end:
+        await simulation.async_advance(STEP)
+    assert coordinator.preheating
+    hass.states.async_set(
+        SCHEDULE_ENTITY, "off", {"next_event": end + timedelta(days=6, hours=14)}
+    )
+    await simulation.async_advance(STEP)
+    assert not coordinator.preheating
+    assert not coordinator.is_setback
+    assert coordinator.optimal_start_time is None
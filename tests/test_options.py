@@ -0,0 +1,107 @@
+"""Test applying changed options without reloading the entry."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_BINARY_INPUT,
+    CONF_CLIMATE_DEVICE,
+    CONF_OPTIMAL_START,
+    CONF_OUTDOOR_SENSOR,
+    CONF_SCHEDULE_DEVICE,
+    DATA_CLOCK,
+    DOMAIN,
+)
+
+
+async def test_swap_inputs_in_place(hass: HomeAssistant) -> None:
+    """Test a new schedule and binary input are tracked by the same coordinator."""
+    hass.data[DATA_CLOCK] = VirtualClock()
+    hass.states.async_set("climate.room", "heat", {"temperature": 21})
+    hass.states.async_set("schedule.day", "off")
+    hass.states.async_set("schedule.night", "on")
+    hass.states.async_set("binary_sensor.window", "off")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: "climate.room"},
+        options={CONF_SCHEDULE_DEVICE: "schedule.day"},
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert not coordinator.is_setback
+
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            CONF_SCHEDULE_DEVICE: "schedule.night",
+            CONF_BINARY_INPUT: "binary_sensor.window",
+        },
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id]["coordinator"] is coordinator
+    assert coordinator.is_setback
+    state = hass.states.get("sensor.setback_status")
+    assert state.attributes["schedule_device"] == "schedule.night"
+    assert state.attributes["binary_input_device"] == "binary_sensor.window"
+
+    # The former schedule is no longer tracked
+    hass.states.async_set("schedule.night", "off")
+    hass.states.async_set("schedule.day", "on")
+    await hass.async_block_till_done()
+    assert not coordinator.is_setback
+    hass.states.async_set("binary_sensor.window", "on")
+    await hass.async_block_till_done()
+    assert coordinator.is_setback
+
+    # The heating model depends on the outdoor sensor, so the entry reloads
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            CONF_SCHEDULE_DEVICE: "schedule.night",
+            CONF_OUTDOOR_SENSOR: "sensor.outdoor",
+        },
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id]["coordinator"] is not coordinator
+
+
+async def test_options_follow_schedule_rules(hass: HomeAssistant) -> None:
+    """Test option changes apply the schedule and optimal start rules."""
+    hass.data[DATA_CLOCK] = VirtualClock()
+    hass.states.async_set("climate.room", "heat", {"temperature": 21})
+    hass.states.async_set("schedule.day", "off")
+    hass.states.async_set("schedule.night", "on")
+    options = {CONF_SCHEDULE_DEVICE: "schedule.day", CONF_OPTIMAL_START: True}
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: "climate.room"},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    # A schedule that is on after the swap starts a period, which uses up
+    # skip_next_setback like a schedule turning on
+    coordinator.set_skip_next_setback(True)
+    options = {**options, CONF_SCHEDULE_DEVICE: "schedule.night"}
+    hass.config_entries.async_update_entry(entry, options=options)
+    await hass.async_block_till_done()
+    assert not coordinator.skip_next_setback
+    assert coordinator.is_setback
+
+    # Turning optimal start off ends preheating, so setback resumes
+    coordinator._async_optimal_start()
+    assert coordinator.preheating
+    assert not coordinator.is_setback
+    hass.config_entries.async_update_entry(
+        entry, options={**options, CONF_OPTIMAL_START: False}
+    )
+    await hass.async_block_till_done()
+    assert not coordinator.preheating
+    assert coordinator.is_setback
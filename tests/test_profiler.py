@@ -0,0 +1,66 @@
+"""Test the profiler services."""
+
+import cProfile
+import os
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.const import (
+    DOMAIN,
+    SERVICE_PROFILE_START,
+    SERVICE_PROFILE_STOP,
+)
+from custom_components.thermostat_setback.profiler import async_get_profiler
+
+from .simulation import ThermalSimulation
+
+
+async def test_profile_start_stop(hass: HomeAssistant, tmp_path) -> None:
+    """Test a profile reports the integration's hot functions."""
+    hass.config.config_dir = str(tmp_path)
+    simulation = ThermalSimulation(hass, 5)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE_STOP, {}, blocking=True, return_response=True
+        )
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE_START, {"duration": 60}, blocking=True
+    )
+    for index in range(4):
+        await simulation.async_set_schedule(index % 2 == 0)
+        await simulation.async_advance(1)
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE_STOP, {"top": 5}, blocking=True, return_response=True
+    )
+    assert os.path.isfile(response["path"])
+    assert 0 < len(response["functions"]) <= 5
+    assert any(
+        "coordinator.py" in function["function"] for function in response["functions"]
+    )
+
+
+async def test_profile_start_other_profiler(hass: HomeAssistant, tmp_path) -> None:
+    """Test starting fails cleanly while another profiler is active."""
+    hass.config.config_dir = str(tmp_path)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        with pytest.raises(HomeAssistantError, match="another profiler is active"):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_PROFILE_START, {"duration": 60}, blocking=True
+            )
+    finally:
+        other.disable()
+    assert not async_get_profiler(hass).running
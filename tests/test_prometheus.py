@@ -0,0 +1,73 @@
+"""Test the Prometheus metrics endpoint."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.commands import async_get_dispatcher
+from custom_components.thermostat_setback.const import DOMAIN
+from custom_components.thermostat_setback.prometheus import MetricsRenderer
+
+from .simulation import ThermalSimulation
+
+
+async def test_metrics_endpoint(hass: HomeAssistant, hass_client) -> None:
+    """Test the endpoint serves labelled metrics for every controller."""
+    assert await async_setup_component(hass, "http", {})
+    simulation = ThermalSimulation(hass, 2)
+    await simulation.async_setup()
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"metrics_endpoint": True}}
+    )
+    await hass.async_block_till_done()
+    await simulation.async_set_schedule(True)
+    await simulation.async_advance(1)
+
+    client = await hass_client()
+    response = await client.get(f"/api/{DOMAIN}/metrics")
+    assert response.status == 200
+    body = await response.text()
+
+    entry_id = simulation.entries[0].entry_id
+    labels = f'entry="{entry_id}",name="climate.room_0"'
+    assert "# TYPE thermostat_setback_setback_active gauge" in body
+    assert f"thermostat_setback_setback_active{{{labels}}} 1\n" in body
+    assert (
+        f'thermostat_setback_events_total{{{labels},source="schedule.simulated"}} 1\n'
+        in body
+    )
+    assert "# TYPE thermostat_setback_callback_latency_seconds histogram" in body
+    assert "thermostat_setback_commands_total 2\n" in body
+
+
+async def test_renderer_cache(hass: HomeAssistant) -> None:
+    """Test an unchanged controller is not rendered again."""
+    simulation = ThermalSimulation(hass, 2)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    first, second = simulation.coordinators
+    renderer = MetricsRenderer()
+    metrics = async_get_dispatcher(hass).metrics
+
+    renderer.render(simulation.coordinators, metrics)
+    cached = dict(renderer._cache)
+    first.set_normal_temperature(22)
+    renderer.render(simulation.coordinators, metrics)
+
+    entry_id = first.config_entry.entry_id
+    other_id = second.config_entry.entry_id
+    assert renderer._cache[entry_id] is not cached[entry_id]
+    assert renderer._cache[other_id] is cached[other_id]
+
+    # Counters that change without a published state change render again
+    cached = dict(renderer._cache)
+    second.metrics.recalculations += 1
+    second.metrics.histogram("climate").add(0.001)
+    body = renderer.render(simulation.coordinators, metrics)
+    assert renderer._cache[other_id] is not cached[other_id]
+    assert renderer._cache[entry_id] is cached[entry_id]
+    assert (
+        "thermostat_setback_recalculations_total"
+        f'{{entry="{other_id}",name="{second.config_entry.title}"}} '
+        f"{second.metrics.recalculations}\n"
+    ) in body
@@ -0,0 +1,62 @@
+"""Test which entity attributes reach the recorder."""
+
+import pytest
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_CLIMATE_DEVICE,
+    DATA_CLOCK,
+    DOMAIN,
+)
+
+STATUS = "sensor.setback_status"
+UNRECORDED = {
+    "climate_device",
+    "schedule_device",
+    "schedule_template",
+    "binary_input_device",
+    "command_queue_depth",
+    "command_last_error",
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Start the recorder before Home Assistant is set up."""
+    yield
+
+
+async def test_unrecorded_attributes(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test configuration and command queue attributes are not recorded."""
+    now = dt_util.utcnow()
+    hass.data[DATA_CLOCK] = VirtualClock()
+    hass.states.async_set("climate.room", "heat", {"temperature": 21})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: "climate.room"},
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    attributes = hass.states.get(STATUS).attributes
+    assert UNRECORDED <= attributes.keys()
+    states = await hass.async_add_executor_job(
+        get_significant_states, hass, now, None, [STATUS]
+    )
+    assert states[STATUS]
+    for state in states[STATUS]:
+        assert "preheating" in state.attributes
+        assert not UNRECORDED & state.attributes.keys()
@@ -0,0 +1,81 @@
+"""Test the recovery history and statistics."""
+
+import random
+
+from custom_components.thermostat_setback.recovery import (
+    HeatingRateModel,
+    P2Quantile,
+    RecoveryHistory,
+)
+
+
+def test_quantile_estimate():
+    """Test the P-square estimate is close to the exact quantile."""
+    rng = random.Random(1)
+    samples = [rng.expovariate(1 / 1800) for _ in range(5000)]
+    median = P2Quantile(0.5)
+    p90 = P2Quantile(0.9)
+    for sample in samples:
+        median.add(sample)
+        p90.add(sample)
+
+    ordered = sorted(samples)
+    assert abs(median.value - ordered[2500]) / ordered[2500] < 0.05
+    assert abs(p90.value - ordered[4500]) / ordered[4500] < 0.05
+
+
+def test_quantile_few_samples():
+    """Test the estimate is exact before the markers are initialized."""
+    median = P2Quantile(0.5)
+    assert median.value is None
+    for sample in (30, 10, 20):
+        median.add(sample)
+    assert median.value == 20
+
+
+def test_history_is_bounded():
+    """Test the ring buffer keeps the newest events only."""
+    history = RecoveryHistory(capacity=4)
+    for index in range(10):
+        history.add(float(index), 15.0, None, 1000.0 + index)
+
+    events = history.events()
+    assert [event["duration"] for event in events] == [9.0, 8.0, 7.0, 6.0]
+    assert events[0]["start_temperature"] == 15.0
+    assert events[0]["target_temperature"] is None
+    assert history.count == 10
+    assert history.mean == 4.5
+    assert history.minimum == 0.0
+    assert history.maximum == 9.0
+
+
+def test_history_storage_round_trip():
+    """Test a history restored from storage matches the original."""
+    history = RecoveryHistory(capacity=8)
+    for index in range(20):
+        history.add(100.0 + index, 16.0, 21.0, 1000.0 + index)
+
+    restored = RecoveryHistory.from_dict(history.as_dict(), capacity=8)
+    assert restored.events() == history.events()
+    assert restored.statistics() == history.statistics()
+
+    restored.add(200.0, 16.0, 21.0, 2000.0)
+    history.add(200.0, 16.0, 21.0, 2000.0)
+    assert restored.statistics() == history.statistics()
+
+
+def test_heating_model_fit():
+    """Test the model learns recovery time from rise and outdoor temperature."""
+    model = HeatingRateModel(outdoor=True)
+    assert model.predict(4.0, 20.0) is None
+    for rise, outdoor_difference in ((2, 10), (4, 15), (3, 25), (5, 30), (1, 20)):
+        model.add(300 + 900 * rise + 20 * outdoor_difference, rise, outdoor_difference)
+
+    assert abs(model.predict(4.0, 20.0) - 4300) < 20
+    assert abs(model.heating_rate - 4.0) < 0.05
+    # Recoveries without an outdoor temperature cannot be used
+    model.add(1000, 1.0)
+    assert model.count == 5
+
+    restored = HeatingRateModel.from_dict(model.as_dict())
+    assert restored.predict(4.0, 20.0) == model.predict(4.0, 20.0)
@@ -0,0 +1,123 @@
+"""Test the staggered recovery scheduler."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    DATA_CLOCK,
+    DEFAULT_COMMAND_BATCH_WINDOW,
+    DOMAIN,
+    RECOVERY_SLOT_TIMEOUT,
+)
+from custom_components.thermostat_setback.recovery_scheduler import (
+    RecoveryScheduler,
+    async_get_recovery_scheduler,
+)
+
+from .simulation import ThermalSimulation
+
+STEP = 30
+
+
+async def test_budget_and_priority(hass: HomeAssistant) -> None:
+    """Test slots are granted shortest recovery first within the budget."""
+    clock = hass.data[DATA_CLOCK] = VirtualClock()
+    scheduler = RecoveryScheduler(hass, max_concurrent=2, power_budget=5.0)
+    granted = []
+
+    assert scheduler.async_request("a", 600, 4.5, lambda: granted.append("a"))
+    # Over the power budget
+    assert not scheduler.async_request(
+        "slow", 1800, 1.0, lambda: granted.append("slow")
+    )
+    assert not scheduler.async_request("fast", 300, 1.0, lambda: granted.append("fast"))
+    assert not scheduler.async_request("big", 3600, 4.0, lambda: granted.append("big"))
+    assert scheduler.waiting == 3
+
+    scheduler.async_release("a")
+    assert granted == ["fast", "slow"]
+    assert scheduler.active == 2
+    # Giving up a place in the queue does not block the others
+    scheduler.async_release("big")
+    assert scheduler.waiting == 0
+
+    # A recovery that never completes releases its slot eventually
+    clock.advance(RECOVERY_SLOT_TIMEOUT)
+    assert scheduler.active == 0
+
+
+async def test_staggered_recovery(hass: HomeAssistant) -> None:
+    """Test rooms recover one at a time when a shared schedule ends."""
+    simulation = ThermalSimulation(hass, 3)
+    await simulation.async_setup()
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"max_concurrent_recoveries": 1}}
+    )
+    await hass.async_block_till_done()
+    coordinators = simulation.coordinators
+    for coordinator in coordinators:
+        coordinator.set_normal_temperature(21.0)
+        coordinator.set_setback_temperature(17.0)
+
+    await simulation.async_set_schedule(True)
+    for _ in range(2 * 3600 // STEP):
+        await simulation.async_advance(STEP)
+
+    await simulation.async_set_schedule(False)
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+    assert sum(coordinator.is_recovering for coordinator in coordinators) == 1
+    assert sum(coordinator.recovery_queued for coordinator in coordinators) == 2
+
+    recovering = set()
+    for _ in range(12 * 3600 // STEP):
+        await simulation.async_advance(STEP)
+        assert sum(coordinator.is_recovering for coordinator in coordinators) <= 1
+        recovering.update(
+            coordinator.climate_device
+            for coordinator in coordinators
+            if coordinator.is_recovering
+        )
+        if not any(coordinator.is_setback for coordinator in coordinators) and not any(
+            coordinator.is_recovering for coordinator in coordinators
+        ):
+            break
+
+    assert len(recovering) == 3
+    assert all(
+        coordinator.recovery_statistics["recovery_count"] == 1
+        for coordinator in coordinators
+    )
+
+
+async def test_skip_leaves_queue(hass: HomeAssistant) -> None:
+    """Test skipping the setback leaves the recovery queue at once."""
+    simulation = ThermalSimulation(hass, 2)
+    await simulation.async_setup()
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"max_concurrent_recoveries": 1}}
+    )
+    await hass.async_block_till_done()
+    coordinators = simulation.coordinators
+    for coordinator in coordinators:
+        coordinator.set_normal_temperature(21.0)
+        coordinator.set_setback_temperature(17.0)
+
+    await simulation.async_set_schedule(True)
+    for _ in range(3600 // STEP):
+        await simulation.async_advance(STEP)
+    await simulation.async_set_schedule(False)
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+    queued = next(
+        coordinator for coordinator in coordinators if coordinator.recovery_queued
+    )
+    assert queued.is_setback
+
+    queued.set_skip_next_setback(True)
+    assert not queued.recovery_queued
+    assert not queued.is_setback
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+    assert simulation.rooms[queued.climate_device].target == 21.0
+    scheduler = async_get_recovery_scheduler(hass)
+    assert scheduler.waiting == 0
+    assert scheduler.active == 1
@@ -0,0 +1,76 @@
+"""Smoke test for the history replay script."""
+
+import importlib.util
+import io
+import json
+from pathlib import Path
+
+from custom_components.thermostat_setback.const import BINARY_INPUT_RULE_ANY
+
+REPLAY_SCRIPT = Path(__file__).parents[1] / "scripts" / "replay.py"
+
+CLIMATE_HISTORY = [
+    {
+        "entity_id": "climate.room",
+        "state": "heat",
+        "attributes": {"temperature": 21, "current_temperature": 20.5},
+        "last_changed": "2025-01-06T06:00:00+00:00",
+    },
+    {
+        "entity_id": "schedule.night",
+        "state": "off",
+        "last_changed": "2025-01-06T06:00:01+00:00",
+    },
+    {
+        "entity_id": "schedule.night",
+        "state": "on",
+        "last_changed": "2025-01-06T17:00:00+00:00",
+    },
+    {
+        "entity_id": "schedule.night",
+        "state": "off",
+        "last_changed": "2025-01-07T06:00:00+00:00",
+    },
+]
+
+INPUT_HISTORY = """entity_id,state,last_changed
+binary_sensor.away,on,2025-01-06T12:00:00+00:00
+binary_sensor.away,off,2025-01-06T13:00:00+00:00
+"""
+
+
+def _load_replay():
+    """Import the replay script as a module."""
+    spec = importlib.util.spec_from_file_location("replay", REPLAY_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_replay_history(tmp_path: Path) -> None:
+    """Test a small JSON lines and CSV history replays into commands."""
+    replay = _load_replay()
+    climate_path = tmp_path / "climate.jsonl"
+    climate_path.write_text(
+        "".join(json.dumps(record) + "\n" for record in CLIMATE_HISTORY),
+        encoding="utf-8",
+    )
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(INPUT_HISTORY, encoding="utf-8")
+
+    output = io.StringIO()
+    coordinators, summary = replay.replay(
+        [("climate.room", "schedule.night", ("binary_sensor.away",))],
+        [str(climate_path), str(input_path)],
+        output,
+        (BINARY_INPUT_RULE_ANY, 1),
+    )
+
+    assert summary["events"] == 6
+    commands = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert summary["commands"] == len(commands)
+    # Away, back, night setback and morning restore, after the initial target
+    assert [
+        (command["time"][11:16], command["temperature"]) for command in commands[-4:]
+    ] == [("12:00", 20), ("13:00", 16), ("17:00", 20), ("06:00", 16)]
+    assert not coordinators[0].is_setback
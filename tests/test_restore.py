@@ -0,0 +1,67 @@
+"""Test restoring controller state on startup."""
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+    mock_restore_cache,
+)
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_CLIMATE_DEVICE,
+    DATA_CLOCK,
+    DEFAULT_COMMAND_BATCH_WINDOW,
+    DOMAIN,
+)
+from custom_components.thermostat_setback.coordinator import (
+    ClimateSetbackCoordinator,
+)
+
+
+async def test_restore_sends_one_command(hass: HomeAssistant) -> None:
+    """Test the restored state is sent once, after every entity restored."""
+    clock = hass.data[DATA_CLOCK] = VirtualClock()
+    calls = async_mock_service(hass, "climate", "set_temperature")
+    hass.states.async_set("climate.room", "heat", {"temperature": 21})
+    mock_restore_cache(
+        hass,
+        [
+            State("number.normal_temperature", "20.5"),
+            State("number.setback_temperature", "16.0"),
+            State("switch.force_setback", "on"),
+        ],
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: "climate.room"},
+    )
+    entry.add_to_hass(hass)
+
+    calls_before_finish = []
+    finish_restore = ClimateSetbackCoordinator.async_finish_restore
+
+    def _finish_restore(coordinator: ClimateSetbackCoordinator) -> None:
+        clock.advance(DEFAULT_COMMAND_BATCH_WINDOW)
+        calls_before_finish.append(len(calls))
+        finish_restore(coordinator)
+
+    with patch.object(
+        ClimateSetbackCoordinator, "async_finish_restore", _finish_restore
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
+    assert calls_before_finish == [0]
+
+    clock.advance(DEFAULT_COMMAND_BATCH_WINDOW)
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert calls[0].data["entity_id"] == ["climate.room"]
+    assert calls[0].data["temperature"] == 16.0
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert coordinator.normal_temperature == 20.5
+    assert coordinator.is_setback
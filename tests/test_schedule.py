@@ -0,0 +1,106 @@
+"""Test the built-in weekly schedules."""
+
+from datetime import UTC, datetime
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_CLIMATE_DEVICE,
+    CONF_SCHEDULE_TEMPLATE,
+    DATA_CLOCK,
+    DOMAIN,
+)
+from custom_components.thermostat_setback.schedule import (
+    TEMPLATE_SCHEMA,
+    CompiledSchedule,
+)
+
+NIGHTS = {
+    "monday": [{"from": "17:00", "to": "24:00"}],
+    "tuesday": [{"from": "00:00", "to": "07:00"}],
+    "sunday": [{"from": "22:00", "to": "24:00"}],
+}
+
+# 2024-01-01 is a Monday
+MONDAY = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    """Return a time in the test week."""
+    return MONDAY.replace(day=1 + day, hour=hour, minute=minute)
+
+
+def test_compiled_schedule():
+    """Test lookups, merged midnight intervals and the week wrap-around."""
+    schedule = CompiledSchedule.from_config(TEMPLATE_SCHEMA(NIGHTS))
+
+    assert not schedule.is_on(at(0, 16, 59))
+    assert schedule.is_on(at(0, 17))
+    assert schedule.is_on(at(1, 0))
+    assert schedule.is_on(at(1, 6, 59))
+    assert not schedule.is_on(at(1, 7))
+    assert schedule.is_on(at(6, 23))
+    # Sunday night ends at midnight into Monday
+    assert not schedule.is_on(at(0, 0))
+
+    assert schedule.next_transition(at(0, 12)) == at(0, 17)
+    assert schedule.next_transition(at(0, 17)) == at(1, 7)
+    assert schedule.next_transition(at(6, 23)) == at(0, 0).replace(day=8)
+
+
+def test_always_and_never_on():
+    """Test schedules without transitions."""
+    week = {
+        day: [{"from": "00:00", "to": "24:00"}]
+        for day in (
+            "monday",
+            "tuesday",
+            "wednesday",
+            "thursday",
+            "friday",
+            "saturday",
+            "sunday",
+        )
+    }
+    always = CompiledSchedule.from_config(TEMPLATE_SCHEMA(week))
+    never = CompiledSchedule.from_config(TEMPLATE_SCHEMA({}))
+
+    assert always.is_on(at(3, 12))
+    assert always.next_transition(at(3, 12)) is None
+    assert not never.is_on(at(3, 12))
+
+
+async def test_schedule_template(hass: HomeAssistant) -> None:
+    """Test controllers sharing a template switch on one shared timer."""
+    start = dt_util.as_utc(
+        datetime(2024, 1, 1, 8, tzinfo=dt_util.get_default_time_zone())
+    )
+    clock = hass.data[DATA_CLOCK] = VirtualClock(start)
+    hass.states.async_set("climate.room", "heat", {"temperature": 21})
+    entries = []
+    for index in range(3):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"name": f"Room {index}", CONF_CLIMATE_DEVICE: "climate.room"},
+            options={CONF_SCHEDULE_TEMPLATE: "nights"},
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"schedules": {"nights": NIGHTS}}}
+    )
+    await hass.async_block_till_done()
+    coordinators = [
+        hass.data[DOMAIN][entry.entry_id]["coordinator"] for entry in entries
+    ]
+    assert not any(coordinator.is_setback for coordinator in coordinators)
+
+    clock.advance(9 * 3600)
+    assert all(coordinator.is_setback for coordinator in coordinators)
+
+    clock.advance(14 * 3600)
+    assert not any(coordinator.is_setback for coordinator in coordinators)
@@ -0,0 +1,119 @@
+"""End-to-end tests against simulated rooms."""
+
+import time
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.const import (
+    DATA_COMMAND_DISPATCHER,
+    DEFAULT_COMMAND_BATCH_WINDOW,
+    DOMAIN,
+)
+
+from .simulation import ThermalSimulation
+
+ROOMS = 50
+NORMAL_TEMPERATURE = 21.0
+SETBACK_TEMPERATURE = 17.0
+STEP = 30
+
+
+@pytest.fixture
+async def simulation(hass: HomeAssistant) -> ThermalSimulation:
+    """Set up the integration with one controller per simulated room."""
+    simulation = ThermalSimulation(hass, ROOMS)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    for coordinator in simulation.coordinators:
+        coordinator.set_normal_temperature(NORMAL_TEMPERATURE)
+        coordinator.set_setback_temperature(SETBACK_TEMPERATURE)
+    await simulation.async_advance(STEP)
+    # Start the tests without restored targets still on their way
+    await simulation.async_drain()
+    assert all(room.target == NORMAL_TEMPERATURE for room in simulation.rooms.values())
+    simulation.commands.clear()
+    return simulation
+
+
+async def test_schedule_flip_latency(
+    hass: HomeAssistant, simulation: ThermalSimulation
+) -> None:
+    """Test a schedule flip reaches every room in one batched call."""
+    dispatcher = hass.data[DATA_COMMAND_DISPATCHER]
+    batches = dispatcher.batches
+
+    started = time.perf_counter()
+    flipped_at = simulation.clock.monotonic()
+    await simulation.async_set_schedule(True)
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+
+    assert len(simulation.commands) == ROOMS
+    assert {command[3] for command in simulation.commands} == {SETBACK_TEMPERATURE}
+    assert dispatcher.batches == batches + 1
+
+    # Virtual latency is the batch window, wall clock latency is processing
+    latest = max(command[0] for command in simulation.commands)
+    assert latest - flipped_at == pytest.approx(DEFAULT_COMMAND_BATCH_WINDOW)
+    assert max(command[1] for command in simulation.commands) - started < 1.0
+    assert all(coordinator.is_setback for coordinator in simulation.coordinators)
+
+    # Temperature drift alone sends no further commands
+    await simulation.async_advance(STEP * 10)
+    assert len(simulation.commands) == ROOMS
+
+
+async def test_recovery_detection(
+    hass: HomeAssistant, simulation: ThermalSimulation
+) -> None:
+    """Test measured recovery times match the simulated heat-up."""
+    await simulation.async_set_schedule(True)
+    # Let the rooms cool down towards the setback temperature
+    for _ in range(4 * 3600 // STEP):
+        await simulation.async_advance(STEP)
+
+    ended_at = simulation.clock.monotonic()
+    await simulation.async_set_schedule(False)
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+    assert all(coordinator.is_recovering for coordinator in simulation.coordinators)
+
+    for _ in range(6 * 3600 // STEP):
+        await simulation.async_advance(STEP)
+        # The rooms cross the target before the rounded reported temperature
+        # ends the recovery, wait for both
+        if not any(
+            coordinator.is_recovering for coordinator in simulation.coordinators
+        ) and all(
+            room.reached_target_at is not None for room in simulation.rooms.values()
+        ):
+            break
+
+    for coordinator in simulation.coordinators:
+        room = simulation.rooms[coordinator.climate_device]
+        assert not coordinator.is_recovering
+        assert room.reached_target_at is not None
+        expected = room.reached_target_at - ended_at
+        # Detection happens on the first state written after the crossing,
+        # the reported temperature is rounded to 0.1 degrees
+        assert abs(coordinator.last_recovery_time - expected) <= 2 * STEP
+        assert coordinator.recovery_statistics["recovery_count"] == 1
+
+
+async def test_target_restored_while_command_queued(hass: HomeAssistant) -> None:
+    """Test a target the device reports is still sent over a queued command."""
+    simulation = ThermalSimulation(hass, 1)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    room = next(iter(simulation.rooms.values()))
+    coordinator = simulation.coordinators[0]
+
+    # The restore queued the default normal temperature, the device still
+    # reports its own target of 21
+    assert room.target == NORMAL_TEMPERATURE
+    coordinator.set_normal_temperature(NORMAL_TEMPERATURE)
+    await simulation.async_advance(DEFAULT_COMMAND_BATCH_WINDOW)
+    assert room.target == NORMAL_TEMPERATURE
@@ -0,0 +1,79 @@
+"""Test persisting controller state in the entry's store."""
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.thermostat_setback.clock import VirtualClock
+from custom_components.thermostat_setback.const import (
+    CONF_CLIMATE_DEVICE,
+    DATA_CLOCK,
+    DOMAIN,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from custom_components.thermostat_setback.coordinator import PERSISTED_KEYS
+
+
+async def test_save_and_reload(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test changes are saved once after a delay and survive a reload."""
+    hass.data[DATA_CLOCK] = VirtualClock()
+    hass.states.async_set(
+        "climate.room", "heat", {"temperature": 21, "current_temperature": 20.0}
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Room", CONF_CLIMATE_DEVICE: "climate.room"},
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    key = f"{DOMAIN}.{entry.entry_id}"
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    coordinator.set_normal_temperature(20.5)
+    coordinator.set_setback_temperature(16.5)
+    coordinator.set_forced_setback(True)
+    coordinator.set_forced_setback(False)
+    await hass.async_block_till_done()
+    # Saves wait for the delay, several changes are saved together
+    assert key not in hass_storage
+
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass_storage[key]["version"] == STORAGE_VERSION
+    data = hass_storage[key]["data"]
+    assert set(PERSISTED_KEYS) <= data.keys()
+    assert data["normal_temperature"] == 20.5
+    assert data["setback_temperature"] == 16.5
+    assert data["is_recovering"] is True
+    assert data["recovery_start_temperature"] == 20.0
+    assert data["recovery_start_time"].endswith("+00:00")
+    saved = {key: getattr(coordinator.state, key) for key in PERSISTED_KEYS}
+
+    # An unchanged state is not saved again
+    hass_storage.pop(key)
+    coordinator.set_normal_temperature(20.5)
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
+    hass_storage[key] = {"version": STORAGE_VERSION, "key": key, "data": data}
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    reloaded = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert reloaded is not coordinator
+    assert {key: getattr(reloaded.state, key) for key in PERSISTED_KEYS} == saved
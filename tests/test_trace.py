@@ -0,0 +1,71 @@
+"""Test the setback decision trace."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.thermostat_setback.const import DOMAIN, SERVICE_GET_TRACE
+from custom_components.thermostat_setback.trace import DecisionTrace
+
+from .simulation import ThermalSimulation
+
+
+def test_trace_wraps_around():
+    """Test the trace keeps the newest transitions within its capacity."""
+    trace = DecisionTrace(capacity=4)
+    for index in range(10):
+        trace.record(
+            float(index),
+            "schedule",
+            17.0,
+            True,
+            False,
+            False,
+            index % 2 == 0,
+            False,
+            index % 2 == 0,
+            True,
+        )
+
+    transitions = trace.transitions()
+    assert trace.count == 10
+    assert len(trace) == 4
+    assert [transition["timestamp"] for transition in transitions] == [9, 8, 7, 6]
+    assert transitions[0]["trigger"] == "schedule"
+    assert transitions[0]["schedule_active"] is False
+    assert transitions[1]["is_setback"] is True
+    assert transitions[1]["command_sent"] is True
+    assert len(trace.transitions(limit=2)) == 2
+
+
+async def test_get_trace_service(hass: HomeAssistant) -> None:
+    """Test the service explains a schedule-driven setback."""
+    simulation = ThermalSimulation(hass, 1)
+    await simulation.async_setup()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await simulation.async_set_schedule(True)
+    await simulation.async_advance(1)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_TRACE,
+        {"config_entry_id": simulation.entries[0].entry_id, "limit": 1},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["transitions"] == [
+        {
+            "timestamp": response["transitions"][0]["timestamp"],
+            "trigger": "schedule",
+            "target_temperature": 20,
+            "controller_active": True,
+            "forced_setback": False,
+            "skip_next_setback": False,
+            "schedule_active": True,
+            "input_is_active": False,
+            "is_setback": True,
+            "command_sent": True,
+            "preheating": False,
+        }
+    ]